@@ -0,0 +1,96 @@
+# ai_batcher.py
+import asyncio
+from typing import Optional
+
+
+def decide_batch(requests):
+    """
+    Executor side of DecisionBatcher: decide for a list of (ai, state) pairs.
+    Monte Carlo bots share one equity pass; other bots decide one by one.
+    Returns a decision dict or an Exception per request.
+    """
+    from poker_engine.monte_carlo_ai import MonteCarloAI, decide_many
+
+    results: list = [None] * len(requests)
+    monte_carlo = [i for i, (ai, _) in enumerate(requests) if isinstance(ai, MonteCarloAI)]
+    try:
+        for i, decision in zip(monte_carlo, decide_many([requests[i] for i in monte_carlo])):
+            results[i] = decision
+    except Exception:
+        # One bad request must not sink the batch: retry those bots individually
+        pass
+
+    for i, (ai, state) in enumerate(requests):
+        if results[i] is None:
+            try:
+                results[i] = ai.decide(state)
+            except Exception as e:
+                results[i] = e
+    return results
+
+
+class DecisionBatcher:
+    """
+    Collects bot decisions from all tables for a few milliseconds and ships
+    them to the executor as one job, so many waiting tables cost one round
+    trip and one batched equity pass instead of one each. Bots that search
+    (batchable = False) are sent as jobs of their own instead.
+    """
+
+    def __init__(self, executor_factory, window: float = 0.005, max_batch: int = 64):
+        self.executor_factory = executor_factory
+        self.executor = None  # created by the first flush
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: list = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def decide(self, ai, state: dict) -> dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((ai, state, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        if self.executor is None:
+            self.executor = self.executor_factory()
+        # Bots that search (batchable = False) get a job each so they spread over the workers
+        jobs = [[entry] for entry in batch if not getattr(entry[0], "batchable", True)]
+        shared = [entry for entry in batch if getattr(entry[0], "batchable", True)]
+        if shared:
+            jobs.append(shared)
+        loop = asyncio.get_running_loop()
+        for entries in jobs:
+            job = loop.run_in_executor(self.executor, decide_batch, [(ai, state) for ai, state, _ in entries])
+            job.add_done_callback(self._deliver([future for _, _, future in entries]))
+        if len(shared) > 1:
+            print(f"[BATCH] {len(shared)} bot decisions in one job")
+
+    @staticmethod
+    def _deliver(futures):
+        """Done callback that hands a job's results to the waiting futures"""
+        def deliver(job):
+            if job.exception() is not None:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(job.exception())
+                return
+            for future, result in zip(futures, job.result()):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        return deliver
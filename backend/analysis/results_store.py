@@ -0,0 +1,273 @@
+"""
+Chunked columnar store for per-hand results.
+
+Each row is one seat in one hand. Rows are buffered in typed arrays and
+written out every `chunk_rows` rows as a chunk file: a JSON header followed
+by one zlib-compressed array per column. Readers load only the columns a
+query needs, one chunk at a time, so memory stays bounded by the chunk size
+however many hands a run records.
+
+    python -m analysis.results_store summary results/
+"""
+import argparse
+import json
+import os
+import struct
+import zlib
+from array import array
+
+from poker_engine.board_texture import TEXTURE_LABELS, board_texture
+from poker_engine.evaluator import HAND_CLASS_NAMES, STRAIGHT_FLUSH, card_indices, evaluate
+
+MAGIC = b"PKRES001"
+
+STAGES = ["preflop", "flop", "turn", "river", "showdown"]
+
+# name -> array typecode
+COLUMNS = {
+    "hand_id": "I",
+    "seat": "B",
+    "bot_type": "B",  # index into the chunk's bot_types dictionary
+    "net": "i",  # chips won or lost
+    "big_blind": "I",
+    "stage_reached": "B",  # index into STAGES: where the player folded, or showdown
+    "hand_class": "B",  # evaluator category at showdown, 0 if the hand was not shown
+    "vpip": "B",
+    "pfr": "B",
+    "flop_texture": "B",  # 1 + index into TEXTURE_LABELS, 0 if the hand ended preflop
+}
+
+
+class ResultWriter:
+    """Buffers rows column by column and flushes a chunk file every chunk_rows rows"""
+
+    def __init__(self, directory, chunk_rows=65536):
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        os.makedirs(directory, exist_ok=True)
+        existing = _chunk_names(directory)
+        # Carry on after the chunks and hands already stored, so a reopened
+        # store never overwrites a chunk or reuses a hand id
+        self.chunk_index = 0
+        self.next_hand_id = 0
+        if existing:
+            self.chunk_index = int(existing[-1][len("chunk-"):-len(".col")])
+            _, data = _read_chunk(os.path.join(directory, existing[-1]), ["hand_id"])
+            self.next_hand_id = max(data["hand_id"], default=0)
+        self._reset()
+
+    def _reset(self):
+        self.columns = {name: array(code) for name, code in COLUMNS.items()}
+        self.bot_types = []
+        self._bot_codes = {}
+
+    def __len__(self):
+        return len(self.columns["hand_id"])
+
+    def new_hand_id(self):
+        self.next_hand_id += 1
+        return self.next_hand_id
+
+    def append(self, hand_id, seat, bot_type, net, big_blind, stage_reached, hand_class=0, vpip=False, pfr=False,
+               flop_texture=0):
+        code = self._bot_codes.get(bot_type)
+        if code is None:
+            code = self._bot_codes[bot_type] = len(self.bot_types)
+            self.bot_types.append(bot_type)
+        row = (hand_id, seat, code, net, big_blind, STAGES.index(stage_reached), hand_class, int(vpip), int(pfr),
+               flop_texture)
+        for column, value in zip(self.columns.values(), row):
+            column.append(value)
+        if len(self) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not len(self):
+            return
+        payloads = {name: zlib.compress(column.tobytes(), 1) for name, column in self.columns.items()}
+        header = {
+            "rows": len(self),
+            "bot_types": self.bot_types,
+            "columns": {},
+        }
+        offset = 0
+        for name, payload in payloads.items():
+            header["columns"][name] = (COLUMNS[name], offset, len(payload))
+            offset += len(payload)
+        encoded = json.dumps(header).encode()
+
+        self.chunk_index += 1
+        path = os.path.join(self.directory, f"chunk-{self.chunk_index:06d}.col")
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+            for payload in payloads.values():
+                f.write(payload)
+        os.replace(f"{path}.tmp", path)
+        self._reset()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _chunk_names(directory):
+    return sorted(f for f in os.listdir(directory) if f.startswith("chunk-") and f.endswith(".col"))
+
+
+def _read_chunk(path, columns=None):
+    """(bot_types, {column: array}) of one chunk file, reading only the requested columns"""
+    with open(path, "rb") as f:
+        if f.read(8) != MAGIC:
+            raise ValueError(f"Not a results chunk: {os.path.basename(path)}")
+        (length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(length))
+        base = 12 + length
+        data = {}
+        for column in columns or header["columns"]:
+            if column not in header["columns"]:
+                # Chunks written before the column existed read as zeros
+                data[column] = array(COLUMNS[column], [0]) * header["rows"]
+                continue
+            code, offset, size = header["columns"][column]
+            f.seek(base + offset)
+            values = array(code)
+            values.frombytes(zlib.decompress(f.read(size)))
+            data[column] = values
+    return header["bot_types"], data
+
+
+def iter_chunks(directory, columns=None):
+    """Yield (bot_types, {column: array}) per chunk, reading only the requested columns"""
+    for name in _chunk_names(directory):
+        yield _read_chunk(os.path.join(directory, name), columns)
+
+
+# --- Recording ---
+
+class HandRecorder:
+    """
+    PokerGame listener that appends a row per seated player when a hand ends.
+    bot_types maps player names to the label stored for them (e.g. the AI class).
+    """
+
+    def __init__(self, writer, bot_types):
+        self.writer = writer
+        self.bot_types = bot_types
+        self._start = {}
+        self._vpip = set()
+        self._pfr = set()
+        self._folded_at = {}
+
+    def observe(self, game, event):
+        if event["type"] == "new_hand":
+            # Blinds are already posted when new_hand fires
+            self._start = {i: p.chips + p.current_bet for i, p in enumerate(game.players) if p.name in event["players"]}
+            self._vpip.clear()
+            self._pfr.clear()
+            self._folded_at.clear()
+        elif event["type"] == "action":
+            i = event["player_index"]
+            if event["action"] == "fold":
+                self._folded_at[i] = event["stage"]
+            elif event["stage"] == "preflop" and event["action"] in ("call", "raise"):
+                self._vpip.add(i)
+                if event["action"] == "raise":
+                    self._pfr.add(i)
+        elif event["type"] == "hand_over":
+            self._record(game)
+
+    def _record(self, game):
+        hand_id = self.writer.new_hand_id()
+        showdown = game.num_in_hand > 1
+        board = card_indices(game.community_cards)
+        flop_texture = 1 + TEXTURE_LABELS.index(board_texture(board[:3]).label) if len(board) >= 3 else 0
+        for i, start in self._start.items():
+            p = game.players[i]
+            if i in self._folded_at:
+                stage, hand_class = self._folded_at[i], 0
+            elif showdown:
+                stage, hand_class = "showdown", evaluate(card_indices(p.hand) + board) >> 20
+            else:
+                stage, hand_class = game.stage, 0
+            self.writer.append(
+                hand_id, i, self.bot_types.get(p.name, "unknown"), p.chips - start, game.big_blind,
+                stage, hand_class, i in self._vpip, i in self._pfr, flop_texture,
+            )
+
+
+# --- Analytics ---
+
+def summarize(directory):
+    """
+    Per bot type: hands, win rate (share of hands with a positive net), net
+    chips, bb/100, VPIP, PFR, average net by the stage each hand ended at
+    for that player and by flop texture, and showdown hand-class counts.
+    Streams over the chunks.
+    """
+    totals = {}
+    for bot_types, data in iter_chunks(directory, ["bot_type", "net", "big_blind", "stage_reached", "hand_class", "vpip", "pfr", "flop_texture"]):
+        stats = [totals.setdefault(name, {
+            "hands": 0, "wins": 0, "net": 0, "net_bb": 0.0, "vpip": 0, "pfr": 0,
+            "stage_hands": [0] * len(STAGES), "stage_net": [0] * len(STAGES),
+            "texture_hands": [0] * (len(TEXTURE_LABELS) + 1), "texture_net": [0] * (len(TEXTURE_LABELS) + 1),
+            "hand_classes": [0] * (STRAIGHT_FLUSH + 1),
+        }) for name in bot_types]
+        for code, net, bb, stage, hand_class, vpip, pfr, texture in zip(
+            data["bot_type"], data["net"], data["big_blind"], data["stage_reached"],
+            data["hand_class"], data["vpip"], data["pfr"], data["flop_texture"],
+        ):
+            s = stats[code]
+            s["hands"] += 1
+            s["wins"] += net > 0
+            s["net"] += net
+            s["net_bb"] += net / bb
+            s["vpip"] += vpip
+            s["pfr"] += pfr
+            s["stage_hands"][stage] += 1
+            s["stage_net"][stage] += net
+            s["texture_hands"][texture] += 1
+            s["texture_net"][texture] += net
+            if hand_class:
+                s["hand_classes"][hand_class] += 1
+
+    summary = {}
+    for name, s in totals.items():
+        hands = s["hands"]
+        summary[name] = {
+            "hands": hands,
+            "win_rate": s["wins"] / hands,
+            "net": s["net"],
+            "bb_per_100": 100 * s["net_bb"] / hands,
+            "vpip": s["vpip"] / hands,
+            "pfr": s["pfr"] / hands,
+            "ev_by_stage": {
+                stage: s["stage_net"][i] / s["stage_hands"][i]
+                for i, stage in enumerate(STAGES) if s["stage_hands"][i]
+            },
+            "ev_by_flop_texture": {
+                label: s["texture_net"][i + 1] / s["texture_hands"][i + 1]
+                for i, label in enumerate(TEXTURE_LABELS) if s["texture_hands"][i + 1]
+            },
+            "showdown_hands": {
+                HAND_CLASS_NAMES[c]: n for c, n in enumerate(s["hand_classes"]) if n
+            },
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a hand results directory")
+    parser.add_argument("command", choices=["summary"])
+    parser.add_argument("directory")
+    args = parser.parse_args()
+
+    print(json.dumps(summarize(args.directory), indent=2))
+
+
+if __name__ == "__main__":
+    main()
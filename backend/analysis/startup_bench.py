@@ -0,0 +1,72 @@
+"""
+Cold-start benchmark for the API server.
+
+Starts fresh interpreters that import main and run its startup warm-up,
+in the default lazy mode and with EAGER_STARTUP=1, and reports the median
+and best times over the runs. The first bot decision or equity request
+pays for whatever the lazy mode skipped.
+
+    python -m analysis.startup_bench --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+import asyncio
+asyncio.run(main.warm_up())
+t2 = time.perf_counter()
+print(json.dumps({
+    "import": t1 - t0,
+    "warm_up": t2 - t1,
+    "engine_modules": sum(1 for m in sys.modules if m.startswith("poker_engine.")),
+}))
+"""
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(eager):
+    env = dict(os.environ, EAGER_STARTUP="1" if eager else "0")
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["process"] = time.perf_counter() - start
+    return result
+
+
+def bench(runs):
+    report = {}
+    for mode, eager in (("lazy", False), ("eager", True)):
+        samples = [run_once(eager) for _ in range(runs)]
+        report[mode] = {
+            key: {
+                "median_ms": 1000 * statistics.median(s[key] for s in samples),
+                "best_ms": 1000 * min(s[key] for s in samples),
+            }
+            for key in ("process", "import", "warm_up")
+        }
+        report[mode]["engine_modules"] = samples[-1]["engine_modules"]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API server cold-start time, lazy vs eager")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    print(json.dumps(bench(args.runs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,27 @@
-import random
-import matplotlib.pyplot as plt
-import pandas as pd
-from tqdm import trange
+import argparse
 
 from poker_engine.poker_engine_api import PokerGame
 from poker_engine.ai_player import SimpleAI
 from poker_engine.heuristic_ai import HeuristicAI
 from poker_engine.monte_carlo_ai import MonteCarloAI
+from analysis.results_store import HandRecorder, ResultWriter, summarize
 
 
-def simulate_game(ai_model_class, num_hands=50):
+def simulate_game(ai_model_class, writer, num_hands=50):
     """
     Runs multiple poker hands for a given AI model (vs a basic bot)
-    and returns results for analysis.
+    and streams the results into a ResultWriter.
     """
-    results = []
+    from tqdm import trange
+
     ai_name = ai_model_class.__name__
+    recorder = HandRecorder(writer, {"AI_Bot": ai_name, "Simple_Bot": "SimpleAI"})
 
     for i in trange(num_hands, desc=f"Simulating {ai_name}"):
         # Each hand: AI vs Simple bot
         players = ["AI_Bot", "Simple_Bot"]
         game = PokerGame(players)
+        game.add_listener(recorder.observe)
 
         # Mark which player is AI type
         for p in game.players:
@@ -57,36 +58,32 @@ def simulate_game(ai_model_class, num_hands=50):
             amt = decision.get("raise_amount", 0)
             game.execute_action(p_idx, move, amt)
 
-        results.append({
-            "ai_type": ai_name,
-            "winner": game.winner.name,
-            "stage": game.stage
-        })
-
-    return results
-
 
-def visualize(results):
-    df = pd.DataFrame(results)
+def visualize(results_dir):
+    import matplotlib.pyplot as plt
+    import pandas as pd
 
-    # Win rates
-    win_rates = df.groupby("ai_type")["winner"].value_counts(normalize=True).unstack().fillna(0)
+    # The summary has one row per bot type, however many hands were recorded
+    df = pd.DataFrame.from_dict(summarize(results_dir), orient="index")
 
-    win_rates.plot(kind="bar", figsize=(8, 5))
-    plt.title("Win Rate Comparison")
-    plt.ylabel("Win Rate")
-    plt.xlabel("AI Type")
-    plt.legend(title="Winner")
+    fig, axes = plt.subplots(1, 3, figsize=(14, 5))
+    df["win_rate"].plot(kind="bar", ax=axes[0], title="Win Rate")
+    df["bb_per_100"].plot(kind="bar", ax=axes[1], title="bb/100")
+    df[["vpip", "pfr"]].plot(kind="bar", ax=axes[2], title="VPIP / PFR")
+    for ax in axes:
+        ax.set_xlabel("AI Type")
     plt.tight_layout()
     plt.show()
 
 
 if __name__ == "__main__":
-    all_results = []
+    parser = argparse.ArgumentParser(description="Simulate the AIs against SimpleAI and plot the results")
+    parser.add_argument("--hands", type=int, default=30)
+    parser.add_argument("--out", default="results")
+    args = parser.parse_args()
 
-    # You can adjust number of simulations here
-    for ai_class in [SimpleAI, HeuristicAI, MonteCarloAI]:
-        res = simulate_game(ai_class, num_hands=30)
-        all_results.extend(res)
+    with ResultWriter(args.out) as writer:
+        for ai_class in [SimpleAI, HeuristicAI, MonteCarloAI]:
+            simulate_game(ai_class, writer, num_hands=args.hands)
 
-    visualize(all_results)
+    visualize(args.out)
@@ -0,0 +1,147 @@
+# broadcast_bus.py
+"""
+Carries broadcasts to every process that holds WebSocket connections.
+
+ConnectionManager publishes each table message on its bus. The bus sends
+it to this process's connections straight away and, in a multi-worker
+deployment, ships it to the other workers, which send it to theirs.
+Messages are envelopes of (game_id, message, seat, player_name). A seat is
+set for private messages such as hole cards.
+
+Shipping goes out in batches: everything published within one tick leaves
+as one frame per peer. To plug in an external broker (Redis pub/sub, NATS,
+...), subclass BatchingBus: send_batch() publishes the frame on the broker,
+and frames coming from the broker are handed to receive_batch().
+"""
+import asyncio
+import json
+import os
+import struct
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Optional
+
+Deliver = Callable[[str, dict, Optional[int], Optional[str]], Awaitable[None]]
+
+_LENGTH = struct.Struct("<I")
+
+
+class LocalBus:
+    """Single-process bus: publishing is local delivery"""
+
+    def __init__(self):
+        self.deliver: Optional[Deliver] = None
+
+    def attach(self, deliver: Deliver):
+        self.deliver = deliver
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def publish(self, game_id: str, message: dict, seat: Optional[int] = None, player_name: Optional[str] = None):
+        await self.deliver(game_id, message, seat, player_name)
+
+
+class BatchingBus(LocalBus, ABC):
+    """Delivers locally at once and ships envelopes to other processes once per tick"""
+
+    def __init__(self, tick: float = 0.01):
+        super().__init__()
+        self.tick = tick
+        self._pending: list = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def publish(self, game_id: str, message: dict, seat: Optional[int] = None, player_name: Optional[str] = None):
+        await self.deliver(game_id, message, seat, player_name)
+        self._pending.append((game_id, message, seat, player_name))
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.tick, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.create_task(self._send(json.dumps(batch, separators=(",", ":")).encode()))
+
+    async def _send(self, data: bytes):
+        try:
+            await self.send_batch(data)
+        except Exception as e:
+            print(f"[BUS] Failed to ship batch: {e}")
+
+    @abstractmethod
+    async def send_batch(self, data: bytes):
+        """Ship one frame of envelopes to the other processes"""
+
+    async def receive_batch(self, data: bytes):
+        for game_id, message, seat, player_name in json.loads(data):
+            await self.deliver(game_id, message, seat, player_name)
+
+
+class UnixSocketBus(BatchingBus):
+    """
+    Workers on one host, each listening on <directory>/<pid>.sock. A batch
+    goes to every other socket in the directory as a length-prefixed frame.
+    Sockets that refuse connections belong to dead workers and are removed.
+    """
+
+    def __init__(self, directory: str, tick: float = 0.01):
+        super().__init__(tick)
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.sock")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._peers: Dict[str, asyncio.StreamWriter] = {}
+
+    async def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        print(f"[BUS] Listening on {self.path}")
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for writer in self._peers.values():
+            writer.close()
+        self._peers.clear()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+                await self.receive_batch(await reader.readexactly(length))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # the peer went away
+        except asyncio.CancelledError:
+            pass  # shutting down
+        finally:
+            writer.close()
+
+    async def send_batch(self, data: bytes):
+        frame = _LENGTH.pack(len(data)) + data
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path == self.path or not name.endswith(".sock"):
+                continue
+            try:
+                writer = self._peers.get(path)
+                if writer is None or writer.is_closing():
+                    _, writer = await asyncio.open_unix_connection(path)
+                    self._peers[path] = writer
+                writer.write(frame)
+                await writer.drain()
+            except ConnectionRefusedError:
+                self._peers.pop(path, None)
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            except (OSError, ConnectionError) as e:
+                print(f"[BUS] Dropping peer {path}: {e}")
+                self._peers.pop(path, None)
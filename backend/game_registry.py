@@ -0,0 +1,154 @@
+# game_registry.py
+import os
+import pickle
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from poker_engine.poker_engine_api import PokerGame
+from table_actor import TableActor
+
+
+class SnapshotStore:
+    """Pickled games on disk, one file per game"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, game_id: str) -> str:
+        if not game_id.replace("-", "").isalnum():
+            raise ValueError(f"Invalid game id: {game_id!r}")
+        return os.path.join(self.directory, f"{game_id}.pkl")
+
+    def save(self, game_id: str, game: PokerGame):
+        path = self._path(game_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(game, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def load(self, game_id: str) -> Optional[PokerGame]:
+        try:
+            with open(self._path(game_id), "rb") as f:
+                return pickle.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def delete(self, game_id: str):
+        try:
+            os.remove(self._path(game_id))
+        except (OSError, ValueError):
+            pass
+
+    def __contains__(self, game_id: str) -> bool:
+        try:
+            return os.path.exists(self._path(game_id))
+        except ValueError:
+            return False
+
+
+class GameRegistry:
+    """
+    Resident games with last-activity tracking.
+
+    Games idle for longer than idle_ttl, or the least recently active ones
+    once more than max_resident are in memory, are written to the snapshot
+    store and dropped along with their actor. get() rehydrates them transparently. is_busy lets the
+    server veto evicting a game (e.g. one with open WebSocket connections).
+    """
+
+    def __init__(self, store: SnapshotStore, idle_ttl: float = 1800, max_resident: int = 1000):
+        self.store = store
+        self.idle_ttl = idle_ttl
+        self.max_resident = max_resident
+        self.games: "OrderedDict[str, PokerGame]" = OrderedDict()  # least recently active first
+        self.last_activity: Dict[str, float] = {}
+        self.actors: Dict[str, TableActor] = {}
+        self.is_busy: Callable[[str], bool] = lambda game_id: False
+        self.on_evict: list = []  # callback(game_id)
+        self.on_restore: list = []  # callback(game_id, game)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self.games or game_id in self.store
+
+    def __len__(self):
+        return len(self.games)
+
+    def add(self, game_id: str, game: PokerGame):
+        self.games[game_id] = game
+        self.touch(game_id)
+        self.enforce_cap(keep=game_id)
+
+    def peek(self, game_id: str) -> Optional[PokerGame]:
+        """Resident game only, without counting as activity (for timers)"""
+        return self.games.get(game_id)
+
+    def get(self, game_id: str) -> Optional[PokerGame]:
+        """Game for a client request, rehydrating it from the snapshot store if needed"""
+        game = self.games.get(game_id)
+        if game is None:
+            game = self.store.load(game_id)
+            if game is None:
+                return None
+            self.store.delete(game_id)
+            self.games[game_id] = game
+            print(f"[REGISTRY] Restored game {game_id}")
+            for callback in self.on_restore:
+                callback(game_id, game)
+            self.enforce_cap(keep=game_id)
+        self.touch(game_id)
+        return game
+
+    def touch(self, game_id: str):
+        if game_id in self.games:
+            self.last_activity[game_id] = time.time()
+            self.games.move_to_end(game_id)
+
+    def actor(self, game_id: str) -> Optional[TableActor]:
+        """The actor that owns a resident game, created on first use"""
+        actor = self.actors.get(game_id)
+        if actor is None and game_id in self.games:
+            actor = self.actors[game_id] = TableActor(game_id, self.games[game_id])
+        return actor
+
+    def _stop_actor(self, game_id: str):
+        actor = self.actors.pop(game_id, None)
+        if actor is not None:
+            actor.stop()
+
+    def remove(self, game_id: str):
+        """Forget a game entirely, including its snapshot"""
+        self.games.pop(game_id, None)
+        self.last_activity.pop(game_id, None)
+        self._stop_actor(game_id)
+        self.store.delete(game_id)
+
+    def evict(self, game_id: str) -> bool:
+        actor = self.actors.get(game_id)
+        if game_id not in self.games or (actor and not actor.is_idle()) or self.is_busy(game_id):
+            return False
+        for callback in self.on_evict:
+            callback(game_id)
+        self.store.save(game_id, self.games.pop(game_id))
+        self.last_activity.pop(game_id, None)
+        self._stop_actor(game_id)
+        print(f"[REGISTRY] Evicted idle game {game_id}")
+        return True
+
+    def evict_idle(self) -> int:
+        cutoff = time.time() - self.idle_ttl
+        idle = [gid for gid in self.games if self.last_activity.get(gid, 0) < cutoff]
+        return sum(1 for gid in idle if self.evict(gid))
+
+    def enforce_cap(self, keep: Optional[str] = None):
+        """Evict the least recently active games down to the cap, never `keep` (the game just brought in)"""
+        if len(self.games) <= self.max_resident:
+            return
+        for game_id in list(self.games):
+            if len(self.games) <= self.max_resident:
+                break
+            if game_id != keep:
+                self.evict(game_id)
+        if len(self.games) > self.max_resident:
+            print(f"[REGISTRY] {len(self.games)} resident games exceed the cap of {self.max_resident}; all are busy")
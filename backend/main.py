@@ -1,17 +1,26 @@
 # main.py
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Header, HTTPException, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from uuid import uuid4
-from concurrent.futures import ProcessPoolExecutor
 import asyncio
-from poker_engine.monte_carlo_ai import MonteCarloAI
+import os
+import time
 from fastapi import Body
 import random
 from poker_engine.poker_engine_api import PokerGame
-from ws_manager import ConnectionManager
-
-manager = ConnectionManager()
+from poker_engine.hud_stats import HudStats
+from poker_engine.tournament import Tournament
+from ws_manager import PROTOCOLS, ConnectionManager
+from broadcast_bus import LocalBus, UnixSocketBus
+from scheduler import DeadlineScheduler
+from game_registry import GameRegistry, SnapshotStore
+from ai_batcher import DecisionBatcher
+
+# Set when running several workers, so broadcasts reach the connections held by each of them
+BROADCAST_BUS_DIR = os.environ.get("BROADCAST_BUS_DIR")
+manager = ConnectionManager(UnixSocketBus(BROADCAST_BUS_DIR) if BROADCAST_BUS_DIR else LocalBus())
+scheduler = DeadlineScheduler()
 
 app = FastAPI(title="Poker Game API")
 
@@ -23,13 +32,60 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-games = {}
-locks = {}
-lobby_timers = {}
-executor = ProcessPoolExecutor(max_workers=2)
-
 LOBBY_DURATION = 15
+LOBBY_WARNING = 5  # seconds before the start when game_starting is set
+TURN_DURATION = 20  # seconds a human has to act before their time bank kicks in
 MIN_PLAYERS = 2
+TOURNAMENT_HAND_PAUSE = 3  # seconds between hands at a tournament table
+LONG_POLL_MAX = 30  # seconds a /state long-poll may wait
+BROADCAST_WINDOW = float(os.environ.get("BROADCAST_WINDOW_MS", 30)) / 1000  # state changes inside this window share one broadcast
+
+GAME_IDLE_TTL = float(os.environ.get("GAME_IDLE_TTL", 1800))  # seconds without client activity before eviction
+MAX_RESIDENT_GAMES = int(os.environ.get("MAX_RESIDENT_GAMES", 1000))
+GAME_SNAPSHOT_DIR = os.environ.get("GAME_SNAPSHOT_DIR", "game_snapshots")
+SWEEP_INTERVAL = 60
+# Import the engines and start the worker pool at startup instead of on first use
+EAGER_STARTUP = os.environ.get("EAGER_STARTUP", "0") == "1"
+
+registry = GameRegistry(SnapshotStore(GAME_SNAPSHOT_DIR), idle_ttl=GAME_IDLE_TTL, max_resident=MAX_RESIDENT_GAMES)
+range_trackers = {}
+hud = HudStats()
+turn_clocks = {}
+state_events = {}  # game_id -> asyncio.Event set on the next state change
+bot_tasks = {}  # game_id -> task playing the table's bot turns
+tournaments = {}
+table_tournaments = {}  # table game_id -> tournament_id
+_executor = None
+
+def get_executor():
+    """Worker pool for bot decisions and equity jobs, started on first use"""
+    global _executor
+    if _executor is None:
+        from concurrent.futures import ProcessPoolExecutor
+        _executor = ProcessPoolExecutor(max_workers=2)
+    return _executor
+
+batcher = DecisionBatcher(get_executor)
+
+# AI engines (and the evaluator tables behind them) are imported on first use
+def monte_carlo_ai(name: str):
+    from poker_engine.monte_carlo_ai import MonteCarloAI
+    return MonteCarloAI(name=name, simulations=200)
+
+def cfr_ai(name: str):
+    from poker_engine.cfr_ai import CFRBot
+    return CFRBot(name=name)
+
+def mcts_ai(name: str):
+    from poker_engine.mcts_ai import MCTSBot
+    return MCTSBot(name=name)
+
+AI_TYPES = {
+    "monte_carlo": monte_carlo_ai,
+    "cfr": cfr_ai,
+    "mcts": mcts_ai,
+}
+DEFAULT_AI_TYPE = "monte_carlo"
 
 # --- Request models ---
 class CreateGameRequest(BaseModel):
@@ -52,61 +108,409 @@ class UpgradeToPlayerMessage(BaseModel):
     player_name: str
     seat_index: int
 
+class CreateTournamentRequest(BaseModel):
+    player_names: list[str] = []
+    bots: int = 0
+    ai_type: str = DEFAULT_AI_TYPE
+    table_size: int = 9
+    starting_stack: int = 1500
+    level_duration: int = 600  # seconds per blind level
+
+class EquityRequest(BaseModel):
+    ranges: list[str]
+    board: list[str] = []
+    dead: list[str] = []
+    iterations: int | None = 2000
+
+# --- State changes ---
+async def publish(game_id: str, game: PokerGame, urgent: bool = False):
+    """
+    Announce a change to a game: bump its version and wake long-polls now,
+    and broadcast it within BROADCAST_WINDOW. Changes inside one window
+    share a single broadcast of the latest state. Urgent changes, and the
+    end of a hand, go out immediately.
+    """
+    game.bump_version()
+    wake_state_waiters(game_id)
+    if urgent or game.game_over or BROADCAST_WINDOW <= 0:
+        await flush_broadcast(game_id)
+    elif scheduler.deadline(("broadcast", game_id)) is None:
+        scheduler.schedule_in(("broadcast", game_id), BROADCAST_WINDOW, lambda: flush_broadcast(game_id))
+
+async def flush_broadcast(game_id: str):
+    scheduler.cancel(("broadcast", game_id))
+    game = registry.peek(game_id)
+    if game:
+        await manager.broadcast(game_id, game)
+
+async def send_event(game_id: str, message: dict):
+    """Broadcast a message, after any state change it follows"""
+    if scheduler.deadline(("broadcast", game_id)) is not None:
+        await flush_broadcast(game_id)
+    await manager.broadcast(game_id, message)
+
+def wake_state_waiters(game_id: str):
+    event = state_events.pop(game_id, None)
+    if event:
+        event.set()
+
+def state_changed(game_id: str) -> asyncio.Event:
+    event = state_events.get(game_id)
+    if event is None:
+        event = state_events[game_id] = asyncio.Event()
+    return event
+
 # --- Lobby Management ---
-async def start_lobby_timer(game_id: str):
-    """Start or restart the lobby timer for a game"""
-    if game_id in lobby_timers:
-        lobby_timers[game_id].cancel()
-    
-    lobby_timers[game_id] = asyncio.create_task(lobby_countdown(game_id))
-
-async def lobby_countdown(game_id: str):
-    """Countdown timer for lobby phase"""
-    game = games.get(game_id)
+def start_lobby_timer(game_id: str):
+    """
+    Start or restart the lobby countdown for a game.
+    Clients get the deadline once and count down locally; the only other
+    broadcast is when the "game starting" warning switches on.
+    """
+    game = registry.peek(game_id)
     if not game:
         return
 
-    try:
-        for remaining in range(LOBBY_DURATION, -1, -1):
-            game.lobby_timer = remaining
-            game.game_starting = remaining <= 5 and remaining > 0
-            
-            await manager.broadcast(game_id, game)
-            
-            if remaining == 0:
-                break
-                
-            await asyncio.sleep(1)
-        
-        await check_and_start_game(game_id)
-        
-    except asyncio.CancelledError:
-        pass
-    except Exception as e:
-        print(f"Lobby timer error for game {game_id}: {e}")
+    deadline = time.time() + LOBBY_DURATION
+    game.lobby_deadline = deadline
+    game.lobby_timer = LOBBY_DURATION
+    game.game_starting = False
+
+    scheduler.schedule(("lobby", game_id), deadline, lambda: check_and_start_game(game_id))
+    scheduler.schedule(("lobby_warning", game_id), deadline - LOBBY_WARNING, lambda: lobby_warning(game_id))
+
+def cancel_lobby_timer(game_id: str):
+    scheduler.cancel(("lobby", game_id))
+    scheduler.cancel(("lobby_warning", game_id))
+    game = registry.peek(game_id)
+    if game:
+        game.lobby_deadline = None
+
+async def lobby_warning(game_id: str):
+    """Flag the last seconds of the lobby countdown"""
+    game = registry.peek(game_id)
+    if not game or game.stage != "lobby":
+        return
+    game.game_starting = True
+    await publish(game_id, game)
 
 async def check_and_start_game(game_id: str):
     """Check if game can start and begin if conditions are met"""
-    game = games.get(game_id)
-    if not game:
+    actor = registry.actor(game_id)
+    if not actor:
         return
 
-    async with locks[game_id]:
+    async def command(game: PokerGame):
+        if game.stage != "lobby":
+            return
         active_players = sum(1 for p in game.players if getattr(p, "name", "") and getattr(p, "name", "") != "")
         
         if active_players >= MIN_PLAYERS:
             print(f"Starting game {game_id} with {active_players} players")
+            cancel_lobby_timer(game_id)
             game.stage = "preflop"
             game.lobby_timer = None
             game.game_starting = False
             
             game.play_hand()
-            await manager.broadcast(game_id, game)
+            start_turn(game_id)
+            await publish(game_id, game)
         else:
             print(f"Not enough players for game {game_id} ({active_players}/{MIN_PLAYERS})")
-            game.lobby_timer = LOBBY_DURATION
-            await manager.broadcast(game_id, game)
-            await start_lobby_timer(game_id)
+            start_lobby_timer(game_id)
+            await publish(game_id, game)
+
+    await actor.call("lobby_timeout", command)
+
+# --- Action clock ---
+def arm_turn_timer(game_id: str):
+    """(Re)arm the action clock after anything that may have moved the turn"""
+    game = registry.peek(game_id)
+    if not game:
+        return
+
+    clock = turn_clocks.get(game_id)
+    if clock and clock["turn"] == game.turn_counter and not game.game_over:
+        return  # the same turn is still running
+    if clock and clock["bank_started"] is not None:
+        player = game.players[clock["player_index"]]
+        player.time_bank = max(0, player.time_bank - (time.time() - clock["bank_started"]))
+
+    idx = game.current_player_index
+    if game.game_over or idx is None or game.stage == "lobby" or getattr(game.players[idx], "is_bot", False):
+        scheduler.cancel(("turn", game_id))
+        turn_clocks.pop(game_id, None)
+        game.turn_deadline = None
+        return
+
+    turn = game.turn_counter
+    game.turn_deadline = scheduler.schedule_in(("turn", game_id), TURN_DURATION, lambda: turn_timeout(game_id, turn))
+    turn_clocks[game_id] = {"turn": turn, "player_index": idx, "bank_started": None}
+
+def cancel_turn_timer(game_id: str):
+    scheduler.cancel(("turn", game_id))
+    turn_clocks.pop(game_id, None)
+
+async def turn_timeout(game_id: str, turn: int):
+    """The action clock ran out: start the player's time bank, or act for them"""
+    actor = registry.actor(game_id)
+    if not actor:
+        return
+
+    async def command(game: PokerGame):
+        clock = turn_clocks.get(game_id)
+        if not clock or clock["turn"] != turn or game.turn_counter != turn:
+            return  # the player acted in the meantime
+
+        player = game.players[clock["player_index"]]
+        if clock["bank_started"] is None and player.time_bank >= 1:
+            clock["bank_started"] = time.time()
+            game.turn_deadline = scheduler.schedule_in(("turn", game_id), player.time_bank, lambda: turn_timeout(game_id, turn))
+            print(f"[CLOCK] {player.name} is using their time bank ({player.time_bank:.0f}s)")
+            await publish(game_id, game)
+            return
+
+        if clock["bank_started"] is not None:
+            player.time_bank = 0
+            clock["bank_started"] = None
+
+        result = game.timeout_action()
+        print(f"[CLOCK] {player.name} timed out: {result}")
+        start_turn(game_id)
+        await publish(game_id, game)
+
+    await actor.call("timeout", command)
+
+# --- Bots ---
+def start_turn(game_id: str):
+    """
+    Call from a table command after anything that may have moved the turn:
+    hands a bot's turn to the table's bot task, or starts a human's clock
+    """
+    game = registry.peek(game_id)
+    idx = game.current_player_index
+    if not game.game_over and idx is not None and getattr(game.players[idx], "is_bot", False):
+        task = bot_tasks.get(game_id)
+        if task is None or task.done():
+            bot_tasks[game_id] = asyncio.create_task(run_bot_turns(game_id))
+    arm_turn_timer(game_id)
+
+def bot_to_act(game: PokerGame):
+    """Turn number if a bot is to act, else None"""
+    idx = game.current_player_index
+    if game.game_over or idx is None or not getattr(game.players[idx], "is_bot", False):
+        return None
+    return game.turn_counter
+
+async def run_bot_turns(game_id: str):
+    """
+    Play bot turns until a human is to act. Bots think and decide outside
+    the table actor, so other commands are never queued behind them; only
+    reading the state and applying the decision are table commands.
+    """
+    task = asyncio.current_task()
+
+    def next_turn(game: PokerGame):
+        # Stand down in the same command that finds no bot to act, so a turn
+        # handed to a bot by a later command starts a fresh task (start_turn)
+        turn = bot_to_act(game)
+        if turn is None and bot_tasks.get(game_id) is task:
+            del bot_tasks[game_id]
+        return turn
+
+    while True:
+        actor = registry.actor(game_id)
+        if not actor:
+            return
+        turn = await actor.call("bot_turn", next_turn)
+        if turn is None:
+            return
+
+        think_time = random.uniform(1, 2)
+        await asyncio.sleep(think_time)
+
+        prepared = await actor.call("bot_state", prepare_bot_state, game_id, turn)
+        if prepared is None:
+            continue  # the turn moved on while the bot was thinking
+        ai_player, ai_state = prepared
+        print(f"[AI TURN] {ai_player.name}")
+
+        try:
+            ai_decision = await batcher.decide(ai_player, ai_state)
+            print(f"[AI DECISION] {ai_player.name}: {ai_decision}")
+        except Exception as e:
+            print(f"[AI ERROR] {ai_player.name} failed to decide: {e}")
+            ai_decision = {"move": "fold", "raise_amount": 0}
+
+        await actor.call("bot_action", apply_bot_decision, game_id, turn, ai_decision, think_time)
+
+def prepare_bot_state(game: PokerGame, game_id: str, turn: int):
+    if game.turn_counter != turn or game.game_over:
+        return None
+    ai_player_obj = game.players[game.current_player_index]
+    ai_name = ai_player_obj.name
+
+    ai_state = game.get_game_state()
+    ai_state["opponent_ranges"] = range_trackers[game_id].opponent_ranges(game, ai_name)
+    ai_state["hud"] = table_stats(game_id, game)
+    ai_state["big_blind"] = game.big_blind
+
+    ai_player = AI_TYPES[getattr(ai_player_obj, "ai_type", DEFAULT_AI_TYPE)](ai_name)
+    return ai_player, ai_state
+
+async def apply_bot_decision(game: PokerGame, game_id: str, turn: int, ai_decision: dict, think_time: float):
+    if game.turn_counter != turn or game.game_over:
+        return None
+    ai_name = game.players[game.current_player_index].name
+    move = ai_decision["move"]
+    amt = ai_decision.get("raise_amount", 0)
+
+    print(f"[AI ACTION] {ai_name} chooses {move} {amt if amt else ''} after {think_time:.1f}s")
+    result = game.execute_action(game.current_player_index, move, amt)
+    print(f"[AI ACTION RESULT] {result}")
+    if result.get("error"):
+        # Don't let a bad decision stall the table
+        result = game.timeout_action()
+        move, amt = result.get("auto_action", move), 0
+    start_turn(game_id)
+
+    await publish(game_id, game)
+    await send_event(game_id, {
+        "type": "action_log",
+        "message": f"{ai_name} waited {think_time:.1f}s → {move} {amt if amt else ''}",
+    })
+    return result
+
+# --- Game registry ---
+def attach_listeners(game_id: str, game: PokerGame):
+    from poker_engine.range_tracker import RangeTracker
+    tracker = RangeTracker()
+    game.add_listener(tracker.observe)
+    game.add_listener(hud.listener(game_id))
+    range_trackers[game_id] = tracker
+
+def table_stats(game_id: str, game: PokerGame) -> dict:
+    return hud.snapshot(game_id, (p.name for p in game.players if p.name))
+
+def release_game(game_id: str):
+    """Drop everything the server holds for a game besides the game itself"""
+    cancel_lobby_timer(game_id)
+    cancel_turn_timer(game_id)
+    scheduler.cancel(("broadcast", game_id))
+    manager.forget_game(game_id)
+    wake_state_waiters(game_id)
+    task = bot_tasks.pop(game_id, None)
+    if task:
+        task.cancel()
+    range_trackers.pop(game_id, None)
+    hud.forget(game_id)
+
+def restore_game(game_id: str, game: PokerGame):
+    """Re-attach listeners and timers to a game rehydrated from its snapshot"""
+    attach_listeners(game_id, game)
+    if game.stage == "lobby":
+        start_lobby_timer(game_id)
+    else:
+        start_turn(game_id)
+
+def sweep_idle_games():
+    evicted = registry.evict_idle()
+    if evicted:
+        print(f"[REGISTRY] Evicted {evicted} idle games, {len(registry)} resident")
+    scheduler.schedule_in(("registry_sweep",), SWEEP_INTERVAL, sweep_idle_games)
+
+registry.is_busy = lambda game_id: bool(manager.game_connections.get(game_id)) or game_id in table_tournaments
+registry.on_evict.append(release_game)
+registry.on_restore.append(restore_game)
+
+@app.on_event("startup")
+async def start_registry_sweep():
+    scheduler.schedule_in(("registry_sweep",), SWEEP_INTERVAL, sweep_idle_games)
+
+@app.on_event("startup")
+async def start_broadcast_bus():
+    await manager.bus.start()
+
+@app.on_event("shutdown")
+async def close_broadcast_bus():
+    await manager.bus.close()
+
+@app.on_event("startup")
+async def warm_up():
+    if not EAGER_STARTUP:
+        return
+    from poker_engine import equity, range_tracker
+    for make_ai in AI_TYPES.values():
+        make_ai("warmup")
+    get_executor()
+    print("[STARTUP] Engines loaded eagerly")
+
+# --- Tournaments ---
+def tournament_listener(tournament_id: str, table_id: str):
+    def on_event(game, event):
+        if event["type"] == "hand_over":
+            scheduler.schedule_in(
+                ("tournament_hand", table_id), TOURNAMENT_HAND_PAUSE,
+                lambda: next_tournament_hand(tournament_id, table_id),
+            )
+    return on_event
+
+def schedule_blind_level(tournament_id: str, level_duration: float):
+    def level_up():
+        tournament = tournaments.get(tournament_id)
+        if tournament and not tournament.is_finished and tournament.level_up():
+            print(f"[MTT] {tournament_id} blinds up to {tournament.blinds}")
+            schedule_blind_level(tournament_id, level_duration)
+    scheduler.schedule_in(("tournament_level", tournament_id), level_duration, level_up)
+
+async def start_tournament_hand(tournament_id: str, table_id: str):
+    tournament = tournaments[tournament_id]
+    actor = registry.actor(table_id)
+    if not actor:
+        return
+
+    async def command(game: PokerGame):
+        if not tournament.can_start_hand(table_id):
+            return
+        tournament.start_hand(table_id)
+        start_turn(table_id)
+        await publish(table_id, game)
+
+    await actor.call("start_tournament_hand", command)
+
+async def next_tournament_hand(tournament_id: str, table_id: str):
+    """A table finished its hand: eliminate, rebalance, then deal again wherever possible"""
+    tournament = tournaments.get(tournament_id)
+    if not tournament or table_id not in tournament.tables:
+        return
+
+    # finish_hand also seats players at other tables. It never awaits, so on
+    # the one event loop it can't interleave with those tables' commands.
+    moves = await registry.actor(table_id).call("finish_hand", lambda game: tournament.finish_hand(table_id))
+    for name, from_table, to_table in moves:
+        print(f"[MTT] {name} moves from {from_table} to {to_table}")
+        await send_event(from_table, {"type": "player_moved", "player_name": name, "table_id": to_table})
+
+    if table_id not in tournament.tables:
+        print(f"[MTT] Table {table_id} broken, {len(tournament.tables)} tables left")
+        release_game(table_id)
+        table_tournaments.pop(table_id, None)
+        await send_event(table_id, {"type": "table_broken", "table_id": table_id})
+
+    if tournament.is_finished:
+        print(f"[MTT] {tournament_id} won by {tournament.winner}")
+        scheduler.cancel(("tournament_level", tournament_id))
+        for remaining in tournament.tables:
+            cancel_turn_timer(remaining)
+            table_tournaments.pop(remaining, None)
+        return
+
+    for target in {table_id} | {to_table for _, _, to_table in moves}:
+        if target in tournament.tables:
+            if tournament.can_start_hand(target):
+                await start_tournament_hand(tournament_id, target)
+            else:
+                await publish(target, tournament.tables[target])
 
 def get_active_player_count(game: PokerGame) -> int:
     """Count how many players are actively seated"""
@@ -133,24 +537,27 @@ async def create_game(req: CreateGameRequest):
             p.is_bot = True
             print(f"Added Bot to seat {i}")
 
-    games[game_id] = game
-    locks[game_id] = asyncio.Lock()
+    registry.add(game_id, game)
+    attach_listeners(game_id, game)
 
-    await start_lobby_timer(game_id)
+    start_lobby_timer(game_id)
 
-    return {"game_id": game_id, "state": game.get_game_state()}
+    return {"game_id": game_id, "state": game.get_game_state(public=True)}
 
 @app.post("/add_ai_player/{game_id}")
 async def add_ai_player(game_id: str, payload: dict = Body(...)):
     """Add an AI player to an empty seat"""
-    game = games.get(game_id)
+    game = registry.get(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
 
     seat_index = payload.get("seat_index")
     ai_name = payload.get("ai_name", "AI Player")
+    ai_type = payload.get("ai_type", DEFAULT_AI_TYPE)
+    if ai_type not in AI_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown AI type: {ai_type}")
 
-    async with locks[game_id]:
+    async def command(game: PokerGame):
         if game.stage != "lobby":
             raise HTTPException(status_code=400, detail="Can only add AI players during lobby phase")
 
@@ -163,42 +570,46 @@ async def add_ai_player(game_id: str, payload: dict = Body(...)):
 
         existing.name = ai_name
         existing.is_bot = True
+        existing.ai_type = ai_type
         existing.folded = False
         existing.current_bet = 0
         if existing.chips <= 0:
             existing.chips = 1000
         existing.hand = []
 
-        await start_lobby_timer(game_id)
-        await manager.broadcast(game_id, game)
+        start_lobby_timer(game_id)
+        await publish(game_id, game)
 
-    return {"success": True, "state": game.get_game_state()}
+    await registry.actor(game_id).call("add_ai_player", command)
+
+    return {"success": True, "state": game.get_game_state(public=True)}
 
 @app.post("/start_hand/{game_id}")
 async def start_hand(game_id: str):
     """Start a new hand for an existing game"""
-    game = games.get(game_id)
+    game = registry.get(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
 
-    async with locks[game_id]:
+    async def command(game: PokerGame):
         if getattr(game, 'stage', '') == 'lobby':
             active_players = get_active_player_count(game)
             if active_players < MIN_PLAYERS:
                 raise HTTPException(status_code=400, detail=f"Need at least {MIN_PLAYERS} players to start")
             
-            if game_id in lobby_timers:
-                lobby_timers[game_id].cancel()
-                del lobby_timers[game_id]
+            cancel_lobby_timer(game_id)
             
             game.stage = "preflop"
             game.lobby_timer = None
             game.game_starting = False
         
         game.play_hand()
-        await manager.broadcast(game_id, game)
+        start_turn(game_id)
+        await publish(game_id, game)
+
+        return {"message": "New hand started", "state": game.get_game_state(public=True)}
 
-        return {"message": "New hand started", "state": game.get_game_state()}
+    return await registry.actor(game_id).call("start_hand", command)
 
 @app.post("/join_seat/{game_id}")
 async def join_seat(game_id: str, payload: JoinSeatRequest):
@@ -206,14 +617,14 @@ async def join_seat(game_id: str, payload: JoinSeatRequest):
     Join a seat in the game during lobby phase.
     NOTE: This is called via HTTP, not WebSocket message
     """
-    game = games.get(game_id)
+    game = registry.get(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
 
     player_name = payload.player_name
     seat_index = payload.seat_index
 
-    async with locks[game_id]:
+    async def command(game: PokerGame):
         if getattr(game, 'stage', '') != 'lobby':
             raise HTTPException(status_code=400, detail="Can only join seats during lobby phase")
 
@@ -232,21 +643,23 @@ async def join_seat(game_id: str, payload: JoinSeatRequest):
             existing.chips = 1000
         existing.hand = []
 
-        await start_lobby_timer(game_id)
-        await manager.broadcast(game_id, game)
+        start_lobby_timer(game_id)
+        await publish(game_id, game)
+
+    await registry.actor(game_id).call("join", command)
 
-    return {"success": True, "state": game.get_game_state()}
+    return {"success": True, "state": game.get_game_state(public=True)}
 
 @app.post("/leave_seat/{game_id}")
 async def leave_seat(game_id: str, payload: LeaveSeatRequest):
     """Leave a seat during lobby phase"""
-    game = games.get(game_id)
+    game = registry.get(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
 
     seat_index = payload.seat_index
 
-    async with locks[game_id]:
+    async def command(game: PokerGame):
         if getattr(game, 'stage', '') != 'lobby':
             raise HTTPException(status_code=400, detail="Can only leave seats during lobby phase")
 
@@ -265,110 +678,198 @@ async def leave_seat(game_id: str, payload: LeaveSeatRequest):
         player.current_bet = 0
         player.hand = []
 
-        await start_lobby_timer(game_id)
-        await manager.broadcast(game_id, game)
+        start_lobby_timer(game_id)
+        await publish(game_id, game)
+
+    await registry.actor(game_id).call("leave", command)
 
-    return {"success": True, "state": game.get_game_state()}
+    return {"success": True, "state": game.get_game_state(public=True)}
 
 @app.post("/action/{game_id}")
-async def player_action(game_id: str, data: dict = Body(...)):
-    """Execute a player's action, and trigger AI moves if it's the bot's turn."""
-    game = games.get(game_id)
+async def player_action(game_id: str, req: ActionRequest):
+    """
+    Execute a player's action. Any bot turns that follow are played by the
+    table's bot task and stream to clients as "action_log" messages.
+    """
+    game = registry.get(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
 
-    if getattr(game, 'stage', '') == 'lobby':
-        raise HTTPException(status_code=400, detail="Game is in lobby phase - cannot perform actions")
+    async def command(game: PokerGame):
+        if getattr(game, 'stage', '') == 'lobby':
+            raise HTTPException(status_code=400, detail="Game is in lobby phase - cannot perform actions")
 
-    async with locks[game_id]:
-        player_index = data["player_index"]
-        action = data["action"]
-        raise_amount = data.get("raise_amount", 0)
+        player_index = req.player_index
+        action = req.action
+        raise_amount = req.raise_amount or 0
+        if not 0 <= player_index < len(game.players):
+            raise HTTPException(status_code=400, detail="Invalid seat index")
 
         print(f"[ACTION] Player {player_index} ({game.players[player_index].name}) action: {action} {raise_amount}")
 
         result = game.execute_action(player_index, action, raise_amount)
         print(f"[ACTION RESULT] {result}")
-        
-        state = game.get_game_state()
-        await manager.broadcast(game_id, game)
+        if result.get("success"):
+            # A rejected action changed nothing: keep the clock and the version
+            start_turn(game_id)
+            await publish(game_id, game)
+        state = game.get_game_state(public=True)
 
         messages = [f"{game.players[player_index].name} chose {action} {raise_amount if raise_amount else ''}".strip()]
 
-        # AI turn loop
-        ai_iterations = 0
-        max_ai_iterations = 20
-        
-        while (
-            not game.game_over
-            and game.current_player_index is not None
-            and getattr(game.players[game.current_player_index], "is_bot", False)
-            and ai_iterations < max_ai_iterations
-        ):
-            ai_iterations += 1
-            ai_player_obj = game.players[game.current_player_index]
-            ai_name = ai_player_obj.name
-
-            print(f"[AI TURN] {ai_name} (iteration {ai_iterations})")
+        return {"result": result, "state": state, "messages": messages}
 
-            think_time = random.uniform(1, 2)
-            await asyncio.sleep(think_time)
+    return await registry.actor(game_id).call("action", command)
 
-            ai_state = game.get_game_state()
-            loop = asyncio.get_event_loop()
+@app.get("/state/{game_id}")
+async def get_state(
+    game_id: str, response: Response, since: int | None = None, wait: float = 0,
+    if_none_match: str | None = Header(None), viewer: str | None = None,
+):
+    """
+    Return the public state of the game, or the state as a seated player
+    sees it with viewer=<name>, with its state version and view as the ETag.
+    A matching If-None-Match gets a 304 without building the state.
+    With since=<version> and wait=<seconds> the request long-polls: it is
+    held until the version moves past since, or gets a 304 when wait runs out.
+    """
+    game = registry.get(game_id)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
 
-            ai_player = MonteCarloAI(name=ai_name, simulations=200)
-            
+    if since is not None and wait > 0:
+        deadline = time.time() + min(wait, LONG_POLL_MAX)
+        while game.state_version <= since:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
             try:
-                ai_decision = await loop.run_in_executor(executor, ai_player.decide, ai_state)
-                print(f"[AI DECISION] {ai_name}: {ai_decision}")
-            except Exception as e:
-                print(f"[AI ERROR] {ai_name} failed to decide: {e}")
-                ai_decision = {"move": "fold", "raise_amount": 0}
-
-            move = ai_decision["move"]
-            amt = ai_decision.get("raise_amount", 0)
-
-            print(f"[AI ACTION] {ai_name} chooses {move} {amt if amt else ''} after {think_time:.1f}s")
-            messages.append(f"{ai_name} waited {think_time:.1f}s → {move} {amt if amt else ''}")
-
-            result = game.execute_action(game.current_player_index, move, amt)
-            print(f"[AI ACTION RESULT] {result}")
-            
-            state = game.get_game_state()
-            await manager.broadcast(game_id, game)
-
-        if ai_iterations >= max_ai_iterations:
-            print(f"[WARNING] AI loop hit max iterations limit!")
-
-        return {"result": result, "state": state, "messages": messages}
-
-@app.get("/state/{game_id}")
-async def get_state(game_id: str):
-    """Return full current state of the game"""
-    game = games.get(game_id)
+                await asyncio.wait_for(state_changed(game_id).wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+            game = registry.peek(game_id)
+            if not game:
+                raise HTTPException(status_code=404, detail="Game not found")
+
+    if viewer is not None and not any(p.name == viewer for p in game.players):
+        viewer = None  # not seated: spectators get the public view
+    # Read the version once, with no await before the state is built, so the
+    # ETag names exactly the state served
+    version = game.state_version
+    etag = f'"{version}-{viewer}"' if viewer is not None else f'"{version}"'
+    if if_none_match == etag or (since is not None and version <= since):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    state = game.get_game_state(viewer) if viewer is not None else game.get_game_state(public=True)
+    response.headers["ETag"] = etag
+    return {"state": state, "version": version}
+
+@app.post("/create_tournament")
+async def create_tournament(req: CreateTournamentRequest):
+    """Seat human and bot entrants over tournament tables, each served like a normal game"""
+    if req.ai_type not in AI_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown AI type: {req.ai_type}")
+
+    tournament_id = str(uuid4())[:8]
+    bot_names = {f"Bot {i + 1}" for i in range(req.bots)}
+    try:
+        tournament = Tournament(
+            req.player_names + sorted(bot_names), table_size=req.table_size,
+            starting_stack=req.starting_stack, level_duration=req.level_duration,
+            table_prefix=f"{tournament_id}-",
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    for table_id, game in tournament.tables.items():
+        for p in game.players:
+            if p.name in bot_names:
+                p.is_bot = True
+                p.ai_type = req.ai_type
+        registry.add(table_id, game)
+        attach_listeners(table_id, game)
+        game.add_listener(tournament_listener(tournament_id, table_id))
+        table_tournaments[table_id] = tournament_id
+    tournaments[tournament_id] = tournament
+
+    return {"tournament_id": tournament_id, "tournament": tournament.summary()}
+
+@app.post("/start_tournament/{tournament_id}")
+async def start_tournament(tournament_id: str):
+    """Deal the first hand on every table and start the blind clock"""
+    tournament = tournaments.get(tournament_id)
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    if tournament.started:
+        raise HTTPException(status_code=400, detail="Tournament already started")
+
+    tables = tournament.start()
+    schedule_blind_level(tournament_id, tournament.level_duration)
+    await asyncio.gather(*(start_tournament_hand(tournament_id, table_id) for table_id in tables))
+
+    return {"tournament_id": tournament_id, "tournament": tournament.summary()}
+
+@app.get("/tournament/{tournament_id}")
+async def get_tournament(tournament_id: str):
+    """Blind level, standings and seating (find a player's table_id here)"""
+    tournament = tournaments.get(tournament_id)
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return {"tournament_id": tournament_id, "tournament": tournament.summary()}
+
+@app.get("/stats/{game_id}")
+async def get_table_stats(game_id: str):
+    """HUD stats (VPIP, PFR, aggression factor, showdown win %) for everyone seated"""
+    game = registry.get(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
+    return {"stats": table_stats(game_id, game)}
+
+@app.get("/stats/{game_id}/player/{player_name}")
+async def get_player_stats(game_id: str, player_name: str):
+    stats = hud.get(game_id, player_name)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No stats for this player")
+    return {"player_name": player_name, "stats": stats}
+
+@app.post("/equity")
+async def equity(req: EquityRequest):
+    """Equity of each weighted range (e.g. "QQ+, AKs, 76s") given board and dead cards"""
+    from poker_engine.equity import calculate_equity
+    loop = asyncio.get_event_loop()
+    try:
+        equities = await loop.run_in_executor(
+            get_executor(), calculate_equity, req.ranges, req.board, req.dead, req.iterations or 2000
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {"state": game.get_game_state()}
+    return {"ranges": req.ranges, "board": req.board, "equities": equities}
 
 @app.websocket("/ws/{game_id}")
 async def websocket_endpoint(websocket: WebSocket, game_id: str):
     """
     Single WebSocket connection that handles both spectators and players.
     Clients upgrade from spectator to player via WebSocket messages.
+    ?protocol=binary switches server messages to the compact binary
+    encoding (see wire_protocol); JSON is the default.
     """
+    protocol = websocket.query_params.get("protocol", "json")
+    if protocol not in PROTOCOLS:
+        await websocket.close(code=1003)
+        return
+
     # Connect as spectator initially
-    conn_state = await manager.connect(game_id, websocket)
+    conn_state = await manager.connect(game_id, websocket, protocol)
     print(f"[WS CONNECT] game={game_id} conn_id={conn_state.connection_id} role=spectator")
 
-    game = games.get(game_id)
+    game = registry.get(game_id)
     if game:
         try:
             # Send initial state as spectator (no private cards visible)
-            await websocket.send_json({
+            await conn_state.send({
                 "type": "state_update",
-                "state": game.get_game_state(viewer_name=None)
+                "state": game.get_game_state(public=True)
             })
             print(f"[WS INIT STATE SENT] to={conn_state.connection_id} as spectator")
         except Exception as e:
@@ -379,6 +880,7 @@ async def websocket_endpoint(websocket: WebSocket, game_id: str):
             # Listen for messages from client
             data = await websocket.receive_json()
             msg_type = data.get("type")
+            game = registry.get(game_id)
             
             if msg_type == "upgrade_to_player":
                 # Client wants to become a player
@@ -391,16 +893,16 @@ async def websocket_endpoint(websocket: WebSocket, game_id: str):
                 success = manager.upgrade_connection_to_player(websocket, player_name, seat_index)
                 
                 if success:
-                    # Send updated state with private cards visible
+                    # Send the public state, then this seat's cards privately
                     if game:
-                        personalized_state = game.get_game_state(viewer_name=player_name)
-                        await websocket.send_json({
+                        await conn_state.send({
                             "type": "upgrade_success",
-                            "state": personalized_state
+                            "state": game.get_game_state(public=True)
                         })
+                        await manager.send_hole_cards(game, [conn_state])
                         print(f"[WS] Upgrade successful for {player_name}")
                 else:
-                    await websocket.send_json({
+                    await conn_state.send({
                         "type": "upgrade_failed",
                         "error": "Could not upgrade to player"
                     })
@@ -412,30 +914,34 @@ async def websocket_endpoint(websocket: WebSocket, game_id: str):
                 
                 # Send state without private cards
                 if game:
-                    await websocket.send_json({
+                    await conn_state.send({
                         "type": "state_update",
-                        "state": game.get_game_state(viewer_name=None)
+                        "state": game.get_game_state(public=True)
                     })
             
+            elif msg_type == "get_stats":
+                if game:
+                    await conn_state.send({"type": "stats", "stats": table_stats(game_id, game)})
+
             elif msg_type == "ping":
                 # Heartbeat
-                await websocket.send_json({"type": "pong"})
+                await conn_state.send({"type": "pong"})
             
             else:
                 print(f"[WS] Unknown message type: {msg_type}")
                 
     except WebSocketDisconnect:
-        manager.disconnect(game_id, websocket)
         print(f"[WS DISCONNECT] game={game_id} conn_id={conn_state.connection_id}")
+    except Exception as e:
+        # e.g. a send on a socket that closed under us
+        print(f"[WS ERROR] game={game_id} conn_id={conn_state.connection_id}: {e}")
+    finally:
+        manager.disconnect(game_id, websocket)
 
 @app.delete("/game/{game_id}")
 async def cleanup_game(game_id: str):
     """Clean up a game session"""
-    if game_id in games:
-        if game_id in lobby_timers:
-            lobby_timers[game_id].cancel()
-            del lobby_timers[game_id]
-        del games[game_id]
-        if game_id in locks:
-            del locks[game_id]
+    if game_id in registry:
+        release_game(game_id)
+        registry.remove(game_id)
     return {"message": "Game cleaned up"}
\ No newline at end of file
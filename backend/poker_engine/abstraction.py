@@ -0,0 +1,467 @@
+"""
+Equity-histogram card abstraction.
+
+For every canonical (hand, board) of a street (see canonical) the builder
+computes the hand's equity distribution: a histogram, over runouts to the
+river, of the hand's river equity against a random hand. Hands with similar
+histograms play alike, so k-means groups them into buckets under the earth
+mover's distance, which for 1-D histograms is the L1 distance between their
+cumulative distributions.
+
+    python -m poker_engine.abstraction build --street flop [--buckets 50] [--workers N]
+
+The build runs in steps, each resumable: finished work in --work-dir is kept
+and skipped when the command is run again with the same settings.
+
+    1. histograms   one file per chunk of canonical boards, in a process pool
+    2. centroids    k-means++ seeding and Lloyd iterations on a sample
+    3. assignment   every histogram to its nearest centroid, in the pool
+    4. table        sorted packed card keys plus one bucket byte each
+
+Each runout board is scored with one evaluate_batch call over every live
+combo, which gives the river equity of every hand on the board at once.
+Equities ignore the card removal of the hand's own two cards.
+
+River hands have no runouts left, so their "histogram" is the equity itself:
+river buckets are equity quantiles, stored as boundaries and looked up with
+hand_strength instead of a per-hand table.
+
+At play time bucket(hand, board) canonicalizes the cards, packs them into a
+key and binary-searches the street's memory-mapped table.
+"""
+import argparse
+import json
+import math
+import mmap
+import os
+import random
+import struct
+import time
+from array import array
+from bisect import bisect, bisect_left, bisect_right
+from functools import lru_cache
+from itertools import combinations
+
+from .canonical import canonical_board, canonicalize, canonical_flops
+from .evaluator import card_indices, evaluate_batch
+from .hand_range import COMBOS
+
+MAGIC = b"PKBUCK01"
+VERSION = 1
+ALIGN = 4096
+
+BOARD_SIZES = {"preflop": 0, "flop": 3, "turn": 4, "river": 5}
+DEFAULT_BUCKETS = {"preflop": 20, "flop": 50, "turn": 50, "river": 20}
+DEFAULT_RUNOUTS = {"preflop": 1000, "flop": 48, "turn": 46}
+BOARDS_PER_CHUNK = {"preflop": 1, "flop": 32, "turn": 256}
+BINS = 20
+SAMPLE = 20000        # histograms k-means runs on (river: spots sampled for quantiles)
+ITERATIONS = 25
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DEFAULT_WORK_DIR = os.path.join(DATA_DIR, "abstraction-work")
+
+
+def table_path(street, directory=DATA_DIR):
+    return os.path.join(directory, f"buckets-{street}.bin")
+
+
+def pack_key(hand, board):
+    """Card indexes of a canonical hand and board packed six bits each"""
+    key = 0
+    for c in hand:
+        key = (key << 6) | c
+    for c in board:
+        key = (key << 6) | c
+    return key
+
+
+# --- Lookup ---
+
+class BucketTable:
+    """One street's buckets, read from a memory-mapped table file"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:8] != MAGIC:
+            raise ValueError("Not a bucket table file")
+        (length,) = struct.unpack("<I", self._mm[8:12])
+        header = json.loads(self._mm[12:12 + length])
+        if header.get("version") != VERSION:
+            raise ValueError(f"Unsupported bucket table version: {header.get('version')}")
+        self.street = header["street"]
+        self.buckets = header["buckets"]
+        self.boundaries = header.get("boundaries")
+        count = header["count"]
+        if ALIGN + count * 9 != len(self._mm):
+            raise ValueError(f"Bucket table file is truncated: {path}")
+        view = memoryview(self._mm)
+        self.keys = view[ALIGN:ALIGN + count * 8].cast("Q")
+        self.values = view[ALIGN + count * 8:]
+
+    def lookup(self, hand, board):
+        """Bucket of canonical card indexes, or None if the spot isn't in the table"""
+        if self.boundaries is not None:
+            from .hand_strength import hand_strength
+            return bisect(self.boundaries, hand_strength(hand, board).hs)
+        key = pack_key(hand, board)
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.values[i]
+        return None
+
+
+@lru_cache(maxsize=None)
+def open_table(street, directory=DATA_DIR):
+    """The street's table if it has been built; None otherwise"""
+    path = table_path(street, directory)
+    if not os.path.exists(path):
+        return None
+    try:
+        return BucketTable(path)
+    except (OSError, ValueError) as e:
+        print(f"[ABSTRACT] Ignoring bucket table at {path}: {e}")
+        return None
+
+
+def bucket(hand, board=()):
+    """Bucket of two hole cards (Cards, strings or indexes) on a board; None without a table"""
+    hand, board = canonicalize(card_indices(hand), card_indices(board))
+    street = next((s for s, n in BOARD_SIZES.items() if n == len(board)), None)
+    if street is None:
+        raise ValueError("The board has 0, 3, 4 or 5 cards")
+    table = open_table(street)
+    return None if table is None else table.lookup(hand, board)
+
+
+# --- Step 1: histograms ---
+
+def canonical_boards(street):
+    size = BOARD_SIZES[street]
+    if size == 0:
+        return [()]
+    if size == 3:
+        return canonical_flops()
+    return sorted({canonical_board(board)[0] for board in combinations(range(52), size)})
+
+
+def board_hands(board):
+    """Canonical hands on a canonical board, sorted"""
+    blocked = set(board)
+    return sorted({
+        canonicalize(combo, board)[0] for combo in COMBOS
+        if combo[0] not in blocked and combo[1] not in blocked
+    })
+
+
+def board_histograms(board, runouts, bins, rng):
+    """{hand: bin counts} for every canonical hand on a canonical board"""
+    hands = board_hands(board)
+    live = [c for c in range(52) if c not in board]
+    missing = 5 - len(board)
+    if math.comb(len(live), missing) <= runouts:
+        boards = [board + r for r in combinations(live, missing)]
+    else:
+        boards = [board + tuple(rng.sample(live, missing)) for _ in range(runouts)]
+
+    histograms = {hand: [0] * bins for hand in hands}
+    for full in boards:
+        blocked = set(full)
+        combos = [c for c in COMBOS if c[0] not in blocked and c[1] not in blocked]
+        scores = evaluate_batch(combos, full)
+        score_of = dict(zip(combos, scores))
+        ordered = sorted(scores)
+        others = len(ordered) - 1
+        for hand in hands:
+            score = score_of.get(hand)
+            if score is None:
+                continue  # the runout holds one of the hand's cards
+            below = bisect_left(ordered, score)
+            ties = bisect_right(ordered, score) - below - 1
+            equity = (below + ties / 2) / others
+            histograms[hand][min(bins - 1, int(equity * bins))] += 1
+    return histograms
+
+
+def _histogram_chunk(street, chunk, boards, runouts, bins, seed, path):
+    rng = random.Random(seed * 1000003 + chunk)
+    keys = array("Q")
+    counts = array("H")
+    for board in boards:
+        for hand, histogram in board_histograms(board, runouts, bins, rng).items():
+            keys.append(pack_key(hand, board))
+            counts.extend(histogram)
+    _write_arrays(path, keys, counts)
+    return chunk
+
+
+def _write_arrays(path, *arrays):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for values in arrays:
+            f.write(struct.pack("<cI", values.typecode.encode(), len(values)))
+            f.write(values.tobytes())
+    os.replace(tmp_path, path)
+
+
+def _read_arrays(path):
+    arrays = []
+    with open(path, "rb") as f:
+        while header := f.read(5):
+            typecode, count = struct.unpack("<cI", header)
+            values = array(typecode.decode())
+            values.frombytes(f.read(count * values.itemsize))
+            arrays.append(values)
+    return arrays
+
+
+# --- Step 2: k-means under the earth mover's distance ---
+
+def to_cdf(counts):
+    total = sum(counts) or 1
+    cdf = []
+    running = 0
+    for n in counts:
+        running += n
+        cdf.append(running / total)
+    return cdf
+
+
+def emd(a, b):
+    """Earth mover's distance between two 1-D histograms given as CDFs, in bins"""
+    return sum(abs(x - y) for x, y in zip(a, b))
+
+
+def nearest(cdf, centroids):
+    best, best_distance = 0, float("inf")
+    for i, centroid in enumerate(centroids):
+        distance = 0.0
+        for x, y in zip(cdf, centroid):
+            distance += abs(x - y)
+            if distance >= best_distance:
+                break
+        else:
+            best, best_distance = i, distance
+    return best, best_distance
+
+
+def kmeans(points, k, iterations, rng):
+    """
+    k-means++ seeding and Lloyd iterations on (cdf, weight) points. A centroid
+    is the weighted mean of its members' CDFs, which is itself a CDF.
+    """
+    k = min(k, len(points))
+    centroids = [list(rng.choice(points)[0])]
+    distances = [emd(cdf, centroids[0]) for cdf, _ in points]
+    while len(centroids) < k:
+        weights = [d * d * w for d, (_, w) in zip(distances, points)]
+        if not sum(weights):
+            break  # fewer distinct points than buckets
+        cdf = rng.choices(points, weights)[0][0]
+        centroids.append(list(cdf))
+        distances = [min(d, emd(p, cdf)) for d, (p, _) in zip(distances, points)]
+
+    for iteration in range(iterations):
+        sums = [[0.0] * len(centroids[0]) for _ in centroids]
+        totals = [0.0] * len(centroids)
+        moved = 0.0
+        for cdf, weight in points:
+            i, distance = nearest(cdf, centroids)
+            totals[i] += weight
+            acc = sums[i]
+            for j, x in enumerate(cdf):
+                acc[j] += x * weight
+        for i, total in enumerate(totals):
+            if total:
+                updated = [x / total for x in sums[i]]
+                moved = max(moved, emd(updated, centroids[i]))
+                centroids[i] = updated
+        print(f"[ABSTRACT] k-means iteration {iteration + 1}: largest centroid move {moved:.4f}")
+        if moved < 1e-4:
+            break
+    # Order buckets from weakest to strongest (lowest mean equity first)
+    return sorted(centroids, key=lambda cdf: sum(cdf), reverse=True)
+
+
+def _sample_points(paths, bins, sample, rng):
+    """Weighted distinct CDFs from a uniform (reservoir) sample of all histograms"""
+    histograms = []
+    seen = 0
+    for path in paths:
+        _, counts = _read_arrays(path)
+        for i in range(0, len(counts), bins):
+            seen += 1
+            if len(histograms) < sample:
+                histograms.append(tuple(counts[i:i + bins]))
+            else:
+                j = rng.randrange(seen)
+                if j < sample:
+                    histograms[j] = tuple(counts[i:i + bins])
+    weights = {}
+    for histogram in histograms:
+        weights[histogram] = weights.get(histogram, 0) + 1
+    return [(to_cdf(histogram), weight) for histogram, weight in weights.items()]
+
+
+# --- Step 3: assignment ---
+
+def _assign_chunk(chunk, histogram_path, centroids, bins, path):
+    keys, counts = _read_arrays(histogram_path)
+    buckets = array("B", (
+        nearest(to_cdf(counts[i:i + bins]), centroids)[0] for i in range(0, len(counts), bins)
+    ))
+    _write_arrays(path, keys, buckets)
+    return chunk
+
+
+# --- Step 4: table ---
+
+def write_table(path, street, buckets, keys=(), values=(), boundaries=None):
+    """Write a table file, renaming it into place"""
+    header = {"version": VERSION, "street": street, "buckets": buckets, "count": len(keys)}
+    if boundaries is not None:
+        header["boundaries"] = boundaries
+    encoded = json.dumps(header).encode()
+    if len(encoded) + 12 > ALIGN:
+        raise ValueError("Bucket table header is too large")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        f.write(b"\0" * (ALIGN - 12 - len(encoded)))
+        f.write(array("Q", keys).tobytes())
+        f.write(bytes(values))
+    os.replace(tmp_path, path)
+    open_table.cache_clear()
+
+
+# --- Build driver ---
+
+def _check_params(work_dir, params):
+    """Refuse to resume work that was started with different settings"""
+    path = os.path.join(work_dir, "params.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            saved = json.load(f)
+        if saved != params:
+            raise ValueError(f"{work_dir} holds a build with other settings: {saved}")
+    else:
+        with open(path, "w") as f:
+            json.dump(params, f)
+
+
+def _run_pool(label, tasks, workers):
+    """Run (fn, *args) tasks in a process pool, reporting progress"""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if not tasks:
+        return
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fn, *args) for fn, *args in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            future.result()
+            print(f"[ABSTRACT] {label} {done}/{len(tasks)} ({time.time() - start:.0f}s)")
+
+
+def build_river(buckets, sample, seed, out_dir):
+    """Equity quantile boundaries from a sample of river spots"""
+    from .hand_strength import hand_strength
+
+    rng = random.Random(seed)
+    equities = []
+    for _ in range(sample):
+        cards = rng.sample(range(52), 7)
+        equities.append(hand_strength(cards[:2], cards[2:]).hs)
+    equities.sort()
+    boundaries = [equities[len(equities) * i // buckets] for i in range(1, buckets)]
+    path = table_path("river", out_dir)
+    write_table(path, "river", buckets, boundaries=boundaries)
+    print(f"[ABSTRACT] Wrote {path}: {buckets} equity quantile buckets from {sample} spots")
+    return path
+
+
+def build(street, buckets=None, runouts=None, bins=BINS, sample=SAMPLE, iterations=ITERATIONS,
+          workers=None, seed=0, work_dir=DEFAULT_WORK_DIR, out_dir=DATA_DIR):
+    buckets = buckets or DEFAULT_BUCKETS[street]
+    if buckets > 255:
+        raise ValueError("At most 255 buckets fit in a table")
+    if street == "river":
+        return build_river(buckets, sample, seed, out_dir)
+
+    runouts = runouts or DEFAULT_RUNOUTS[street]
+    work_dir = os.path.join(work_dir, street)
+    os.makedirs(work_dir, exist_ok=True)
+    _check_params(work_dir, {
+        "street": street, "buckets": buckets, "runouts": runouts, "bins": bins,
+        "sample": sample, "iterations": iterations, "seed": seed,
+    })
+
+    boards = canonical_boards(street)
+    per_chunk = BOARDS_PER_CHUNK[street]
+    chunks = [boards[i:i + per_chunk] for i in range(0, len(boards), per_chunk)]
+    histogram_paths = [os.path.join(work_dir, f"hist-{i:06d}.bin") for i in range(len(chunks))]
+    bucket_paths = [os.path.join(work_dir, f"bucket-{i:06d}.bin") for i in range(len(chunks))]
+    print(f"[ABSTRACT] {street}: {len(boards)} canonical boards in {len(chunks)} chunks")
+
+    _run_pool("histograms", [
+        (_histogram_chunk, street, i, chunk, runouts, bins, seed, histogram_paths[i])
+        for i, chunk in enumerate(chunks) if not os.path.exists(histogram_paths[i])
+    ], workers)
+
+    centroid_path = os.path.join(work_dir, "centroids.json")
+    if os.path.exists(centroid_path):
+        with open(centroid_path) as f:
+            centroids = json.load(f)
+    else:
+        rng = random.Random(seed)
+        centroids = kmeans(_sample_points(histogram_paths, bins, sample, rng), buckets, iterations, rng)
+        with open(f"{centroid_path}.tmp", "w") as f:
+            json.dump(centroids, f)
+        os.replace(f"{centroid_path}.tmp", centroid_path)
+
+    _run_pool("assignment", [
+        (_assign_chunk, i, histogram_paths[i], centroids, bins, bucket_paths[i])
+        for i in range(len(chunks)) if not os.path.exists(bucket_paths[i])
+    ], workers)
+
+    pairs = []
+    for path in bucket_paths:
+        keys, values = _read_arrays(path)
+        pairs.extend(zip(keys, values))
+    pairs.sort()
+    path = table_path(street, out_dir)
+    write_table(path, street, len(centroids), [k for k, _ in pairs], [v for _, v in pairs])
+    print(f"[ABSTRACT] Wrote {path}: {len(pairs)} hands in {len(centroids)} buckets")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build equity-histogram bucket tables")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--street", choices=list(BOARD_SIZES), required=True)
+    parser.add_argument("--buckets", type=int, default=None)
+    parser.add_argument("--runouts", type=int, default=None, help="runouts per board (all of them if fewer exist)")
+    parser.add_argument("--bins", type=int, default=BINS)
+    parser.add_argument("--sample", type=int, default=SAMPLE)
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument("--workers", type=int, default=None, help="default: one per core")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR)
+    parser.add_argument("--out-dir", default=DATA_DIR)
+    args = parser.parse_args()
+
+    try:
+        build(
+            args.street, args.buckets, args.runouts, args.bins, args.sample, args.iterations,
+            args.workers, args.seed, args.work_dir, args.out_dir,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Board textures, computed once per canonical board (see canonical).
+
+board_texture(board) describes a flop, turn or river:
+
+    paired / trips      some board rank appears twice / three times
+    max_suited          most board cards of one suit
+    monotone            every board card has the same suit
+    flush_possible      three or more cards of one suit
+    flush_draw          exactly two of one suit with cards still to come
+    straight_possible   three board ranks fit in a five-rank window
+    connected           two board ranks are at most two apart (aces high only)
+    high_rank           highest board rank index
+    nut_class           best hand class (evaluator category) any holding makes
+    class_counts        live combos per hand class: the board's equity distribution
+    label               one of TEXTURE_LABELS, for bots and reports
+
+plus strength, the 0-100 strength percentile of every combo on the board in
+COMBOS order (0 for combos that hold a board card), in canonical suits;
+board_strengths() returns it for the real suits.
+
+The 1755 canonical flops can be precomputed into one memory-mapped file
+
+    python -m poker_engine.board_texture build [--out PATH]
+
+Flops missing from the index, turns and rivers are computed on first use
+(one evaluate_batch call) and kept in an LRU cache.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+from functools import lru_cache
+
+from .canonical import canonical_board, canonical_flops, combo_map
+from .evaluator import HAND_CLASS_NAMES, STRAIGHT_FLUSH, card_indices, evaluate_batch
+from .hand_range import COMBOS, NUM_COMBOS
+
+MAGIC = b"PKFLOP01"
+VERSION = 2
+
+TEXTURE_LABELS = ("dry", "neutral", "wet", "paired")
+
+# Bluff frequency multipliers: dry boards rarely connect with a calling range,
+# wet boards usually do
+BLUFF_SCALE = {"dry": 1.5, "neutral": 1.0, "wet": 0.5, "paired": 1.25}
+
+FEATURES = (
+    "paired", "trips", "max_suited", "monotone", "flush_possible", "flush_draw",
+    "straight_possible", "connected", "high_rank", "nut_class", "class_counts",
+)
+
+DEFAULT_INDEX_PATH = os.environ.get(
+    "FLOP_INDEX_PATH", os.path.join(os.path.dirname(__file__), "data", "flop_index.bin")
+)
+
+
+def percentiles(scores, live):
+    """0-100 strength bucket for each combo; dead combos get 0"""
+    ordered = sorted(scores[i] for i in live)
+    n = len(ordered)
+    buckets = bytearray(NUM_COMBOS)
+    rank_of = {}
+    for pos, score in enumerate(ordered):
+        rank_of.setdefault(score, [pos, pos])[1] = pos
+    for i in live:
+        first, last = rank_of[scores[i]]
+        buckets[i] = int(100 * (first + last) / 2 / max(1, n - 1))
+    return buckets
+
+
+class BoardTexture:
+    """Features and combo strengths of one canonical board"""
+    __slots__ = ("board",) + FEATURES + ("strength",)
+
+    def __init__(self, board, features, strength):
+        self.board = board
+        for name in FEATURES:
+            setattr(self, name, features[name])
+        self.strength = strength
+
+    @property
+    def label(self):
+        if self.paired:
+            return "paired"
+        if self.flush_possible or self.straight_possible:
+            return "wet"
+        if not self.flush_draw and not self.connected:
+            return "dry"
+        return "neutral"
+
+    @property
+    def nut_hand(self):
+        return HAND_CLASS_NAMES[self.nut_class]
+
+    def features(self):
+        return {name: getattr(self, name) for name in FEATURES}
+
+
+def board_texture(board):
+    """BoardTexture of a 3-5 card board (Cards, strings or indexes)"""
+    board = card_indices(board)
+    if not 3 <= len(board) <= 5 or len(set(board)) != len(board):
+        raise ValueError("A board texture needs 3-5 distinct cards")
+    return _texture(canonical_board(board)[0])
+
+
+def bluff_scale(board):
+    """BLUFF_SCALE for a board; 1.0 preflop"""
+    if len(board) < 3:
+        return 1.0
+    return BLUFF_SCALE[board_texture(board).label]
+
+
+def board_strengths(board):
+    """0-100 strength percentile of every combo (COMBOS order) on a real board"""
+    board = card_indices(board)
+    canonical, mapping = canonical_board(board)
+    strength = _texture(canonical).strength
+    return bytes(strength[j] for j in combo_map(mapping))
+
+
+@lru_cache(maxsize=4096)
+def _texture(board):
+    if len(board) == 3:
+        index = _open_index()
+        if index is not None:
+            texture = index.get(board)
+            if texture is not None:
+                return texture
+    return compute_texture(board)
+
+
+def compute_texture(board):
+    """BoardTexture of a canonical board, without the index"""
+    blocked = set(board)
+    live = [i for i, (a, b) in enumerate(COMBOS) if a not in blocked and b not in blocked]
+    scores = [0] * NUM_COMBOS
+    class_counts = [0] * (STRAIGHT_FLUSH + 1)
+    for i, score in zip(live, evaluate_batch([COMBOS[i] for i in live], board)):
+        scores[i] = score
+        class_counts[score >> 20] += 1
+
+    rank_counts = [0] * 13
+    suit_counts = [0, 0, 0, 0]
+    for c in board:
+        rank_counts[c >> 2] += 1
+        suit_counts[c & 3] += 1
+    ranks = sorted({c >> 2 for c in board})
+    # The ace also plays low for wheel straights
+    wheel_ranks = sorted(set(ranks) | ({-1} if 12 in ranks else set()))
+
+    features = {
+        "paired": max(rank_counts) >= 2,
+        "trips": max(rank_counts) >= 3,
+        "max_suited": max(suit_counts),
+        "monotone": max(suit_counts) == len(board),
+        "flush_possible": max(suit_counts) >= 3,
+        "flush_draw": max(suit_counts) == 2 and len(board) < 5,
+        "straight_possible": any(
+            sum(1 for r in wheel_ranks if low <= r < low + 5) >= 3 for low in range(-1, 9)
+        ),
+        # Two ranks close enough that hole cards make open-enders and double gutters
+        "connected": any(b - a <= 2 for a, b in zip(ranks, ranks[1:])),
+        "high_rank": ranks[-1],
+        "nut_class": max(scores) >> 20,
+        "class_counts": class_counts,
+    }
+    return BoardTexture(board, features, bytes(percentiles(scores, live)))
+
+
+# --- Flop index ---
+
+class FlopIndex:
+    """Precomputed textures of every canonical flop, read from a memory-mapped file"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:8] != MAGIC:
+            raise ValueError("Not a flop index file")
+        (length,) = struct.unpack("<I", self._mm[8:12])
+        header = json.loads(self._mm[12:12 + length])
+        if header.get("version") != VERSION:
+            raise ValueError(f"Unsupported flop index version: {header.get('version')}")
+        self.offset = 12 + length
+        if self.offset + len(header["flops"]) * NUM_COMBOS != len(self._mm):
+            raise ValueError(f"Flop index file is truncated: {path}")
+        self.positions = {tuple(flop): i for i, flop in enumerate(header["flops"])}
+        self.features = header["features"]
+        self._view = memoryview(self._mm)
+
+    def get(self, flop):
+        i = self.positions.get(flop)
+        if i is None:
+            return None
+        start = self.offset + i * NUM_COMBOS
+        return BoardTexture(flop, dict(zip(FEATURES, self.features[i])), self._view[start:start + NUM_COMBOS])
+
+
+@lru_cache(maxsize=1)
+def _open_index(path=DEFAULT_INDEX_PATH):
+    if not os.path.exists(path):
+        return None
+    try:
+        return FlopIndex(path)
+    except (OSError, ValueError) as e:
+        print(f"[EVAL] Ignoring flop index at {path}: {e}")
+        return None
+
+
+def build_index(path=DEFAULT_INDEX_PATH):
+    """Compute every canonical flop and write the index, renaming it into place"""
+    flops = canonical_flops()
+    textures = [compute_texture(flop) for flop in flops]
+    header = {
+        "version": VERSION,
+        "flops": flops,
+        "features": [[t.features()[name] for name in FEATURES] for t in textures],
+    }
+    encoded = json.dumps(header, separators=(",", ":")).encode()
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        for texture in textures:
+            f.write(texture.strength)
+    os.replace(tmp_path, path)
+    _open_index.cache_clear()
+    _texture.cache_clear()
+    return len(flops)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the canonical flop texture index")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--out", default=DEFAULT_INDEX_PATH)
+    args = parser.parse_args()
+
+    count = build_index(args.out)
+    print(f"[EVAL] Built {args.out} ({count} flops)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Suit isomorphism.
+
+Relabelling suits never changes how hands compare, so 'As Ks 2d' and
+'Ah Kh 2c' are the same flop. canonicalize() picks one representative per
+class: every suit gets a signature (which board ranks it holds, then which
+hole-card ranks), suits are ordered by signature and renumbered 0, 1, 2, 3.
+Suits with equal signatures are interchangeable, so ties don't matter.
+
+There are 1755 canonical flops (see canonical_flops()) out of 22100 flops.
+"""
+from functools import lru_cache
+from itertools import combinations
+
+from .hand_range import COMBO_INDEX, COMBOS
+
+
+def suit_map(board, hand=()):
+    """Tuple mapping each suit (0-3) to its canonical suit"""
+    board_masks = [0, 0, 0, 0]
+    hand_masks = [0, 0, 0, 0]
+    for c in board:
+        board_masks[c & 3] |= 1 << (c >> 2)
+    for c in hand:
+        hand_masks[c & 3] |= 1 << (c >> 2)
+    order = sorted(range(4), key=lambda s: (board_masks[s], hand_masks[s]), reverse=True)
+    mapping = [0, 0, 0, 0]
+    for canonical, suit in enumerate(order):
+        mapping[suit] = canonical
+    return tuple(mapping)
+
+
+def apply_suit_map(cards, mapping):
+    """Relabel card indexes and return them sorted"""
+    return tuple(sorted((c & ~3) | mapping[c & 3] for c in cards))
+
+
+def canonical_board(board):
+    """(canonical board, suit map) of a board given as card indexes"""
+    mapping = suit_map(board)
+    return apply_suit_map(board, mapping), mapping
+
+
+def canonicalize(hand, board):
+    """(canonical hand, canonical board) of hole cards on a board, as card indexes"""
+    mapping = suit_map(board, hand)
+    return apply_suit_map(hand, mapping), apply_suit_map(board, mapping)
+
+
+@lru_cache(maxsize=24)
+def combo_map(mapping):
+    """For every combo index, the index of the combo it becomes under a suit map"""
+    return [COMBO_INDEX[apply_suit_map(combo, mapping)] for combo in COMBOS]
+
+
+@lru_cache(maxsize=1)
+def canonical_flops():
+    """The canonical flops, sorted"""
+    return sorted({canonical_board(flop)[0] for flop in combinations(range(52), 3)})
@@ -19,17 +19,68 @@ class Card:
         return hash((self.rank, self.suit))
     
 class Deck:
+    """
+    A deck that deals by advancing a cursor instead of re-slicing its list.
+
+    Cards before ``position`` have been dealt (or excluded as dead cards);
+    cards from ``position`` onwards are still live.
+    """
     suits = ['s', 'h', 'd', 'c']
     ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
 
-    def __init__(self):
-        self.cards = [Card(rank, suit) for suit in self.suits for rank in self.ranks]
-        self.shuffle()
+    def __init__(self, shuffle=True, cards=None):
+        # Rollouts may pass their own card encoding (e.g. evaluator indexes)
+        self.cards = list(FULL_DECK if cards is None else cards)
+        self.position = 0
+        if shuffle:
+            self.shuffle()
+
+    def __len__(self):
+        """Number of live cards left in the deck"""
+        return len(self.cards) - self.position
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        """Shuffle the live part of the deck"""
+        live = self.cards[self.position:]
+        random.shuffle(live)
+        self.cards[self.position:] = live
 
     def deal(self, n):
-        dealt_cards = self.cards[:n]
-        self.cards = self.cards[n:]
-        return dealt_cards
\ No newline at end of file
+        """Deal the next n cards off the top of an already shuffled deck"""
+        start = self.position
+        self.position = min(start + n, len(self.cards))
+        return self.cards[start:self.position]
+
+    def draw(self, n):
+        """
+        Deal n uniformly random live cards with a partial Fisher-Yates shuffle.
+        Only the n drawn positions are shuffled, so the deck needs no full shuffle.
+        """
+        cards = self.cards
+        end = len(cards)
+        start = self.position
+        stop = min(start + n, end)
+        for i in range(start, stop):
+            j = random.randrange(i, end)
+            cards[i], cards[j] = cards[j], cards[i]
+        self.position = stop
+        return cards[start:stop]
+
+    def exclude(self, dead_cards):
+        """Move dead cards out of the live part of the deck without rebuilding it"""
+        dead = set(dead_cards)
+        cards = self.cards
+        for i in range(self.position, len(cards)):
+            if cards[i] in dead:
+                cards[i], cards[self.position] = cards[self.position], cards[i]
+                self.position += 1
+
+    def rewind(self, position):
+        """
+        Return previously drawn cards to the live part of the deck.
+        Rollouts call this with a position saved before drawing to reuse the deck.
+        """
+        self.position = position
+
+
+FULL_DECK = tuple(Card(rank, suit) for suit in Deck.suits for rank in Deck.ranks)
@@ -0,0 +1,273 @@
+"""
+Offline Monte Carlo CFR trainer for an abstracted heads-up game.
+
+The abstract game follows PokerGame's rules: blinds and starting stacks come
+from PokerGame, the small blind (player 0) acts first on every street, and a
+betting round ends once both players have acted and the bets are equal.
+
+Card abstraction: preflop hands fall into PREFLOP_BUCKETS strength buckets
+and postflop hands into POSTFLOP_BUCKETS made-hand/draw classes, both cheap
+enough to compute per decision. Bet abstraction: fold, check/call, half-pot
+raise ('h') and pot raise ('p'), at most MAX_RAISES raises per street.
+
+Training uses external-sampling MCCFR and writes the average strategy as a
+gzip-compressed JSON table of quantized probabilities keyed by infoset.
+
+    python -m poker_engine.cfr --iterations 200000 --out cfr_strategy.json.gz
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import time
+
+from .card import Deck
+from .evaluator import ONE_PAIR, STRAIGHT, TWO_PAIR, evaluate
+from .hand_range import COMBO_INDEX
+from .poker_engine_api import PokerGame
+from .range_tracker import PREFLOP_STRENGTH
+
+PREFLOP_BUCKETS = 8
+POSTFLOP_BUCKETS = 6
+MAX_RAISES = 3
+STAGES = ["preflop", "flop", "turn", "river"]
+BOARD_SIZES = [0, 3, 4, 5]
+
+DEFAULT_TABLE_PATH = os.environ.get(
+    "CFR_STRATEGY_PATH", os.path.join(os.path.dirname(__file__), "data", "cfr_strategy.json.gz")
+)
+
+_rules = PokerGame(["SB", "BB"])
+SMALL_BLIND = _rules.small_blind
+BIG_BLIND = _rules.big_blind
+STACK = _rules.players[0].chips
+
+
+# --- Card abstraction ---
+
+def preflop_bucket(hand):
+    a, b = sorted(hand)
+    return min(PREFLOP_BUCKETS - 1, PREFLOP_STRENGTH[COMBO_INDEX[(a, b)]] * PREFLOP_BUCKETS // 101)
+
+
+def postflop_bucket(hand, board):
+    """
+    0 nothing, 1 draw, 2 weak made hand, 3 top pair or overpair,
+    4 two pair or trips made with a hole card, 5 straight or better.
+    """
+    score = evaluate(list(hand) + list(board))
+    category = score >> 20
+    board_category = evaluate(board) >> 20
+
+    if category >= STRAIGHT and (len(board) < 5 or score != evaluate(board)):
+        return 5
+    if category > board_category and category >= TWO_PAIR:
+        return 4
+    if category == ONE_PAIR and board_category < ONE_PAIR:
+        pair_rank = (score >> 16) & 15
+        return 3 if pair_rank >= max(c >> 2 for c in board) else 2
+    if category > board_category:
+        return 2
+
+    if len(board) < 5:
+        cards = list(hand) + list(board)
+        for suit in range(4):
+            suited = [c for c in cards if c & 3 == suit]
+            if len(suited) == 4 and any(c & 3 == suit for c in hand):
+                return 1
+        ranks = {c >> 2 for c in cards}
+        for low in range(-1, 9):
+            window = {r % 13 for r in range(low, low + 5)}
+            if len(window & ranks) >= 4 and any(c >> 2 in window for c in hand):
+                return 1
+    return 0
+
+
+def bucket(hand, board):
+    return preflop_bucket(hand) if not board else postflop_bucket(hand, board)
+
+
+# --- Bet abstraction ---
+
+class AbstractState:
+    """One node of the abstract heads-up betting tree"""
+    __slots__ = ("street", "history", "contrib", "to_act", "acted", "raises", "folded")
+
+    def __init__(self, street=0, history="", contrib=(SMALL_BLIND, BIG_BLIND), to_act=0, acted=0, raises=1, folded=None):
+        self.street = street
+        self.history = history
+        self.contrib = contrib
+        self.to_act = to_act
+        self.acted = acted
+        self.raises = raises
+        self.folded = folded
+
+    @property
+    def pot(self):
+        return self.contrib[0] + self.contrib[1]
+
+    def to_call(self):
+        return self.contrib[1 - self.to_act] - self.contrib[self.to_act]
+
+    def is_terminal(self):
+        return self.folded is not None or self.street > 3
+
+    def legal_actions(self):
+        to_call = self.to_call()
+        actions = ["f", "c"] if to_call > 0 else ["c"]
+        behind = STACK - self.contrib[self.to_act] - to_call
+        opponent_behind = STACK - self.contrib[1 - self.to_act]
+        if self.raises < MAX_RAISES and behind > 0 and opponent_behind > 0:
+            actions += ["h", "p"]
+        return actions
+
+    def raise_size(self, action):
+        """Chips put in by a raise action on top of the call"""
+        to_call = self.to_call()
+        pot_after_call = self.pot + to_call
+        size = max(BIG_BLIND, pot_after_call // 2 if action == "h" else pot_after_call)
+        return min(size, STACK - self.contrib[self.to_act] - to_call)
+
+    def apply(self, action):
+        p = self.to_act
+        contrib = list(self.contrib)
+        if action == "f":
+            return AbstractState(self.street, self.history + "f", self.contrib, p, self.acted, self.raises, folded=p)
+
+        contrib[p] += self.to_call()
+        raises = self.raises
+        if action in ("h", "p"):
+            contrib[p] += self.raise_size(action)
+            raises += 1
+        contrib = tuple(contrib)
+        history = self.history + action
+        acted = self.acted + 1
+
+        if action == "c" and acted >= 2:
+            # Betting round over: next street, or straight to showdown when someone is all-in
+            street = 4 if STACK in contrib else self.street + 1
+            return AbstractState(street, history + "/", contrib, 0, 0, 0)
+        return AbstractState(self.street, history, contrib, 1 - p, acted, raises)
+
+    def infoset(self, card_bucket):
+        return f"{self.street}:{card_bucket}:{self.history}"
+
+
+# --- Training ---
+
+class CFRTrainer:
+    def __init__(self):
+        self.regrets = {}
+        self.strategy_sum = {}
+        self.deck = Deck(shuffle=False, cards=range(52))
+
+    def _strategy(self, key, n):
+        regrets = self.regrets.get(key)
+        if regrets is None:
+            return [1.0 / n] * n
+        positive = [r if r > 0 else 0.0 for r in regrets]
+        total = sum(positive)
+        return [r / total for r in positive] if total > 0 else [1.0 / n] * n
+
+    def _deal(self):
+        self.deck.rewind(0)
+        cards = self.deck.draw(9)
+        hands = (cards[0:2], cards[2:4])
+        board = cards[4:]
+        buckets = [[bucket(h, board[:BOARD_SIZES[s]]) for s in range(4)] for h in hands]
+        s0 = evaluate(hands[0] + board)
+        s1 = evaluate(hands[1] + board)
+        return buckets, (s0 > s1) - (s0 < s1)
+
+    def _utility(self, state, player, showdown):
+        if state.folded is not None:
+            return -state.contrib[player] if state.folded == player else state.contrib[1 - player]
+        result = showdown if player == 0 else -showdown
+        return result * state.contrib[1 - player] if result else 0
+
+    def _traverse(self, state, traverser, buckets, showdown):
+        if state.is_terminal():
+            return self._utility(state, traverser, showdown)
+
+        p = state.to_act
+        actions = state.legal_actions()
+        key = state.infoset(buckets[p][state.street])
+        strategy = self._strategy(key, len(actions))
+
+        if p == traverser:
+            utils = [self._traverse(state.apply(a), traverser, buckets, showdown) for a in actions]
+            node = sum(s * u for s, u in zip(strategy, utils))
+            regrets = self.regrets.setdefault(key, [0.0] * len(actions))
+            for i, u in enumerate(utils):
+                regrets[i] += u - node
+            return node
+
+        sums = self.strategy_sum.setdefault(key, [0.0] * len(actions))
+        for i, s in enumerate(strategy):
+            sums[i] += s
+        choice = random.choices(range(len(actions)), weights=strategy)[0]
+        return self._traverse(state.apply(actions[choice]), traverser, buckets, showdown)
+
+    def train(self, iterations, report_every=10000):
+        start = time.time()
+        for i in range(1, iterations + 1):
+            buckets, showdown = self._deal()
+            for traverser in (0, 1):
+                self._traverse(AbstractState(), traverser, buckets, showdown)
+            if report_every and i % report_every == 0:
+                print(f"[CFR] {i}/{iterations} iterations, {len(self.strategy_sum)} infosets, {time.time() - start:.0f}s")
+
+    def average_strategy(self):
+        """Average strategy quantized to bytes (0-255) per action"""
+        table = {}
+        for key, sums in self.strategy_sum.items():
+            total = sum(sums)
+            if total > 0:
+                table[key] = [round(255 * s / total) for s in sums]
+        return table
+
+
+# --- Strategy table IO ---
+
+def save_strategy(table, path, iterations=0):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {
+        "version": 1,
+        "iterations": iterations,
+        "preflop_buckets": PREFLOP_BUCKETS,
+        "postflop_buckets": POSTFLOP_BUCKETS,
+        "max_raises": MAX_RAISES,
+        "strategy": table,
+    }
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+
+
+def load_strategy(path=DEFAULT_TABLE_PATH):
+    """Load a strategy table into a dict of infoset -> quantized probabilities"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        payload = json.load(f)
+    if payload.get("version") != 1 or payload.get("max_raises") != MAX_RAISES:
+        raise ValueError(f"Incompatible CFR strategy table: {path}")
+    return payload["strategy"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the heads-up CFR strategy table")
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--out", default=DEFAULT_TABLE_PATH)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    trainer = CFRTrainer()
+    trainer.train(args.iterations)
+    table = trainer.average_strategy()
+    save_strategy(table, args.out, args.iterations)
+    print(f"[CFR] Wrote {len(table)} infosets to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
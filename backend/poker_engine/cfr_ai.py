@@ -0,0 +1,94 @@
+import random
+from poker_engine.cfr import (
+    BIG_BLIND, DEFAULT_TABLE_PATH, STAGES, AbstractState, bucket, load_strategy,
+)
+from poker_engine.evaluator import card_indices
+
+_tables = {}
+
+
+def get_strategy_table(path=DEFAULT_TABLE_PATH):
+    """Load a strategy table once per process; None if it has not been trained yet"""
+    if path not in _tables:
+        try:
+            _tables[path] = load_strategy(path)
+            print(f"[CFR] Loaded {len(_tables[path])} infosets from {path}")
+        except (OSError, ValueError) as e:
+            print(f"[CFR] No strategy table available ({e}), using fallback play")
+            _tables[path] = None
+    return _tables[path]
+
+
+class CFRBot:
+    """
+    Heads-up bot that plays the strategy table written by poker_engine.cfr.
+    Each decision replays the hand's action history through the abstract
+    betting tree and looks the resulting infoset up in the table.
+    """
+
+    def __init__(self, name="Bot", table_path=DEFAULT_TABLE_PATH):
+        self.name = name
+        self.is_bot = True
+        self.table_path = table_path
+
+    def _abstract_state(self, state):
+        """Map the real action history onto the abstract tree, or None if it falls outside it"""
+        node = AbstractState()
+        for entry in state.get("action_history", []):
+            street = STAGES.index(entry["stage"]) if entry["stage"] in STAGES else -1
+            if node.is_terminal() or street != node.street:
+                return None
+
+            if entry["action"] == "raise":
+                pot_after_call = entry["pot"] + entry["to_call"]
+                action = "h" if entry["amount"] <= 0.75 * pot_after_call else "p"
+            elif entry["action"] == "fold":
+                action = "f"
+            else:
+                action = "c"
+            if action not in node.legal_actions():
+                return None
+            node = node.apply(action)
+        return node
+
+    def _fallback(self, actions):
+        move = "check" if "check" in actions else "call" if "call" in actions else "fold"
+        return {"move": move, "raise_amount": 0}
+
+    def decide(self, state: dict) -> dict:
+        actions = state.get("legal_actions", [])
+        if not actions:
+            return {"move": "check", "raise_amount": 0}
+
+        players = state.get("players", [])
+        bot = next((p for p in players if p["name"] == self.name), None)
+        if not bot:
+            return {"move": "fold", "raise_amount": 0}
+
+        table = get_strategy_table(self.table_path)
+        seated = [p for p in players if p["name"]]
+        node = self._abstract_state(state) if table is not None and len(seated) == 2 else None
+        if node is None or node.is_terminal():
+            return self._fallback(actions)
+
+        hand = card_indices(bot.get("hand", []))
+        board = card_indices(state.get("community_cards", []))
+        probs = table.get(node.infoset(bucket(hand, board)))
+        if not probs:
+            return self._fallback(actions)
+
+        abstract_actions = node.legal_actions()
+        choice = random.choices(abstract_actions, weights=probs)[0]
+
+        if choice == "f":
+            return {"move": "check" if "check" in actions else "fold", "raise_amount": 0}
+        if choice == "c" or "raise" not in actions:
+            return self._fallback(actions)
+
+        to_call = state.get("to_call", 0)
+        pot_after_call = state.get("pot", 0) + to_call
+        raise_amount = max(BIG_BLIND, pot_after_call // 2 if choice == "h" else pot_after_call)
+        raise_amount = min(raise_amount, bot["chips"] - to_call)
+        if raise_amount <= 0:
+            return self._fallback(actions)
+        return {"move": "raise", "raise_amount": raise_amount}
@@ -0,0 +1,232 @@
+"""
+Range-vs-range equity calculator.
+
+Each player is given a weighted range (see hand_range.to_weights). Combos that
+collide with the board or dead cards are removed up front, and combos that
+collide with each other are never dealt together. Small problems are
+enumerated exactly; larger ones fall back to weighted Monte Carlo sampling.
+"""
+import random
+from bisect import bisect
+from functools import lru_cache
+from itertools import combinations, product
+from math import comb, prod
+
+from .card import Deck
+from .evaluator import card_indices, evaluate_batch
+from .hand_range import COMBOS, to_weights
+
+DEFAULT_ITERATIONS = 2000
+EXACT_LIMIT = 20000  # (combo assignments x runouts) enumerated exactly
+
+
+def calculate_equity(ranges, board=(), dead=(), iterations=DEFAULT_ITERATIONS):
+    """
+    Return the equity (wins plus split-pot shares) of each range, in order.
+
+    ranges: list of range specs, one per player (e.g. ["QQ+, AKs", "random"])
+    board:  0-5 community cards
+    dead:   cards known to be out of play
+    """
+    if len(ranges) < 2:
+        raise ValueError("Equity needs at least two ranges")
+    board = tuple(card_indices(board))
+    dead = tuple(card_indices(dead))
+    if len(board) > 5:
+        raise ValueError("The board has at most 5 cards")
+    if len(set(board + dead)) != len(board) + len(dead):
+        raise ValueError("Duplicate board or dead cards")
+
+    keys = tuple(_range_key(spec) for spec in ranges)
+    return list(_cached_equity(keys, board, dead, max(1, int(iterations))))
+
+
+def hand_equities(jobs):
+    """
+    hand_equity for many (hand, opponent_ranges, board, iterations) jobs at
+    once, as a float or the ValueError per job. Sampled jobs on the same
+    board share their runouts, so each runout scores every one of those
+    jobs' hands with one evaluate_batch call; small jobs are enumerated
+    exactly as usual.
+    """
+    results = [None] * len(jobs)
+    groups = {}
+    for i, (hand, opponent_ranges, board, iterations) in enumerate(jobs):
+        try:
+            hand = tuple(card_indices(hand))
+            board = tuple(card_indices(board))
+            blocked = set(hand) | set(board)
+            if len(hand) != 2 or len(board) > 5 or len(blocked) != len(hand) + len(board):
+                raise ValueError("Equity needs two hole cards and a board of at most 5 distinct cards")
+            players = []
+            for spec in opponent_ranges:
+                combos = [(COMBOS[idx], w) for idx, w in to_weights(spec).items()
+                          if COMBOS[idx][0] not in blocked and COMBOS[idx][1] not in blocked]
+                if not combos:
+                    raise ValueError("A range has no combos left after card removal")
+                players.append(combos)
+            if not players:
+                raise ValueError("Equity needs at least two ranges")
+
+            missing = 5 - len(board)
+            runouts = comb(52 - len(blocked) - 2 * len(players), missing)
+            if prod(len(combos) for combos in players) * runouts <= EXACT_LIMIT:
+                results[i] = hand_equity(hand, opponent_ranges, board, iterations=iterations)
+            else:
+                samplers = [_sampler(combos) for combos in players]
+                groups.setdefault(tuple(sorted(board)), []).append((i, hand, samplers, max(1, int(iterations))))
+        except ValueError as e:
+            results[i] = e
+
+    for board, group in groups.items():
+        for i, equity in _shared_runout_equity(board, group):
+            results[i] = equity
+    return results
+
+
+def _shared_runout_equity(board, group):
+    """Sampled hero equity for (index, hand, samplers, iterations) jobs that share a board"""
+    missing = 5 - len(board)
+    available = [c for c in range(52) if c not in board]
+    wins = {i: 0.0 for i, _, _, _ in group}
+    done = {i: 0 for i, _, _, _ in group}
+    pending = list(group)
+    attempts = 0
+    max_attempts = max(iterations for _, _, _, iterations in group) * 100
+    while pending and attempts < max_attempts:
+        attempts += 1
+        runout = tuple(random.sample(available, missing))
+        taken = set(runout)
+        dealt = []  # (index, first hand in the batch, number of hands)
+        hands = []
+        for i, hand, samplers, _ in pending:
+            if hand[0] in taken or hand[1] in taken:
+                continue
+            seats = [hand] + [combos[min(bisect(cumulative, random.random() * total), last)]
+                              for combos, cumulative, total, last in samplers]
+            cards = [c for seat in seats for c in seat]
+            if len(set(cards)) != len(cards) or not taken.isdisjoint(cards):
+                continue  # card removal: this job skips the runout
+            dealt.append((i, len(hands), len(seats)))
+            hands.extend(seats)
+        if not hands:
+            continue
+
+        scores = evaluate_batch(hands, board + runout)
+        for i, start, count in dealt:
+            ours = scores[start]
+            best = max(scores[start:start + count])
+            if ours == best:
+                wins[i] += 1.0 / scores[start:start + count].count(best)
+            done[i] += 1
+        pending = [job for job in pending if done[job[0]] < job[3]]
+
+    for i, _, _, iterations in group:
+        if done[i] < iterations:
+            yield i, ValueError("The ranges cannot be dealt together")
+        else:
+            yield i, wins[i] / iterations
+
+
+def hand_equity(hand, opponent_ranges, board=(), dead=(), iterations=DEFAULT_ITERATIONS):
+    """Equity of one known hand against one or more opponent ranges"""
+    return calculate_equity([list(hand)] + list(opponent_ranges), board, dead, iterations)[0]
+
+
+def _range_key(spec):
+    """Hashable form of a range spec so results can be cached"""
+    if isinstance(spec, str):
+        return spec.strip()
+    return tuple(sorted(to_weights(spec).items()))
+
+
+@lru_cache(maxsize=512)
+def _cached_equity(keys, board, dead, iterations):
+    blocked = set(board) | set(dead)
+    players = []
+    for key in keys:
+        weights = to_weights(key) if isinstance(key, str) else dict(key)
+        combos = [(COMBOS[idx], w) for idx, w in weights.items()
+                  if COMBOS[idx][0] not in blocked and COMBOS[idx][1] not in blocked]
+        if not combos:
+            raise ValueError("A range has no combos left after card removal")
+        players.append(combos)
+
+    missing = 5 - len(board)
+    runouts = comb(52 - len(blocked) - 2 * len(players), missing)
+    if prod(len(combos) for combos in players) * runouts <= EXACT_LIMIT:
+        return tuple(_exact_equity(players, board, blocked, missing))
+    return tuple(_sampled_equity(players, board, blocked, missing, iterations))
+
+
+def _award(equities, scores, weight):
+    best = max(scores)
+    winners = [i for i, s in enumerate(scores) if s == best]
+    share = weight / len(winners)
+    for i in winners:
+        equities[i] += share
+
+
+def _exact_equity(players, board, blocked, missing):
+    assignments = []
+    for combos in product(*players):
+        cards = set()
+        for (a, b), _ in combos:
+            cards.add(a)
+            cards.add(b)
+        if len(cards) == 2 * len(combos):
+            assignments.append(([c for c, _ in combos], cards, prod(w for _, w in combos)))
+    if not assignments:
+        raise ValueError("The ranges cannot be dealt together")
+
+    distinct = list({c for combos, _, _ in assignments for c in combos})
+    available = [c for c in range(52) if c not in blocked]
+    equities = [0.0] * len(players)
+    total = 0.0
+    for runout in combinations(available, missing):
+        full_board = board + runout
+        # Batch-evaluate every combo that can appear with this runout once
+        live = [c for c in distinct if c[0] not in runout and c[1] not in runout]
+        scores = dict(zip(live, evaluate_batch(live, full_board)))
+        for combos, cards, weight in assignments:
+            if cards.isdisjoint(runout):
+                _award(equities, [scores[c] for c in combos], weight)
+                total += weight
+    return [e / total for e in equities]
+
+
+def _sampler(combos):
+    """(combos, cumulative weights, total, last index) for weighted sampling with bisect"""
+    cumulative = []
+    running = 0.0
+    for _, w in combos:
+        running += w
+        cumulative.append(running)
+    return [c for c, _ in combos], cumulative, running, len(combos) - 1
+
+
+def _sampled_equity(players, board, blocked, missing, iterations):
+    samplers = [_sampler(combos) for combos in players]
+
+    deck = Deck(shuffle=False, cards=range(52))
+    deck.exclude(blocked)
+    live_start = deck.position
+
+    equities = [0.0] * len(players)
+    done = attempts = 0
+    max_attempts = iterations * 100
+    while done < iterations:
+        attempts += 1
+        if attempts > max_attempts:
+            raise ValueError("The ranges cannot be dealt together")
+        hands = [combos[min(bisect(cumulative, random.random() * total), last)]
+                 for combos, cumulative, total, last in samplers]
+        cards = [c for hand in hands for c in hand]
+        if len(set(cards)) != len(cards):
+            continue  # card removal: reject colliding combos
+        deck.rewind(live_start)
+        deck.exclude(cards)
+        full_board = board + tuple(deck.draw(missing))
+        _award(equities, evaluate_batch(hands, full_board), 1.0)
+        done += 1
+    return [e / iterations for e in equities]
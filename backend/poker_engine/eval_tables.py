@@ -0,0 +1,251 @@
+"""
+Memory-mapped lookup tables for the hand evaluator.
+
+The tables are generated once by a separate build step and opened read-only
+with mmap, so every process (ProcessPoolExecutor workers, uvicorn workers)
+shares the same physical pages and opening them costs the same regardless
+of their size.
+
+Each card maps to an additive key: a rank key chosen so that the sum over any
+5, 6 or 7 cards identifies the rank multiset, plus 3-bit suit counters. The
+rank sum indexes a dense table of non-flush scores for that hand size; the
+suit counters say whether a flush is possible, in which case the suit's rank
+mask indexes the flush table.
+
+    python -m poker_engine.eval_tables build [--out PATH]
+    python -m poker_engine.eval_tables verify [PATH]
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import combinations_with_replacement
+
+MAGIC = b"PKEVTBL1"
+VERSION = 1
+ALIGN = 4096
+HAND_SIZES = (5, 6, 7)
+
+# Rank sums of these keys are unique for every multiset of a given size <= 7
+RANK_KEYS = (0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181)
+
+CARD_KEYS = [(RANK_KEYS[c >> 2] << 12) | (1 << 3 * (c & 3)) for c in range(52)]
+
+# Flush suit for every combination of 3-bit suit counters, or 4 for none
+FLUSH_SUIT = bytes(
+    next((s for s in range(4) if (counts >> 3 * s) & 7 >= 5), 4) for counts in range(4096)
+)
+
+DEFAULT_PATH = os.environ.get(
+    "POKER_EVAL_TABLES", os.path.join(os.path.dirname(__file__), "data", "eval_tables.bin")
+)
+
+
+class TableEvaluator:
+    """Evaluator backed by a read-only memory map of the table file"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = read_header(self._mm)
+        if header["payload_size"] + header["payload_offset"] != len(self._mm):
+            raise ValueError(f"Evaluator table file is truncated: {path}")
+
+        view = memoryview(self._mm)
+        sections = {}
+        for name, (offset, count) in header["sections"].items():
+            sections[name] = view[offset:offset + count * 4].cast("I")
+        self.flush = sections["flush"]
+        self.ranks = {n: sections[f"ranks{n}"] for n in HAND_SIZES}
+
+    def evaluate(self, cards):
+        n = len(cards)
+        if n < 5:
+            return _compute_evaluate(cards)
+        key = 0
+        for c in cards:
+            key += CARD_KEYS[c]
+        score = self.ranks[n][key >> 12]
+        suit = FLUSH_SUIT[key & 4095]
+        if suit < 4:
+            mask = 0
+            for c in cards:
+                if c & 3 == suit:
+                    mask |= 1 << (c >> 2)
+            flush = self.flush[mask]
+            if flush > score:
+                score = flush
+        return score
+
+    def evaluate_batch(self, hands, board):
+        card_keys = CARD_KEYS
+        flush_suit = FLUSH_SUIT
+        ranks = self.ranks
+        base = 0
+        for c in board:
+            base += card_keys[c]
+        board_size = len(board)
+        scores = []
+        for hand in hands:
+            n = board_size + len(hand)
+            if n < 5:
+                scores.append(_compute_evaluate(list(hand) + list(board)))
+                continue
+            key = base
+            for c in hand:
+                key += card_keys[c]
+            score = ranks[n][key >> 12]
+            suit = flush_suit[key & 4095]
+            if suit < 4:
+                mask = 0
+                for c in board:
+                    if c & 3 == suit:
+                        mask |= 1 << (c >> 2)
+                for c in hand:
+                    if c & 3 == suit:
+                        mask |= 1 << (c >> 2)
+                flush = self.flush[mask]
+                if flush > score:
+                    score = flush
+            scores.append(score)
+        return scores
+
+
+def _compute_evaluate(cards):
+    from .evaluator import compute_evaluate
+    return compute_evaluate(cards)
+
+
+def read_header(buf):
+    if bytes(buf[:8]) != MAGIC:
+        raise ValueError("Not an evaluator table file")
+    (length,) = struct.unpack("<I", buf[8:12])
+    header = json.loads(bytes(buf[12:12 + length]))
+    if header.get("version") != VERSION:
+        raise ValueError(f"Unsupported evaluator table version: {header.get('version')}")
+    if header.get("byteorder") != sys.byteorder or tuple(header.get("rank_keys", ())) != RANK_KEYS:
+        raise ValueError("Evaluator tables were built for a different platform or key set")
+    return header
+
+
+def open_tables(path=DEFAULT_PATH):
+    """Open the table file if it has been built; None otherwise"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return TableEvaluator(path)
+    except (OSError, ValueError) as e:
+        print(f"[EVAL] Ignoring evaluator tables at {path}: {e}")
+        return None
+
+
+# --- Build step ---
+
+def _build_sections():
+    from .evaluator import TOP_RANKS, _flush_score, _rank_score
+
+    sections = {"flush": array("I", bytes(4 * 8192))}
+    for mask in range(8192):
+        if len(TOP_RANKS[mask]) >= 5:
+            sections["flush"][mask] = _flush_score(mask)
+
+    for n in HAND_SIZES:
+        max_key = sum(sorted(RANK_KEYS * 4, reverse=True)[:n])
+        table = array("I", bytes(4 * (max_key + 1)))
+        for ranks in combinations_with_replacement(range(13), n):
+            counts = [0] * 13
+            mask = 0
+            for r in ranks:
+                counts[r] += 1
+                mask |= 1 << r
+            if max(counts) > 4:
+                continue
+            key = sum(RANK_KEYS[r] for r in ranks)
+            if table[key]:
+                raise ValueError(f"Rank key collision for {n}-card hands")
+            table[key] = _rank_score(counts, mask)
+        sections[f"ranks{n}"] = table
+    return sections
+
+
+def build_tables(path=DEFAULT_PATH):
+    """Generate the table file, writing to a temp file and renaming it into place"""
+    sections = _build_sections()
+
+    layout = {}
+    offset = 0
+    for name, table in sections.items():
+        layout[name] = offset
+        offset += len(table) * 4
+        offset += -offset % ALIGN
+
+    digest = hashlib.sha256()
+    for name, table in sections.items():
+        digest.update(table.tobytes())
+
+    header = {
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "rank_keys": RANK_KEYS,
+        "sha256": digest.hexdigest(),
+        "payload_offset": ALIGN,
+        "payload_size": offset,
+        "sections": {name: (ALIGN + layout[name], len(table)) for name, table in sections.items()},
+    }
+    encoded = json.dumps(header).encode()
+    if len(encoded) + 12 > ALIGN:
+        raise ValueError("Evaluator table header is too large")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        f.write(b"\0" * (ALIGN - 12 - len(encoded)))
+        for name, table in sections.items():
+            f.seek(header["sections"][name][0])
+            f.write(table.tobytes())
+        f.truncate(ALIGN + offset)
+    os.replace(tmp_path, path)
+    verify_tables(path)
+    return header
+
+
+def verify_tables(path=DEFAULT_PATH):
+    """Recompute the checksum of every section; raises ValueError on mismatch"""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        header = read_header(mm)
+        digest = hashlib.sha256()
+        for name, (offset, count) in header["sections"].items():
+            digest.update(mm[offset:offset + count * 4])
+        if digest.hexdigest() != header["sha256"]:
+            raise ValueError(f"Evaluator table checksum mismatch: {path}")
+    finally:
+        mm.close()
+    return header
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or verify the evaluator lookup tables")
+    parser.add_argument("command", choices=["build", "verify"])
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    path = args.out or args.path
+    if args.command == "build":
+        header = build_tables(path)
+        print(f"[EVAL] Built {path} ({header['payload_size'] / 1e6:.1f} MB, sha256 {header['sha256'][:12]})")
+    else:
+        header = verify_tables(path)
+        print(f"[EVAL] {path} OK (sha256 {header['sha256'][:12]})")
+
+
+if __name__ == "__main__":
+    main()
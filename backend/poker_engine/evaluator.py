@@ -0,0 +1,216 @@
+"""
+Fast integer hand evaluator.
+
+Cards are encoded as ints 0-51 (rank_index * 4 + suit_index, with rank_index
+0 for '2' up to 12 for 'A'). evaluate() returns a single int score where a
+higher score is a better hand; score >> 20 is the category from
+utils.HAND_RANKS (royal flushes are reported as straight flushes).
+
+The rank tables and the evaluate backend are set up on first use, so
+importing the module just for card_index() stays cheap.
+"""
+from .card import Card, Deck, FULL_DECK
+
+RANK_INDEX = {rank: i for i, rank in enumerate(Deck.ranks)}
+SUIT_INDEX = {suit: i for i, suit in enumerate(Deck.suits)}
+
+HIGH_CARD = 1
+ONE_PAIR = 2
+TWO_PAIR = 3
+THREE_OF_A_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_A_KIND = 8
+STRAIGHT_FLUSH = 9
+
+HAND_CLASS_NAMES = {
+    HIGH_CARD: "high_card",
+    ONE_PAIR: "one_pair",
+    TWO_PAIR: "two_pair",
+    THREE_OF_A_KIND: "three_of_a_kind",
+    STRAIGHT: "straight",
+    FLUSH: "flush",
+    FULL_HOUSE: "full_house",
+    FOUR_OF_A_KIND: "four_of_a_kind",
+    STRAIGHT_FLUSH: "straight_flush",
+}
+
+_CARDS_BY_INDEX = [None] * 52
+for _card in FULL_DECK:
+    _CARDS_BY_INDEX[RANK_INDEX[_card.rank] * 4 + SUIT_INDEX[_card.suit]] = _card
+
+
+def card_index(card):
+    """Convert a Card, a card string like '10h' (or 'Th') or an int into a card index"""
+    if isinstance(card, int):
+        return card
+    if isinstance(card, Card):
+        return RANK_INDEX[card.rank] * 4 + SUIT_INDEX[card.suit]
+    try:
+        rank = card[:-1].upper()
+        return RANK_INDEX["10" if rank == "T" else rank] * 4 + SUIT_INDEX[card[-1].lower()]
+    except (KeyError, TypeError, AttributeError):
+        raise ValueError(f"Invalid card: {card!r}")
+
+
+def index_to_card(index):
+    """Shared Card object for a card index"""
+    return _CARDS_BY_INDEX[index]
+
+
+def card_indices(cards):
+    """Convert a list of Cards, card strings or ints into card indexes"""
+    return [card_index(c) for c in cards]
+
+
+def hand_class(score):
+    """Category name (as used in utils.HAND_RANKS) of an evaluate() score"""
+    return HAND_CLASS_NAMES[score >> 20]
+
+
+def _build_straight_table():
+    # Highest rank index of a straight contained in a 13-bit rank mask, or -1
+    table = [-1] * 8192
+    windows = [(0b11111 << low, low + 4) for low in range(8, -1, -1)]
+    wheel = (1 << 12) | 0b1111
+    for mask in range(8192):
+        for window, high in windows:
+            if mask & window == window:
+                table[mask] = high
+                break
+        else:
+            if mask & wheel == wheel:
+                table[mask] = 3
+    return table
+
+
+def _build_top_ranks_table():
+    # Rank indexes present in a 13-bit mask, highest first
+    return [tuple(r for r in range(12, -1, -1) if mask >> r & 1) for mask in range(8192)]
+
+
+def _pack(category, ranks):
+    score = category
+    for i in range(5):
+        score = (score << 4) | (ranks[i] if i < len(ranks) else 0)
+    return score
+
+
+def _flush_score(mask):
+    high = STRAIGHT_HIGH[mask]
+    if high >= 0:
+        return _pack(STRAIGHT_FLUSH, (high,))
+    return _pack(FLUSH, TOP_RANKS[mask][:5])
+
+
+def _rank_score(counts, rank_mask):
+    """Best non-flush score for the given rank counts"""
+    quads = trips = None
+    pairs = []
+    singles = []
+    for r in TOP_RANKS[rank_mask]:
+        n = counts[r]
+        if n == 4:
+            quads = r
+        elif n == 3:
+            if trips is None:
+                trips = r
+            else:
+                pairs.append(r)
+        elif n == 2:
+            pairs.append(r)
+        else:
+            singles.append(r)
+
+    if quads is not None:
+        kicker = max(pairs[:1] + singles[:1] + ([trips] if trips is not None else []), default=0)
+        return _pack(FOUR_OF_A_KIND, (quads, kicker))
+    if trips is not None and pairs:
+        return _pack(FULL_HOUSE, (trips, max(pairs)))
+    if STRAIGHT_HIGH[rank_mask] >= 0:
+        return _pack(STRAIGHT, (STRAIGHT_HIGH[rank_mask],))
+    if trips is not None:
+        return _pack(THREE_OF_A_KIND, (trips,) + tuple(singles[:2]))
+    if len(pairs) >= 2:
+        kicker = max(pairs[2:3] + singles[:1], default=0)
+        return _pack(TWO_PAIR, (pairs[0], pairs[1], kicker))
+    if pairs:
+        return _pack(ONE_PAIR, (pairs[0],) + tuple(singles[:3]))
+    return _pack(HIGH_CARD, singles[:5])
+
+
+def _score(counts, suit_masks):
+    best = 0
+    for mask in suit_masks:
+        if mask and len(TOP_RANKS[mask]) >= 5:
+            best = _flush_score(mask)
+            break
+
+    score = _rank_score(counts, suit_masks[0] | suit_masks[1] | suit_masks[2] | suit_masks[3])
+    return score if score > best else best
+
+
+def _compute_evaluate(cards):
+    """Score the best five-card hand out of 5-7 card indices without lookup tables"""
+    counts = [0] * 13
+    suit_masks = [0, 0, 0, 0]
+    for c in cards:
+        r = c >> 2
+        counts[r] += 1
+        suit_masks[c & 3] |= 1 << r
+    return _score(counts, suit_masks)
+
+
+def _compute_evaluate_batch(hands, board):
+    """
+    Score many hole-card pairs against the same board without lookup tables.
+    The board is tallied once and each hand only adds its own cards.
+    """
+    base_counts = [0] * 13
+    base_masks = [0, 0, 0, 0]
+    for c in board:
+        r = c >> 2
+        base_counts[r] += 1
+        base_masks[c & 3] |= 1 << r
+
+    scores = []
+    for hand in hands:
+        counts = base_counts[:]
+        suit_masks = base_masks[:]
+        for c in hand:
+            r = c >> 2
+            counts[r] += 1
+            suit_masks[c & 3] |= 1 << r
+        scores.append(_score(counts, suit_masks))
+    return scores
+
+
+_LAZY = ("STRAIGHT_HIGH", "TOP_RANKS", "evaluate", "evaluate_batch", "compute_evaluate", "compute_evaluate_batch")
+
+
+def _load():
+    global STRAIGHT_HIGH, TOP_RANKS, _tables
+    global evaluate, evaluate_batch, compute_evaluate, compute_evaluate_batch
+    STRAIGHT_HIGH = _build_straight_table()
+    TOP_RANKS = _build_top_ranks_table()
+    compute_evaluate = _compute_evaluate
+    compute_evaluate_batch = _compute_evaluate_batch
+
+    # Use the memory-mapped lookup tables (see eval_tables) when they have been built
+    from . import eval_tables
+    _tables = eval_tables.open_tables()
+    if _tables is not None:
+        evaluate = _tables.evaluate
+        evaluate_batch = _tables.evaluate_batch
+    else:
+        evaluate = compute_evaluate
+        evaluate_batch = compute_evaluate_batch
+
+
+def __getattr__(name):
+    # Only called for names not set yet: the first access runs _load()
+    if name in _LAZY:
+        _load()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
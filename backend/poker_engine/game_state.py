@@ -0,0 +1,341 @@
+"""
+Compact game state for bots that search ahead.
+
+GameState follows PokerGame's betting rules (turn order, when a round ends,
+minimum raises, short all-in calls) on a few flat lists, so a search steps
+it with apply() and takes the step back with undo() instead of deep-copying
+Players, the Deck and the action-order sets. clone() copies the lists, for
+a search that wants a state of its own. Nothing prints.
+
+Cards are evaluator indexes. Hands a bot can't see are None until a search
+fills them in (determinization), and later board cards are dealt from
+`deck` by moving a cursor, so undo() only moves it back.
+
+An action is a move ("check", "call", "fold" or "raise") and, for raises,
+the chips put in on top of the call, as in PokerGame.execute_action.
+Showdowns pay the main pot and side pots like PokerGame, from what each
+seat has put in over the hand (`invested`), but split ties exactly where
+PokerGame hands odd chips out by seat.
+"""
+from .evaluator import card_indices, evaluate
+
+STAGES = ("preflop", "flop", "turn", "river", "showdown")
+PREFLOP, FLOP, TURN, RIVER, SHOWDOWN = range(5)
+
+
+class GameState:
+    __slots__ = (
+        "seated", "dealer", "big_blind", "chips", "bets", "invested", "folded", "hands", "board", "deck", "deck_pos",
+        "pot", "current_bet", "last_raise", "stage", "order", "action_index", "to_act", "current",
+        "num_in_hand", "terminal", "history", "_log",
+    )
+
+    def __init__(self, seated, dealer, big_blind, chips, bets, folded, hands, board, deck, pot, current_bet,
+                 last_raise, stage, order, action_index, to_act, current, num_in_hand, terminal=False,
+                 invested=None):
+        self.seated = tuple(seated)
+        self.dealer = dealer
+        self.big_blind = big_blind
+        self.chips = list(chips)
+        self.bets = list(bets)
+        self.invested = list(bets if invested is None else invested)  # chips put in this hand
+        self.folded = list(folded)
+        self.hands = list(hands)
+        self.board = list(board)
+        self.deck = list(deck)
+        self.deck_pos = 0
+        self.pot = pot
+        self.current_bet = current_bet
+        self.last_raise = last_raise
+        self.stage = stage
+        self.order = tuple(order)
+        self.action_index = action_index
+        self.to_act = to_act  # bitmask of seats still to act this round
+        self.current = current
+        self.num_in_hand = num_in_hand
+        self.terminal = terminal
+        self.history = []  # (seat, move, amount) applied since the state was made
+        self._log = []
+
+    # --- Construction ---
+
+    @classmethod
+    def from_game(cls, game, deck=None):
+        """
+        Exact copy of a PokerGame hand in progress. Later board cards come
+        from the game's own deck unless a deck (card indexes) is given.
+        """
+        if game.stage == "lobby":
+            raise ValueError("No hand in progress")
+        if deck is None:
+            deck = card_indices(game.deck.cards[game.deck.position:])
+        to_act = 0
+        for seat in game.players_to_act:
+            to_act |= 1 << seat
+        return cls(
+            seated=[bool(p.name) for p in game.players],
+            dealer=game.dealer_index,
+            big_blind=game.big_blind,
+            chips=[p.chips for p in game.players],
+            bets=[p.current_bet for p in game.players],
+            folded=[p.folded for p in game.players],
+            hands=[tuple(card_indices(p.hand)) if p.hand else None for p in game.players],
+            board=card_indices(game.community_cards),
+            deck=deck,
+            pot=game.pot,
+            current_bet=game.current_bet,
+            last_raise=game.last_raise,
+            stage=STAGES.index(game.stage),
+            order=game.player_order,
+            action_index=game.action_index,
+            to_act=to_act,
+            current=game.current_player_index,
+            num_in_hand=game.num_in_hand,
+            terminal=game.game_over,
+            invested=[p.total_bet for p in game.players],
+        )
+
+    @classmethod
+    def from_state(cls, state, big_blind=None):
+        """
+        Rebuild the betting round from a get_game_state() dict, as bots see
+        it. Who still has to act is replayed from this street's actions;
+        hidden hands are None and the deck is empty.
+        """
+        players = state["players"]
+        if state["stage"] not in STAGES or state.get("game_over"):
+            raise ValueError("No hand in progress")
+        stage = STAGES.index(state["stage"])
+        big_blind = big_blind or state.get("big_blind") or 20
+        seated = [bool(p["name"]) for p in players]
+        chips = [p["chips"] for p in players]
+        folded = [p["folded"] for p in players]
+        dealer = next((i for i, p in enumerate(players) if p["name"] == state["dealer"]), 0)
+
+        # Betting continues round the table from the player to act
+        current = state["current_player_index"]
+        n = len(players)
+        order = [seat for seat in ((current + i) % n for i in range(n)) if seated[seat] and chips[seat] > 0]
+
+        def can_act(seat):
+            return seated[seat] and chips[seat] > 0 and not folded[seat]
+
+        to_act = {seat for seat in order if can_act(seat)}
+        last_raise = big_blind
+        for action in state.get("action_history", []):
+            if action["stage"] != state["stage"]:
+                continue
+            seat = action["player_index"]
+            if action["action"] == "raise":
+                to_act = {s for s in order if s != seat and can_act(s)}
+                last_raise = max(last_raise, action["amount"])
+            else:
+                to_act.discard(seat)
+        to_act.add(current)
+        mask = 0
+        for seat in to_act:
+            if can_act(seat):
+                mask |= 1 << seat
+
+        hands = []
+        for p in players:
+            cards = [c for c in p["hand"] if c != "??"]
+            hands.append(tuple(card_indices(cards)) if len(cards) == 2 else None)
+
+        return cls(
+            seated=seated, dealer=dealer, big_blind=big_blind, chips=chips,
+            bets=[p["current_bet"] for p in players], folded=folded, hands=hands,
+            board=card_indices(state["community_cards"]), deck=(), pot=state["pot"],
+            current_bet=state["current_bet"], last_raise=last_raise, stage=stage, order=order,
+            action_index=0, to_act=mask, current=current,
+            num_in_hand=sum(1 for seat in range(n) if seated[seat] and not folded[seat]),
+            invested=[p.get("total_bet", p["current_bet"]) for p in players],
+        )
+
+    def clone(self):
+        """Independent copy of the state (without the undo log)"""
+        other = GameState.__new__(GameState)
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        other.chips = self.chips[:]
+        other.bets = self.bets[:]
+        other.invested = self.invested[:]
+        other.folded = self.folded[:]
+        other.hands = self.hands[:]
+        other.board = self.board[:]
+        other.deck = self.deck[:]
+        other.history = self.history[:]
+        other._log = []
+        return other
+
+    # --- Queries ---
+
+    def to_call(self, seat=None):
+        seat = self.current if seat is None else seat
+        return max(0, self.current_bet - self.bets[seat])
+
+    def legal_actions(self):
+        """Moves open to the player to act, in PokerGame's order"""
+        if self.terminal or self.current is None:
+            return []
+        to_call = self.to_call()
+        actions = ["check" if to_call == 0 else "call", "fold"]
+        if to_call < self.chips[self.current]:
+            actions.append("raise")
+        return actions
+
+    def raise_bounds(self):
+        """(min, max) raise on top of the call; (0, 0) if raising isn't allowed"""
+        if self.terminal or self.current is None:
+            return 0, 0
+        max_raise = self.chips[self.current] - self.to_call()
+        if max_raise <= 0:
+            return 0, 0
+        return min(max(self.big_blind, self.last_raise), max_raise), max_raise
+
+    def payoffs(self):
+        """Stack of every seat once the pot is paid out; the hand must be over"""
+        if not self.terminal:
+            raise ValueError("The hand is not over")
+        stacks = self.chips[:]
+        invested = self.invested[:]
+        # Chips nobody matched go back to whoever bet them
+        top = max(range(len(invested)), key=invested.__getitem__)
+        excess = invested[top] - max(c for seat, c in enumerate(invested) if seat != top)
+        if excess > 0:
+            invested[top] -= excess
+            stacks[top] += excess
+
+        live = [seat for seat in range(len(stacks)) if self.seated[seat] and not self.folded[seat]]
+        if len(live) == 1:
+            stacks[live[0]] += sum(invested)
+            return stacks
+        scores = {seat: evaluate(list(self.hands[seat]) + self.board) for seat in live}
+        levels = sorted({invested[seat] for seat in live})
+        previous = 0
+        for n, level in enumerate(levels):
+            cap = level if n < len(levels) - 1 else max(invested)
+            amount = sum(min(c, cap) - min(c, previous) for c in invested)
+            eligible = [seat for seat in live if invested[seat] >= level]
+            best = max(scores[seat] for seat in eligible)
+            winners = [seat for seat in eligible if scores[seat] == best]
+            for seat in winners:
+                stacks[seat] += amount / len(winners)
+            previous = cap
+        return stacks
+
+    # --- Stepping ---
+
+    def apply(self, move, amount=0):
+        """Play a move for the player to act; raises ValueError if it isn't legal"""
+        seat = self.current
+        if seat is None or self.terminal:
+            raise ValueError("No player to act")
+        to_call = self.to_call()
+        if move == "call":
+            if to_call <= 0:
+                raise ValueError("No bet to call")
+        elif move == "check":
+            if to_call > 0:
+                raise ValueError("Cannot check facing a bet")
+        elif move == "raise":
+            if to_call >= self.chips[seat] or amount <= 0 or to_call + amount > self.chips[seat]:
+                raise ValueError(f"Illegal raise of {amount}")
+        elif move != "fold":
+            raise ValueError(f"Unknown move: {move}")
+
+        self._log.append((
+            self.chips[:], self.bets[:], self.invested[:], self.folded[:], len(self.board), self.deck_pos, self.pot,
+            self.current_bet, self.last_raise, self.stage, self.order, self.action_index, self.to_act,
+            self.current, self.num_in_hand, self.terminal,
+        ))
+        self.history.append((seat, move, amount if move == "raise" else 0))
+
+        bit = 1 << seat
+        if move == "fold":
+            self.folded[seat] = True
+            self.num_in_hand -= 1
+            self.to_act &= ~bit
+            if self.num_in_hand == 1:
+                self._finish()
+                return
+        elif move == "raise":
+            self._bet(seat, to_call + amount)
+            self.current_bet = self.bets[seat]
+            self.last_raise = max(self.last_raise, amount)
+            self.to_act = 0
+            for s in self.order:
+                if s != seat and not self.folded[s] and self.chips[s] > 0:
+                    self.to_act |= 1 << s
+        else:
+            if move == "call":
+                self._bet(seat, min(to_call, self.chips[seat]))
+            self.to_act &= ~bit
+        self.action_index += 1
+        self._advance()
+
+    def undo(self):
+        """Take back the last apply()"""
+        (self.chips, self.bets, self.invested, self.folded, board_len, self.deck_pos, self.pot, self.current_bet,
+         self.last_raise, self.stage, self.order, self.action_index, self.to_act, self.current,
+         self.num_in_hand, self.terminal) = self._log.pop()
+        del self.board[board_len:]
+        self.history.pop()
+
+    def _bet(self, seat, amount):
+        self.chips[seat] -= amount
+        self.bets[seat] += amount
+        self.invested[seat] += amount
+        self.pot += amount
+
+    def _advance(self):
+        order = self.order
+        if self.to_act and sum(1 for s in order if not self.folded[s] and self.chips[s] > 0) <= 1:
+            # As in PokerGame: with nobody left to bet against, only a player facing a bet acts
+            for s in order:
+                if self.bets[s] >= self.current_bet:
+                    self.to_act &= ~(1 << s)
+        if self.to_act:
+            for _ in range(len(order) * 2):
+                if self.action_index >= len(order):
+                    self.action_index = 0
+                seat = order[self.action_index]
+                bit = 1 << seat
+                if self.to_act & bit:
+                    if not self.folded[seat] and self.chips[seat] > 0:
+                        self.current = seat
+                        return
+                    self.to_act &= ~bit
+                self.action_index += 1
+        self.current = None
+        self._next_stage()
+
+    def _next_stage(self):
+        if self.num_in_hand <= 1 or self.stage >= RIVER:
+            self._finish()
+            return
+        self.current_bet = 0
+        self.bets = [0] * len(self.bets)
+        self.stage += 1
+        dealt = 3 if self.stage == FLOP else 1
+        self.board.extend(self.deck[self.deck_pos:self.deck_pos + dealt])
+        self.deck_pos += dealt
+
+        n = len(self.seated)
+        start = (self.dealer + 1) % n
+        self.order = tuple(
+            seat for seat in ((start + i) % n for i in range(n)) if self.seated[seat] and self.chips[seat] > 0
+        )
+        self.to_act = 0
+        for seat in self.order:
+            if not self.folded[seat]:
+                self.to_act |= 1 << seat
+        self.action_index = 0
+        self.last_raise = self.big_blind
+        self._advance()
+
+    def _finish(self):
+        self.current = None
+        self.terminal = True
+        if self.num_in_hand > 1:
+            self.stage = SHOWDOWN
@@ -0,0 +1,146 @@
+"""
+Hand ranges over the 1326 two-card combos.
+
+Ranges are written in the usual shorthand, e.g. "QQ+, AKs, 76s, ATo+, KTs-K8s,
+22-55, AhKh". A token may carry a weight as "AKo:0.5"; later tokens override
+earlier ones. Combos are stored by their index into COMBOS.
+"""
+from functools import lru_cache
+from itertools import combinations
+
+from .evaluator import card_index
+
+RANK_CHARS = "23456789TJQKA"
+SUIT_CHARS = "shdc"
+
+COMBOS = list(combinations(range(52), 2))
+COMBO_INDEX = {combo: i for i, combo in enumerate(COMBOS)}
+NUM_COMBOS = len(COMBOS)
+
+
+def combo_index(card1, card2):
+    """Index of the combo made of two cards (Cards, strings or card indexes)"""
+    a, b = card_index(card1), card_index(card2)
+    if a == b:
+        raise ValueError("A combo needs two different cards")
+    return COMBO_INDEX[(a, b) if a < b else (b, a)]
+
+
+def _rank(char):
+    r = RANK_CHARS.find(char.upper()) if char else -1
+    if r < 0:
+        raise ValueError(f"Invalid rank in range: {char!r}")
+    return r
+
+
+def _class_combos(high, low, kind):
+    """Combo indexes of a hand class such as AA, AKs, AKo or AK"""
+    result = []
+    for s1 in range(4):
+        for s2 in range(4):
+            if high == low and s2 <= s1:
+                continue
+            if kind == "s" and s1 != s2:
+                continue
+            if kind == "o" and s1 == s2:
+                continue
+            result.append(COMBO_INDEX[tuple(sorted((high * 4 + s1, low * 4 + s2)))])
+    return result
+
+
+def _parse_class(text):
+    """Split 'AKs' / 'QQ' / 'T9' into (high, low, kind)"""
+    if len(text) not in (2, 3):
+        raise ValueError(f"Invalid hand in range: {text!r}")
+    high, low = _rank(text[0]), _rank(text[1])
+    kind = text[2].lower() if len(text) == 3 else ""
+    if kind not in ("", "s", "o"):
+        raise ValueError(f"Invalid hand in range: {text!r}")
+    if high < low:
+        high, low = low, high
+    if high == low and kind:
+        raise ValueError(f"Pairs cannot be suited or offsuit: {text!r}")
+    return high, low, kind
+
+
+def _token_combos(token):
+    if token.lower() in ("random", "any", "*", "100%"):
+        return list(range(NUM_COMBOS))
+
+    # Specific combo such as AhKh
+    if len(token) == 4 and token[1].lower() in SUIT_CHARS and token[3].lower() in SUIT_CHARS:
+        return [combo_index(token[:2], token[2:])]
+
+    if "-" in token:
+        start, end = token.split("-", 1)
+        h1, l1, k1 = _parse_class(start)
+        h2, l2, k2 = _parse_class(end)
+        if k1 != k2:
+            raise ValueError(f"Mismatched suitedness in range: {token!r}")
+        result = []
+        if h1 == l1 and h2 == l2:
+            for r in range(min(h1, h2), max(h1, h2) + 1):
+                result += _class_combos(r, r, "")
+        elif h1 == h2:
+            for r in range(min(l1, l2), max(l1, l2) + 1):
+                result += _class_combos(h1, r, k1)
+        else:
+            raise ValueError(f"Invalid span in range: {token!r}")
+        return result
+
+    plus = token.endswith("+")
+    high, low, kind = _parse_class(token.rstrip("+"))
+    if not plus:
+        return _class_combos(high, low, kind)
+
+    result = []
+    if high == low:
+        for r in range(high, 13):
+            result += _class_combos(r, r, "")
+    else:
+        for r in range(low, high):
+            result += _class_combos(high, r, kind)
+    return result
+
+
+@lru_cache(maxsize=1024)
+def _parse(text):
+    weights = {}
+    for raw in text.replace(";", ",").split(","):
+        token = raw.strip().replace(" ", "")
+        if not token:
+            continue
+        weight = 1.0
+        if ":" in token:
+            token, w = token.split(":", 1)
+            try:
+                weight = float(w)
+            except ValueError:
+                raise ValueError(f"Invalid weight in range: {raw.strip()!r}")
+        for idx in _token_combos(token):
+            weights[idx] = weight
+    return tuple((idx, w) for idx, w in weights.items() if w > 0)
+
+
+def parse_range(text):
+    """Parse range notation into a dict of combo index -> weight"""
+    return dict(_parse(text))
+
+
+def to_weights(spec):
+    """
+    Normalise any range spec into a dict of combo index -> weight.
+
+    Accepts range notation, a list of two cards (a single known hand), a
+    dict of combo index -> weight, or a sequence of 1326 weights.
+    """
+    if isinstance(spec, str):
+        return parse_range(spec)
+    if isinstance(spec, dict):
+        return {idx: w for idx, w in spec.items() if w > 0}
+    spec = list(spec)
+    if len(spec) == 2:
+        return {combo_index(spec[0], spec[1]): 1.0}
+    if len(spec) == NUM_COMBOS:
+        return {idx: w for idx, w in enumerate(spec) if w > 0}
+    raise ValueError("A range must be notation, a two-card hand or 1326 weights")
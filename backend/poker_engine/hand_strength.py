@@ -0,0 +1,253 @@
+"""
+Effective hand strength (EHS) of a hand on a board, after Billings et al.
+
+    HS    share of opponent holdings the hand is ahead of right now (ties half)
+    PPOT  chance that a hand which is behind now ends up ahead by the river
+    NPOT  chance that a hand which is ahead now ends up behind by the river
+    EHS   HS * (1 - NPOT) + (1 - HS) * PPOT
+
+HS is enumerated exactly against every live two-card combo. Those combos
+are scored once per canonical board, with a single evaluate_batch call, and
+shared by every hand on that board. The potentials are estimated from a
+sample of runouts (rivers on the turn, turn/river pairs on the flop), each
+scored against a sample of the opponent combos. Sampling is seeded from the
+cards, so a spot always gets the same answer. Results are memoized per
+canonical (hand, board), so suit-isomorphic spots share an entry.
+
+The ~1 ms per call budget assumes the evaluator's lookup tables
+(python -m poker_engine.eval_tables build). With them, the first hand on a
+flop takes about 2 ms and later hands on that board about 1 ms. With the
+pure-Python evaluator those are about 6-7 ms and 2 ms. Repeated spots cost
+tens of microseconds either way.
+
+Preflop there is no board to be ahead on: every field is the hand's all-in
+equity against one random hand, read from a table of the 169 starting-hand
+classes. The table is built once by
+
+    python -m poker_engine.hand_strength build [--samples N]
+
+and missing classes are estimated on first use when it hasn't been built.
+"""
+import argparse
+import json
+import os
+import random
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import NamedTuple
+
+from .canonical import canonicalize
+from .card import Deck
+from .evaluator import card_indices, evaluate_batch
+from .hand_range import COMBO_INDEX, COMBOS, NUM_COMBOS, RANK_CHARS
+
+FLOP_RUNOUTS = 24           # turn/river pairs sampled for flop potentials
+TURN_RUNOUTS = 24           # rivers sampled for turn potentials
+OPPONENTS_PER_RUNOUT = 12   # opponent combos scored against each runout
+PREFLOP_SAMPLES = 1000      # per class when the preflop table hasn't been built
+BUILD_SAMPLES = 20000
+
+AHEAD, TIED, BEHIND = 0, 1, 2
+
+DEFAULT_PREFLOP_PATH = os.environ.get(
+    "PREFLOP_STRENGTH_PATH", os.path.join(os.path.dirname(__file__), "data", "preflop_strength.json")
+)
+
+
+class HandStrength(NamedTuple):
+    hs: float
+    ppot: float
+    npot: float
+    ehs: float
+
+
+def hand_strength(hand, board=()):
+    """HandStrength of two hole cards (Cards, strings or indexes) on a 0-5 card board"""
+    hand = tuple(sorted(card_indices(hand)))
+    board = tuple(sorted(card_indices(board)))
+    if len(hand) != 2:
+        raise ValueError("Hand strength needs exactly two hole cards")
+    if len(board) > 5 or len(board) in (1, 2):
+        raise ValueError("The board has 0, 3, 4 or 5 cards")
+    if len(set(hand + board)) != len(hand) + len(board):
+        raise ValueError("Duplicate hand or board cards")
+    if not board:
+        equity = preflop_equity(hand)
+        return HandStrength(equity, 0.0, 0.0, equity)
+    # Suit-isomorphic spots share one cache entry
+    return _postflop_strength(*canonicalize(hand, board))
+
+
+def effective_strength(hand, board=(), opponents=1):
+    """EHS against several opponents: the hand has to beat each of them (EHS ** n)"""
+    return hand_strength(hand, board).ehs ** max(1, opponents)
+
+
+# --- Postflop ---
+
+@lru_cache(maxsize=256)
+def _board_scores(board):
+    """Score of every combo (COMBOS order), the live combo indexes and their sorted scores"""
+    blocked = set(board)
+    live = [i for i, (a, b) in enumerate(COMBOS) if a not in blocked and b not in blocked]
+    scores = [0] * NUM_COMBOS
+    for i, score in zip(live, evaluate_batch([COMBOS[i] for i in live], board)):
+        scores[i] = score
+    return scores, live, sorted(scores[i] for i in live)
+
+
+@lru_cache(maxsize=4096)
+def _postflop_strength(hand, board):
+    on_board = set(board)
+    # Every hand on a (canonical) board shares one evaluation of all the combos;
+    # the live combos that hold one of our cards are taken back out of the counts
+    board_scores, live, ordered = _board_scores(board)
+    ours = board_scores[COMBO_INDEX[hand]]
+    ahead = bisect_left(ordered, ours)
+    tied = bisect_right(ordered, ours) - ahead
+    ours_blocked = {COMBO_INDEX[(min(c, x), max(c, x))] for c in hand for x in range(52) if x != c and x not in on_board}
+    for i in ours_blocked:
+        score = board_scores[i]
+        ahead -= score < ours
+        tied -= score == ours
+    live = [i for i in live if i not in ours_blocked]
+    opponents = [COMBOS[i] for i in live]
+    scores = [board_scores[i] for i in live]
+    hs = (ahead + tied / 2) / len(opponents)
+
+    if len(board) == 5:
+        return HandStrength(hs, 0.0, 0.0, hs)
+
+    ppot, npot = _potentials(hand, board, ours, opponents, scores, on_board | set(hand))
+    return HandStrength(hs, ppot, npot, hs * (1 - npot) + (1 - hs) * ppot)
+
+
+def _relation(ours, theirs):
+    return AHEAD if ours > theirs else TIED if ours == theirs else BEHIND
+
+
+def _potentials(hand, board, ours_now, opponents, scores_now, dead):
+    rng = random.Random(_seed(hand + board))
+    live = [c for c in range(52) if c not in dead]
+    if len(board) == 4:
+        runouts = [(c,) for c in rng.sample(live, TURN_RUNOUTS)]
+    else:
+        runouts = [tuple(rng.sample(live, 2)) for _ in range(FLOP_RUNOUTS)]
+
+    # transitions[now][final]
+    transitions = [[0, 0, 0] for _ in range(3)]
+    count = len(opponents)
+    for runout in runouts:
+        picked = []
+        while len(picked) < OPPONENTS_PER_RUNOUT:
+            i = rng.randrange(count)
+            a, b = opponents[i]
+            if a not in runout and b not in runout:
+                picked.append(i)
+        scores = evaluate_batch([hand] + [opponents[i] for i in picked], board + runout)
+        ours = scores[0]
+        for i, theirs in zip(picked, scores[1:]):
+            transitions[_relation(ours_now, scores_now[i])][_relation(ours, theirs)] += 1
+
+    behind, tied, ahead = transitions[BEHIND], transitions[TIED], transitions[AHEAD]
+    ppot_den = sum(behind) + sum(tied) / 2
+    npot_den = sum(ahead) + sum(tied) / 2
+    ppot = (behind[AHEAD] + behind[TIED] / 2 + tied[AHEAD] / 2) / ppot_den if ppot_den else 0.0
+    npot = (ahead[BEHIND] + ahead[TIED] / 2 + tied[BEHIND] / 2) / npot_den if npot_den else 0.0
+    return ppot, npot
+
+
+def _seed(cards):
+    seed = 0
+    for c in cards:
+        seed = seed * 52 + c
+    return seed
+
+
+# --- Preflop ---
+
+def starting_hand_class(hand):
+    """Starting-hand class of two card indexes, e.g. 'AKs', 'T9o' or 'QQ'"""
+    a, b = sorted(hand, reverse=True)
+    high, low = RANK_CHARS[a >> 2], RANK_CHARS[b >> 2]
+    if high == low:
+        return high + low
+    return high + low + ("s" if a & 3 == b & 3 else "o")
+
+
+def preflop_equity(hand):
+    """All-in equity of two hole cards against one random hand"""
+    key = starting_hand_class(card_indices(hand))
+    table = _preflop_table()
+    if key not in table:
+        table[key] = _sample_preflop(key, PREFLOP_SAMPLES)
+    return table[key]
+
+
+@lru_cache(maxsize=1)
+def _preflop_table():
+    if not os.path.exists(DEFAULT_PREFLOP_PATH):
+        return {}
+    try:
+        with open(DEFAULT_PREFLOP_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[EVAL] Ignoring preflop strength table at {DEFAULT_PREFLOP_PATH}: {e}")
+        return {}
+
+
+def _class_hand(key):
+    high, low = RANK_CHARS.index(key[0]), RANK_CHARS.index(key[1])
+    return (high * 4, low * 4 + (0 if key.endswith("s") else 1))
+
+
+def _sample_preflop(key, samples):
+    hand = list(_class_hand(key))
+    deck = Deck(shuffle=False, cards=range(52))
+    deck.exclude(hand)
+    live_start = deck.position
+    total = 0.0
+    for _ in range(samples):
+        deck.rewind(live_start)
+        cards = deck.draw(7)
+        ours, theirs = evaluate_batch([hand, cards[:2]], cards[2:])
+        total += 1.0 if ours > theirs else 0.5 if ours == theirs else 0.0
+    return total / samples
+
+
+def _classes():
+    for i, high in enumerate(reversed(RANK_CHARS)):
+        for low in reversed(RANK_CHARS[:13 - i]):
+            if high == low:
+                yield high + low
+            else:
+                yield high + low + "s"
+                yield high + low + "o"
+
+
+def build_preflop_table(path=DEFAULT_PREFLOP_PATH, samples=BUILD_SAMPLES):
+    # Deck.draw shuffles with the global random module
+    random.seed(0)
+    table = {key: round(_sample_preflop(key, samples), 4) for key in _classes()}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(table, f, indent=0, sort_keys=True)
+    os.replace(tmp_path, path)
+    _preflop_table.cache_clear()
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the preflop hand strength table")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--samples", type=int, default=BUILD_SAMPLES)
+    parser.add_argument("--out", default=DEFAULT_PREFLOP_PATH)
+    args = parser.parse_args()
+
+    table = build_preflop_table(args.out, args.samples)
+    print(f"[EVAL] Built {args.out} ({len(table)} classes, {args.samples} samples each)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 import random
-from poker_engine.utils import eval_hand
+from poker_engine.board_texture import bluff_scale
+from poker_engine.hand_strength import effective_strength
 
 
 class HeuristicAI:
     """
-    A smarter poker AI that makes decisions based on hand strength and simple risk logic.
+    A smarter poker AI that makes decisions based on effective hand strength
+    (see hand_strength) and simple risk logic.
     It uses deterministic rules + random bluffing to appear human-like.
     """
 
@@ -41,25 +43,12 @@ class HeuristicAI:
         pot = state.get("pot", 0)
         to_call = state.get("to_call", 0)
 
-        # Evaluate hand strength using your existing eval_hand() util
+        # Effective hand strength against the opponents still in the hand
+        opponents = sum(1 for p in players if not p.get("folded", False) and p["name"] != self.name)
         try:
-            rank, _ = eval_hand(hand + community)
-        except Exception:
-            rank = None
-
-        # Handle preflop or invalid rank
-        if rank is None:
-            if hand: 
-                high_card_values = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6,
-                                    "7": 7, "8": 8, "9": 9, "10": 10,
-                                    "J": 11, "Q": 12, "K": 13, "A": 14}
-                values = [high_card_values.get(c[:-1], 0) for c in hand]  # c like 'AH' or '10S'
-                avg_val = sum(values) / len(values)
-                rank = max(1, int(avg_val / 1.5)) 
-            else:
-                rank = 5  
-        normalized_rank = min(rank / 10.0, 1.0)
-
+            strength = effective_strength(hand, community, max(1, opponents))
+        except ValueError:
+            strength = 0.5
 
         # Calculate pot odds
         pot_odds = to_call / (pot + to_call) if (pot + to_call) > 0 else 0
@@ -67,7 +56,7 @@ class HeuristicAI:
         # --- Decision Logic ---
 
         # Strong hands → raise aggressively
-        if normalized_rank >= 0.8:
+        if strength >= 0.8:
             if "raise" in actions:
                 raise_amt = random.choice([50, 100, 200])
                 return {"move": "raise", "raise_amount": raise_amt}
@@ -75,7 +64,7 @@ class HeuristicAI:
                 return {"move": "call", "raise_amount": 0}
 
         # Decent hands → call/check depending on stage
-        elif normalized_rank >= 0.4:
+        elif strength >= 0.4:
             if "call" in actions and pot_odds < 0.6:
                 return {"move": "call", "raise_amount": 0}
             elif "check" in actions:
@@ -85,7 +74,7 @@ class HeuristicAI:
 
         # Weak hands → fold most of the time, sometimes bluff
         else:
-            bluff_chance = {"easy": 0.05, "medium": 0.15, "hard": 0.25}[self.difficulty]
+            bluff_chance = {"easy": 0.05, "medium": 0.15, "hard": 0.25}[self.difficulty] * bluff_scale(community)
             if "raise" in actions and random.random() < bluff_chance:
                 raise_amt = random.choice([20, 30, 40])
                 return {"move": "raise", "raise_amount": raise_amt}
@@ -0,0 +1,130 @@
+"""
+Live per-player HUD statistics.
+
+HudStats is a PokerGame listener shared by every table, attached to each
+with its table id (see listener()). Stats are kept per (table, player name),
+so players with the same name at different tables, such as the default bot
+names, never share counters. A player's stats are dropped at the first hand
+after they leave the table, and a table's with forget(). Each event updates
+a handful of counters for the acting player, so the cost per action is O(1)
+and the state per player is fixed: VPIP, PFR, aggression factor and showdown
+win % are ratios of those counters. Per-hand flags (has this player already
+counted towards VPIP this hand?) live in a small record per table that goes
+away with the table.
+
+Reads return a cached dict per player that is rebuilt only after the
+player's counters change.
+"""
+import weakref
+from functools import partial
+
+
+class PlayerStats:
+    __slots__ = ("hands", "vpip", "pfr", "aggressive", "calls", "showdowns", "showdown_wins", "_view")
+
+    def __init__(self):
+        self.hands = 0
+        self.vpip = 0
+        self.pfr = 0
+        self.aggressive = 0  # bets and raises
+        self.calls = 0
+        self.showdowns = 0
+        self.showdown_wins = 0
+        self._view = None
+
+    def as_dict(self):
+        if self._view is None:
+            hands = self.hands or 1
+            self._view = {
+                "hands": self.hands,
+                "vpip": self.vpip / hands,
+                "pfr": self.pfr / hands,
+                "aggression_factor": self.aggressive / self.calls if self.calls else None,
+                "showdown_win": self.showdown_wins / self.showdowns if self.showdowns else None,
+            }
+        return self._view
+
+
+class _HandFlags:
+    __slots__ = ("dealt", "vpip", "pfr")
+
+    def __init__(self, dealt):
+        self.dealt = set(dealt)
+        self.vpip = set()
+        self.pfr = set()
+
+
+class HudStats:
+    def __init__(self):
+        self.tables = {}  # table id -> {name: PlayerStats}
+        self._hands = weakref.WeakKeyDictionary()  # game -> _HandFlags
+
+    def listener(self, table_id):
+        """PokerGame listener for one table"""
+        return partial(self.observe, table_id)
+
+    def forget(self, table_id):
+        self.tables.pop(table_id, None)
+
+    def observe(self, table_id, game, event):
+        players = self.tables.setdefault(table_id, {})
+
+        def get(name):
+            stats = players.get(name)
+            if stats is None:
+                stats = players[name] = PlayerStats()
+            return stats
+
+        if event["type"] == "new_hand":
+            # Players who left the table since the last hand take their stats with them
+            seated = {p.name for p in game.players if p.name}
+            for name in [name for name in players if name not in seated]:
+                del players[name]
+            self._hands[game] = _HandFlags(event["players"])
+            for name in event["players"]:
+                stats = get(name)
+                stats.hands += 1
+                stats._view = None
+            return
+
+        flags = self._hands.get(game)
+        if flags is None:
+            return  # the hand started before this listener was attached
+
+        if event["type"] == "action":
+            name = event["name"]
+            action = event["action"]
+            stats = get(name)
+            if action == "raise":
+                stats.aggressive += 1
+            elif action == "call":
+                stats.calls += 1
+            else:
+                return
+            if event["stage"] == "preflop":
+                if name not in flags.vpip:
+                    flags.vpip.add(name)
+                    stats.vpip += 1
+                if action == "raise" and name not in flags.pfr:
+                    flags.pfr.add(name)
+                    stats.pfr += 1
+            stats._view = None
+
+        elif event["type"] == "hand_over":
+            if game.num_in_hand > 1:
+                for p in game.players:
+                    if p.name in flags.dealt and not p.folded:
+                        stats = get(p.name)
+                        stats.showdowns += 1
+                        stats.showdown_wins += p.name == event["winner"]
+                        stats._view = None
+            del self._hands[game]
+
+    def get(self, table_id, name):
+        stats = self.tables.get(table_id, {}).get(name)
+        return stats.as_dict() if stats else None
+
+    def snapshot(self, table_id, names):
+        """Stats at a table for the given players (e.g. everyone seated there)"""
+        players = self.tables.get(table_id, {})
+        return {name: players[name].as_dict() for name in names if name in players}
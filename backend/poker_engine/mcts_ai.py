@@ -0,0 +1,301 @@
+"""
+Monte Carlo Tree Search bot.
+
+MCTSBot searches the betting tree from the current decision with
+information-set MCTS (single observer): every iteration deals the hidden
+cards one way (a determinization), opponents' hands weighted by their
+tracked ranges when the state carries them, then walks the tree with UCB1,
+adds one node and plays the hand out with a cheap rollout policy on a
+GameState. Tree nodes are keyed by betting actions only, so one tree
+averages over every deal and board runout. Each node keeps the result of
+the player who chose it, so opponents pick their own best replies.
+Results are in units of the deepest stack in the hand, the most anyone
+can win or lose, so rewards stay within [-1, 1] however big the pot gets
+and EXPLORATION is tuned to that range.
+
+The rollout policy plays each seat's own cards: a rough strength (a
+formula for starting hands, the made-hand category after the flop, less
+when the board makes it for everyone) decides whether it bets, and
+whether it calls a bet at the price offered. It is a few microseconds a
+decision, where hand_strength would cost a millisecond.
+
+Moves are check/call, fold and raises of half pot, pot and all-in. The
+search runs until the time budget is spent, and the most visited move is
+played. The tree is kept for the rest of the hand: the next decision walks
+it along the actions taken since (raises map to the nearest size) and
+carries on from there. Trees live in the process that built them, so
+reuse only happens when the same worker gets the bot's next decision.
+"""
+import math
+import random
+import time
+from collections import Counter, OrderedDict
+from itertools import accumulate
+
+from poker_engine.evaluator import (
+    FLUSH, FOUR_OF_A_KIND, FULL_HOUSE, HIGH_CARD, ONE_PAIR, STRAIGHT, STRAIGHT_FLUSH, THREE_OF_A_KIND,
+    TWO_PAIR, card_indices, evaluate,
+)
+from poker_engine.game_state import GameState
+from poker_engine.hand_range import COMBOS, NUM_COMBOS
+
+TIME_BUDGETS = {"easy": 0.1, "medium": 0.25, "hard": 0.5}  # seconds per decision
+EXPLORATION = 1.0  # UCB1 constant for rewards in [-1, 1]
+MAX_TREES = 64
+
+_trees = OrderedDict()  # (name, hand number, hand) -> (root node, actions seen)
+
+
+class Node:
+    __slots__ = ("children", "visits", "value")
+
+    def __init__(self):
+        self.children = {}  # (move, amount) -> Node
+        self.visits = 0
+        self.value = 0.0    # summed reward of the player who chose this node
+
+
+def candidate_actions(gs):
+    """Moves searched for the player to act: check or call/fold, then raises"""
+    to_call = gs.to_call()
+    actions = [("check", 0)] if to_call == 0 else [("call", 0), ("fold", 0)]
+    low, high = gs.raise_bounds()
+    if high > 0:
+        pot = gs.pot + to_call
+        sizes = {min(max(size, low), high) for size in (pot // 2, pot, high)}
+        actions.extend(("raise", size) for size in sorted(sizes))
+    return actions
+
+
+# Rollout strength of a made hand, by evaluator category
+MADE_STRENGTH = {
+    HIGH_CARD: 0.15, ONE_PAIR: 0.5, TWO_PAIR: 0.7, THREE_OF_A_KIND: 0.8, STRAIGHT: 0.85, FLUSH: 0.88,
+    FULL_HOUSE: 0.95, FOUR_OF_A_KIND: 0.98, STRAIGHT_FLUSH: 1.0,
+}
+
+
+def _board_category(board):
+    """Category the board cards make on their own (pairs and better only)"""
+    counts = sorted(Counter(c >> 2 for c in board).values(), reverse=True) + [0]
+    if counts[0] == 4:
+        return FOUR_OF_A_KIND
+    if counts[0] == 3:
+        return FULL_HOUSE if counts[1] >= 2 else THREE_OF_A_KIND
+    if counts[0] == 2:
+        return TWO_PAIR if counts[1] == 2 else ONE_PAIR
+    return HIGH_CARD
+
+
+def rollout_strength(hand, board):
+    """Rough 0-1 strength of a hand for the rollout policy"""
+    high, low = sorted((hand[0] >> 2, hand[1] >> 2), reverse=True)
+    if not board:
+        if high == low:
+            return 0.5 + 0.028 * high
+        return 0.28 + 0.015 * (high + low) + (0.02 if hand[0] & 3 == hand[1] & 3 else 0)
+    category = evaluate(list(hand) + board) >> 20
+    if category > _board_category(board):
+        return MADE_STRENGTH[category]
+    return 0.1 + 0.01 * high  # nothing beyond what the board gives everyone
+
+
+def rollout(gs, rng):
+    """Play a hand out: strong hands bet half pot, and bets are called when the hand is worth the price"""
+    strengths = {}  # seat -> (board size, strength)
+    while not gs.terminal:
+        seat = gs.current
+        cached = strengths.get(seat)
+        if cached is None or cached[0] != len(gs.board):
+            cached = strengths[seat] = (len(gs.board), rollout_strength(gs.hands[seat], gs.board))
+        strength = cached[1] + rng.uniform(-0.1, 0.1)
+        to_call = gs.to_call()
+        if to_call == 0:
+            low, high = gs.raise_bounds()
+            if high > 0 and strength > 0.65:
+                gs.apply("raise", min(max(gs.pot // 2, low), high))
+            else:
+                gs.apply("check")
+        elif strength < to_call / (gs.pot + to_call) + 0.1:
+            gs.apply("fold")
+        else:
+            gs.apply("call")
+
+
+class MCTSBot:
+    def __init__(self, name="Bot", difficulty="medium", time_budget=None, iterations=None):
+        self.name = name
+        self.difficulty = difficulty
+        self.time_budget = TIME_BUDGETS[difficulty] if time_budget is None else time_budget
+        self.iterations = iterations  # optional cap, on top of the time budget
+        self.is_bot = True
+        # Each decision is a search of its own; see DecisionBatcher
+        self.batchable = False
+
+    def _fallback(self, actions):
+        move = "check" if "check" in actions else "call" if "call" in actions else "fold"
+        return {"move": move, "raise_amount": 0}
+
+    def decide(self, state: dict) -> dict:
+        actions = state.get("legal_actions", [])
+        if not actions:
+            return {"move": "check", "raise_amount": 0}
+
+        players = state.get("players", [])
+        seat = next((i for i, p in enumerate(players) if p["name"] == self.name), None)
+        if seat is None:
+            print(f"[AI DEBUG] {self.name} not found in players!")
+            return {"move": "fold", "raise_amount": 0}
+        hand = card_indices(players[seat].get("hand", []))
+        if len(hand) != 2:
+            print(f"[AI DEBUG] {self.name} has empty hand!")
+            return self._fallback(actions)
+
+        try:
+            root_state = GameState.from_state(state)
+        except ValueError:
+            return self._fallback(actions)
+        if root_state.current != seat:
+            return self._fallback(actions)
+        # Search only on what the bot may know
+        hidden = [s for s in range(len(players)) if s != seat and root_state.seated[s] and not root_state.folded[s]]
+        for s in hidden:
+            root_state.hands[s] = None
+
+        root = self._reuse_tree(state, tuple(sorted(hand)))
+        weights = self._opponent_weights(state, hidden)
+        iterations = self._search(root, root_state, seat, hidden, weights)
+
+        choices = [(a, root.children[a]) for a in candidate_actions(root_state) if a in root.children]
+        if not choices:
+            return self._fallback(actions)
+        (move, amount), node = max(choices, key=lambda item: item[1].visits)
+        print(
+            f"[AI DEBUG] {self.name} MCTS: {iterations} iterations, {move} {amount or ''}"
+            f" ({node.visits} visits, {node.value / max(1, node.visits):+.3f} stacks)"
+        )
+        if move == "raise":
+            amount = min(max(amount, state.get("min_raise", amount)), state.get("max_raise", amount))
+        if move not in actions:
+            return self._fallback(actions)
+        return {"move": move, "raise_amount": amount}
+
+    # --- Search ---
+
+    def _search(self, root, root_state, seat, hidden, weights):
+        rng = random.Random()
+        start_chips = root_state.chips[:]
+        # The deepest stack in the hand bounds what any seat can win or lose
+        scale = max(
+            root_state.chips[s] + root_state.invested[s]
+            for s in range(len(start_chips)) if root_state.seated[s] and not root_state.folded[s]
+        )
+        dead = set(root_state.hands[seat]) | set(root_state.board)
+        live_cards = [c for c in range(52) if c not in dead]
+        deadline = time.perf_counter() + self.time_budget
+
+        iterations = 0
+        while time.perf_counter() < deadline and (self.iterations is None or iterations < self.iterations):
+            iterations += 1
+            gs = root_state.clone()
+            self._determinize(gs, hidden, weights, live_cards, rng)
+
+            node = root
+            path = []  # (node, seat that chose it)
+            while not gs.terminal:
+                actor = gs.current
+                actions = candidate_actions(gs)
+                untried = [a for a in actions if a not in node.children]
+                if untried:
+                    action = rng.choice(untried)
+                    child = node.children[action] = Node()
+                    gs.apply(*action)
+                    path.append((child, actor))
+                    break
+                node, action = self._select(node, actions)
+                gs.apply(*action)
+                path.append((node, actor))
+
+            rollout(gs, rng)
+            payoffs = gs.payoffs()
+            root.visits += 1
+            for visited, actor in path:
+                visited.visits += 1
+                visited.value += (payoffs[actor] - start_chips[actor]) / scale
+        return iterations
+
+    def _select(self, node, actions):
+        log_visits = math.log(max(1, node.visits))
+        best, best_score = None, -math.inf
+        for action in actions:
+            child = node.children[action]
+            score = child.value / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best, best_score = (child, action), score
+        return best
+
+    def _determinize(self, gs, hidden, weights, live_cards, rng):
+        """Deal every hidden hand (from its range when known) and shuffle the rest into the deck"""
+        live = set(live_cards)
+        used = set()
+        for s in hidden:
+            combo = None
+            cum_weights = weights.get(s)
+            if cum_weights is not None:
+                for _ in range(20):
+                    a, b = rng.choices(COMBOS, cum_weights=cum_weights)[0]
+                    if a in live and b in live and a not in used and b not in used:
+                        combo = (a, b)
+                        break
+            if combo is None:
+                free = [c for c in live_cards if c not in used]
+                combo = tuple(rng.sample(free, 2))
+            used.update(combo)
+            gs.hands[s] = combo
+        deck = [c for c in live_cards if c not in used]
+        rng.shuffle(deck)
+        gs.deck = deck
+        gs.deck_pos = 0
+
+    def _opponent_weights(self, state, hidden):
+        """Cumulative range weights per hidden seat; ranges come in seat order (see RangeTracker)"""
+        ranges = state.get("opponent_ranges") or []
+        if len(ranges) != len(hidden):
+            return {}
+        weights = {}
+        for s, weights_of in zip(hidden, ranges):
+            if weights_of is not None and len(weights_of) == NUM_COMBOS and sum(weights_of) > 0:
+                weights[s] = list(accumulate(weights_of))
+        return weights
+
+    # --- Tree reuse ---
+
+    def _reuse_tree(self, state, hand):
+        """The subtree reached by this hand's actions since the last search, or a new root"""
+        history = state.get("action_history", [])
+        key = (self.name, state.get("hand_number"), hand)
+        cached = _trees.pop(key, None)
+        root = None
+        if cached is not None:
+            root, seen = cached
+            if seen > len(history):
+                root = None
+            for entry in history[seen:] if root is not None else ():
+                root = _follow(root, entry)
+                if root is None:
+                    break
+        if root is None:
+            root = Node()
+        _trees[key] = (root, len(history))
+        while len(_trees) > MAX_TREES:
+            _trees.popitem(last=False)
+        return root
+
+
+def _follow(node, entry):
+    """Child of node for a real action, mapping a raise onto the nearest searched size"""
+    if entry["action"] != "raise":
+        return node.children.get((entry["action"], 0))
+    raises = [a for a in node.children if a[0] == "raise"]
+    if not raises:
+        return None
+    return node.children[min(raises, key=lambda a: abs(a[1] - entry["amount"]))]
@@ -1,6 +1,72 @@
 import random
-from poker_engine.utils import eval_hand
-from poker_engine.card import Deck, Card
+from poker_engine.board_texture import bluff_scale
+from poker_engine.card import Deck
+from poker_engine.equity import hand_equities, hand_equity
+from poker_engine.evaluator import card_indices, evaluate_batch
+
+
+def estimate_win_rates(jobs):
+    """
+    Win rate against random hands for many (hand, community, opponents, simulations)
+    jobs in one pass. Every simulated showdown is scored with one evaluate_batch call.
+    """
+    deck = Deck(shuffle=False, cards=range(52))
+    results = []
+    for hand, community, opponents, simulations in jobs:
+        hand = card_indices(hand)
+        community = card_indices(community)
+        deck.rewind(0)
+        deck.exclude(hand + community)
+        live_start = deck.position
+        if len(deck) < 5:
+            results.append(0.5)
+            continue
+
+        cards_needed = 5 - len(community)
+        wins = 0
+        for _ in range(simulations):
+            deck.rewind(live_start)
+            board = community + deck.draw(cards_needed) if cards_needed > 0 else community
+            hands = [hand]
+            for _ in range(opponents):
+                if len(deck) >= 2:
+                    hands.append(deck.draw(2))
+            scores = evaluate_batch(hands, board)
+            if scores[0] >= max(scores):
+                wins += 1
+        results.append(wins / simulations)
+    return results
+
+
+def decide_many(requests):
+    """
+    Decisions for many (MonteCarloAI, state) pairs. Range equities share one
+    hand_equities pass and win rates against random hands one
+    estimate_win_rates pass.
+    """
+    equities = [None] * len(requests)
+    range_jobs = []
+    random_jobs = []
+    for i, (ai, state) in enumerate(requests):
+        job = ai.equity_job(state)
+        if job is None:
+            continue
+        if job[0] == "range":
+            range_jobs.append((i, job[1:] + (ai.simulations,)))
+        else:
+            random_jobs.append((i, job[1:] + (ai.simulations,)))
+
+    for (i, job), equity in zip(range_jobs, hand_equities([job for _, job in range_jobs])):
+        if isinstance(equity, ValueError):
+            print(f"[AI DEBUG] Range equity failed ({equity}), falling back to random hands")
+            hand, community, opponent_ranges, simulations = job
+            random_jobs.append((i, (hand, community, max(1, len(opponent_ranges)), simulations)))
+        else:
+            equities[i] = equity
+
+    for (i, _), win_prob in zip(random_jobs, estimate_win_rates([job for _, job in random_jobs])):
+        equities[i] = win_prob
+    return [ai.choose(state, equity) for (ai, state), equity in zip(requests, equities)]
 
 class MonteCarloAI:
     def __init__(self, name="Bot", difficulty="medium", simulations=300):
@@ -15,58 +81,53 @@ class MonteCarloAI:
             print(f"[AI DEBUG] {self.name} has empty hand!")
             return 0.0
         
-        # Parse string cards to Card objects if needed
-        if isinstance(hand[0], str):
-            hand = [self._parse_card(c) for c in hand]
-        if community and len(community) > 0 and isinstance(community[0], str):
-            community = [self._parse_card(c) for c in community]
-        
-        deck = Deck()
-        used_cards = set(hand + community)
-        deck.cards = [c for c in deck.cards if c not in used_cards]
-        
-        if len(deck.cards) < 5:
-            print(f"[AI DEBUG] Not enough cards in deck: {len(deck.cards)}")
-            return 0.5
-        
-        wins = 0
-        for _ in range(self.simulations):
-            sim_deck = Deck()
-            sim_deck.cards = deck.cards.copy()
-            random.shuffle(sim_deck.cards)
-            
-            sim_community = community.copy() if community else []
-            cards_needed = 5 - len(sim_community)
-            if cards_needed > 0:
-                sim_community += sim_deck.deal(cards_needed)
-            
-            opp_hands = []
-            for _ in range(opponents):
-                if len(sim_deck.cards) >= 2:
-                    opp_hands.append(sim_deck.deal(2))
-            
-            our_rank, _ = eval_hand(hand + sim_community)
-            best_opp_rank = None
-            
-            for opp_hand in opp_hands:
-                rank, _ = eval_hand(opp_hand + sim_community)
-                if best_opp_rank is None or rank > best_opp_rank:
-                    best_opp_rank = rank
-            
-            if best_opp_rank is None or our_rank >= best_opp_rank:
-                wins += 1
-                
-        return wins / self.simulations
-    
-    def _parse_card(self, card_str):
-        """Parse card string like '2h' into Card object"""
-        if isinstance(card_str, Card):
-            return card_str
-        rank = card_str[:-1]
-        suit = card_str[-1]
-        return Card(rank, suit)
+        return estimate_win_rates([(hand, community or [], opponents, self.simulations)])[0]
     
+    def rangeEquity(self, hand, community, opponent_ranges):
+        """Equity against the opponents' weighted ranges (see RangeTracker)"""
+        if len(hand) == 0:
+            print(f"[AI DEBUG] {self.name} has empty hand!")
+            return 0.0
+        try:
+            return hand_equity(hand, opponent_ranges, community or [], iterations=self.simulations)
+        except ValueError as e:
+            print(f"[AI DEBUG] Range equity failed ({e}), falling back to random hands")
+            return self.estWin(hand, community, opponents=len(opponent_ranges))
+
+    def equity_job(self, state: dict):
+        """
+        What decide() needs estimated: ("range", hand, community, opponent_ranges),
+        ("random", hand, community, opponents), or None if nothing.
+        """
+        if not state.get("legal_actions"):
+            return None
+        players = state.get("players", [])
+        bot = next((p for p in players if p["name"] == self.name), None)
+        if not bot or not bot.get("hand"):
+            return None
+
+        hand = bot["hand"]
+        community = state.get("community_cards", [])
+        opponent_ranges = state.get("opponent_ranges")
+        if opponent_ranges:
+            return ("range", hand, community, opponent_ranges)
+
+        # Count active opponents
+        active_opponents = sum(1 for p in players if not p.get("folded", False) and p["name"] != self.name)
+        return ("random", hand, community, max(1, active_opponents))
+
     def decide(self, state: dict) -> dict:
+        job = self.equity_job(state)
+        if job is None:
+            win_prob = None
+        elif job[0] == "range":
+            win_prob = self.rangeEquity(*job[1:])
+        else:
+            win_prob = self.estWin(*job[1:])
+        return self.choose(state, win_prob)
+
+    def choose(self, state: dict, win_prob) -> dict:
+        """Pick an action given the estimated win probability"""
         actions = state.get("legal_actions", [])
         if not actions:
             print(f"[AI DEBUG] {self.name} has no legal actions!")
@@ -77,19 +138,15 @@ class MonteCarloAI:
         if not bot:
             print(f"[AI DEBUG] {self.name} not found in players!")
             return {"move": "fold", "raise_amount": 0}
+        if win_prob is None:
+            print(f"[AI DEBUG] {self.name} has empty hand!")
+            win_prob = 0.0
         
-        hand = bot.get("hand", [])
-        community = state.get("community_cards", [])
         pot = state.get("pot", 0)
         to_call = state.get("to_call", 0)
         
-        print(f"[AI DEBUG] {self.name} deciding: hand={hand}, community={community}, to_call={to_call}")
+        print(f"[AI DEBUG] {self.name} deciding: hand={bot.get('hand', [])}, community={state.get('community_cards', [])}, to_call={to_call}")
         print(f"[AI DEBUG] {self.name} legal actions: {actions}")
-        
-        # Count active opponents
-        active_opponents = sum(1 for p in players if not p.get("folded", False) and p["name"] != self.name)
-        
-        win_prob = self.estWin(hand, community, opponents=max(1, active_opponents))
         print(f"[AI DEBUG] {self.name} win probability: {win_prob:.2f}")
         
         # Aggressive play with strong hands
@@ -117,6 +174,7 @@ class MonteCarloAI:
         # Fold or bluff with weak hands
         else:
             bluff_chance = {"easy": 0.05, "medium": 0.1, "hard": 0.2}[self.difficulty]
+            bluff_chance *= bluff_scale(state.get("community_cards", []))
             if "raise" in actions and random.random() < bluff_chance:
                 print(f"[AI DEBUG] {self.name} bluffing!")
                 return {"move": "raise", "raise_amount": 30}
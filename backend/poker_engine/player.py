@@ -5,7 +5,9 @@ class Player:
         self.hand = []
         self.folded = False
         self.current_bet = 0
+        self.total_bet = 0  # chips put in this hand, for side pots
         self.is_bot = False
+        self.time_bank = 30  # extra seconds available once the turn clock runs out
 
     def bet(self, amount):
         
@@ -14,6 +16,7 @@ class Player:
         
         self.chips -= amount
         self.current_bet += amount
+        self.total_bet += amount
         return amount
 
     def reset_for_next_round(self):
@@ -22,6 +25,7 @@ class Player:
 
     def reset_for_new_hand(self):
         self.current_bet = 0
+        self.total_bet = 0
         self.folded = False
         self.hand = []
 
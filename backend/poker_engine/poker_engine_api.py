@@ -1,3 +1,6 @@
+import math
+import time
+
 from .card import Deck
 from .player import Player
 from .utils import eval_hand
@@ -9,6 +12,8 @@ class PokerGame:
         self.community_cards = []
         self.pot = 0
         self.dealer_index = 0
+        self.sb_index = None
+        self.bb_index = None
         self.small_blind = 10
         self.big_blind = 20
         self.current_bet = 0
@@ -21,20 +26,78 @@ class PokerGame:
         self.players_to_act = set()
         self.player_order = []
         self.action_index = 0
+        self.last_raise = 0  # size of the largest raise this betting round
+        self.turn_counter = 0  # bumped every time the action moves to a player
+        self.turn_deadline = None  # set by the server's action clock
+        self.hand_number = 0  # bumped by play_hand
+        self.state_version = 0  # only ever grows; see bump_version
         
         # Lobby state
         self.lobby_timer = 15
+        self.lobby_deadline = None  # time.time() at which the lobby countdown ends
         self.game_starting = False
 
+        # Callbacks notified of hand and action events (e.g. range trackers)
+        self.listeners = []
+        self.hand_actions = []
+
+        # Per-hand counters kept up to date by the actions themselves
+        self.num_in_hand = 0  # dealt in and not folded, including all-in players
+        self.num_all_in = 0
+        self._action_cache = None
+
+    def add_listener(self, callback):
+        """Register callback(game, event) for 'new_hand', 'action' and 'hand_over' events"""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def _emit(self, event):
+        for callback in list(self.listeners):
+            try:
+                callback(self, event)
+            except Exception as e:
+                print(f"Listener error on {event.get('type')}: {e}")
+
+    def __getstate__(self):
+        # Listeners belong to the server process, not to the game snapshot
+        state = self.__dict__.copy()
+        state["listeners"] = []
+        return state
+
+    def _next_seated(self, index):
+        """Next seat after index holding a player with chips"""
+        for step in range(1, len(self.players) + 1):
+            i = (index + step) % len(self.players)
+            if self.players[i].name and self.players[i].chips > 0:
+                return i
+        return index
+
+    @property
+    def num_active(self):
+        """Players still in the hand who can act"""
+        return self.num_in_hand - self.num_all_in
+
+    def _bet(self, player, amount):
+        amount = player.bet(amount)
+        if player.chips == 0:
+            self.num_all_in += 1
+        return amount
+
     def rotate_dealer(self):
-        self.dealer_index = (self.dealer_index + 1) % len(self.players)
+        self.dealer_index = self._next_seated(self.dealer_index)
 
     def post_blinds(self):
-        sb_player = self.players[(self.dealer_index + 1) % len(self.players)]
-        bb_player = self.players[(self.dealer_index + 2) % len(self.players)]
+        self.sb_index = self._next_seated(self.dealer_index)
+        self.bb_index = self._next_seated(self.sb_index)
+        sb_player = self.players[self.sb_index]
+        bb_player = self.players[self.bb_index]
 
-        sb_amount = sb_player.bet(self.small_blind)
-        bb_amount = bb_player.bet(self.big_blind)
+        # Short stacks post what they have and are all-in
+        sb_amount = self._bet(sb_player, min(self.small_blind, sb_player.chips))
+        bb_amount = self._bet(bb_player, min(self.big_blind, bb_player.chips))
 
         self.current_bet = self.big_blind
         self.pot = sb_amount + bb_amount
@@ -58,9 +121,9 @@ class PokerGame:
         
         if self.stage == "preflop":
             if len([p for p in self.players if p.name]) == 2:  # Only count active players
-                start_pos = (self.dealer_index + 1) % len(self.players)
+                start_pos = self.sb_index
             else:
-                start_pos = (self.dealer_index + 3) % len(self.players)
+                start_pos = (self.bb_index + 1) % len(self.players)
         else:
             start_pos = (self.dealer_index + 1) % len(self.players)
     
@@ -77,6 +140,7 @@ class PokerGame:
                 self.player_order.append(idx)
     
         self.action_index = 0
+        self.last_raise = self.big_blind
         print(f"DEBUG: Players to act: {self.players_to_act}, Player order: {self.player_order}")
         self.advance_to_next_player()
 
@@ -84,6 +148,10 @@ class PokerGame:
     def advance_to_next_player(self):
         print(f"DEBUG: Advancing to next player. Players to act: {self.players_to_act}")
 
+        if self.num_active <= 1:
+            # Nobody left to bet against: only a player facing a bet still acts
+            self.players_to_act = {i for i in self.players_to_act if self.players[i].current_bet < self.current_bet}
+
         # If no players to act, advance stage
         if not self.players_to_act:
             print("DEBUG: No players to act, advancing stage")
@@ -118,6 +186,7 @@ class PokerGame:
             
             # Found a player who can act
             self.current_player_index = p_idx
+            self.turn_counter += 1
             print(f"DEBUG: Set current player to {p_idx} ({p.name})")
             return  # This return should be the last statement in the method
 
@@ -128,7 +197,7 @@ class PokerGame:
 
     def advance_stage(self):
         """API addition: Move to next stage automatically"""
-        if sum(1 for p in self.players if not p.folded) <= 1:
+        if self.num_in_hand <= 1:
             self.award_pot_to_remaining_player()
             return
 
@@ -156,33 +225,34 @@ class PokerGame:
         elif self.stage == "river":
             self.showdown()
 
-    def get_legal_actions(self):
-        """API addition: Return legal actions for current player"""
-        # No legal actions during lobby phase
-        if self.stage == "lobby":
-            return []
-            
-        if self.current_player_index is None or self.game_over:
-            return []
-        
-        p = self.players[self.current_player_index]
-        to_call = max(0, self.current_bet - p.current_bet)
-        
-        actions = []
-        if to_call == 0:
-            actions.append("check")
-        else:
-            actions.append("call")
-        
-        actions.append("fold")
-        
-        if to_call < p.chips:
-            actions.append("raise")
-        
-        return actions
-
     def execute_action(self, player_index, action, raise_amount=0):
         """API addition: Execute action without input(), return result"""
+        if player_index == self.current_player_index and not self.game_over and self.stage != "lobby":
+            p = self.players[player_index]
+            event = {
+                "type": "action",
+                "player_index": player_index,
+                "name": p.name,
+                "action": action,
+                "amount": raise_amount if action == "raise" else 0,
+                "to_call": max(0, self.current_bet - p.current_bet),
+                "pot": self.pot,
+                "stage": self.stage,
+                "community_cards": list(self.community_cards),
+            }
+        else:
+            event = None
+
+        result = self._execute_action(player_index, action, raise_amount)
+        if not result.get("success"):
+            return result  # rejected actions change nothing, so the state version stays put
+        self._invalidate_actions()
+        if event:
+            self.hand_actions.append({k: event[k] for k in ("stage", "player_index", "action", "amount", "to_call", "pot")})
+            self._emit(event)
+        return result
+
+    def _execute_action(self, player_index, action, raise_amount=0):
         # Don't allow actions during lobby phase
         if self.stage == "lobby":
             return {"error": "Game is in lobby phase - cannot perform actions"}
@@ -198,20 +268,21 @@ class PokerGame:
 
         if action == "call":
             if to_call > 0:
-                amount_bet = p.bet(to_call)
+                amount_bet = self._bet(p, min(to_call, p.chips))  # a short stack calls all-in
                 self.pot += amount_bet
                 self.players_to_act.discard(player_index)
                 self.action_index += 1
                 self.advance_to_next_player()
-                return {"success": True, "message": f"{p.name} calls {to_call}"}
+                return {"success": True, "message": f"{p.name} calls {amount_bet}"}
             else:
                 return {"error": "No bet to call, you can check instead"}
 
         elif action == "fold":
             p.folded = True
+            self.num_in_hand -= 1
             self.players_to_act.discard(player_index)
             
-            if sum(1 for pl in self.players if not pl.folded) == 1:
+            if self.num_in_hand == 1:
                 self.award_pot_to_remaining_player()
                 return {"success": True, "message": f"{p.name} folds. Everyone else folded!"}
             
@@ -240,12 +311,16 @@ class PokerGame:
             if total_to_bet > p.chips:
                 return {"error": f"You only have {p.chips} chips remaining!"}
             
-            amount_bet = p.bet(total_to_bet)
+            amount_bet = self._bet(p, total_to_bet)
             self.pot += amount_bet
             self.current_bet = p.current_bet
+            self.last_raise = max(self.last_raise, raise_amount)
 
-            self.players_to_act = set(range(len(self.players)))
-            self.players_to_act.discard(player_index)
+            # Everyone else still able to act gets to respond
+            self.players_to_act = {
+                i for i in self.player_order
+                if i != player_index and not self.players[i].folded and self.players[i].chips > 0
+            }
             
             self.action_index += 1
             self.advance_to_next_player()
@@ -254,67 +329,114 @@ class PokerGame:
         else:
             return {"error": "Invalid input! Please try again."}
 
+    def timeout_action(self):
+        """Act for a player whose clock ran out: check if possible, otherwise fold"""
+        if self.current_player_index is None or self.game_over or self.stage == "lobby":
+            return {"error": "No player to act"}
+        action = "check" if "check" in self.get_legal_actions() else "fold"
+        result = self.execute_action(self.current_player_index, action)
+        result["auto_action"] = action
+        return result
+
+    def return_uncalled_bet(self):
+        """Give the biggest bettor back whatever nobody else matched, e.g. against a short all-in"""
+        ranked = sorted(range(len(self.players)), key=lambda i: self.players[i].total_bet, reverse=True)
+        if len(ranked) < 2:
+            return
+        top, second = self.players[ranked[0]], self.players[ranked[1]]
+        excess = top.total_bet - second.total_bet
+        if excess > 0:
+            top.total_bet -= excess
+            top.chips += excess
+            self.pot -= excess
+
+    def side_pots(self):
+        """
+        The main pot and side pots as (amount, eligible seats), built from the
+        all-in levels of the players still in the hand. Chips put in by players
+        who folded stay in the pots they reached.
+        """
+        contributions = [p.total_bet for p in self.players]
+        live = [i for i, p in enumerate(self.players) if not p.folded]
+        levels = sorted({contributions[i] for i in live})
+        pots = []
+        previous = 0
+        for n, level in enumerate(levels):
+            # The last pot also takes bets nobody still in the hand matched
+            top = level if n < len(levels) - 1 else max(contributions)
+            amount = sum(min(c, top) - min(c, previous) for c in contributions)
+            if amount:
+                pots.append((amount, [i for i in live if contributions[i] >= level]))
+            previous = top
+        return pots
+
     def showdown(self):
-        HAND_RANKS = {
-            "high_card": 1,
-            "one_pair": 2,
-            "two_pair": 3,
-            "three_of_a_kind": 4,
-            "straight": 5,
-            "flush": 6,
-            "full_house": 7,
-            "four_of_a_kind": 8,
-            "straight_flush": 9,
-            "royal_flush": 10
-        }
-        RANK_NAMES = {v: k for k, v in HAND_RANKS.items()}
-        
-        best_rank = None
-        best_hand = None
-        winner = None
-        
-        for p in self.players:
-            if not p.folded:
-                all_cards = p.hand + self.community_cards
-                rank, hand = eval_hand(all_cards)
-                
-                if best_rank is None or rank > best_rank:
-                    best_rank = rank
-                    best_hand = hand
-                    winner = p
-        
-        if winner:
-            winner.chips += self.pot
-            self.winner = winner
-            self.game_over = True
+        """Pay each pot to the best eligible hand; ties split, odd chips going to the first seat left of the dealer"""
+        scores = {i: eval_hand(p.hand + self.community_cards)[0] for i, p in enumerate(self.players) if not p.folded}
+        if not scores:
+            return
+        self.return_uncalled_bet()
+        n = len(self.players)
+        seat_order = [(self.dealer_index + step) % n for step in range(1, n + 1)]
+
+        pots = []
+        main_winner = None
+        for amount, eligible in self.side_pots():
+            best = max(scores[i] for i in eligible)
+            winners = [i for i in seat_order if i in eligible and scores[i] == best]
+            share, odd = divmod(amount, len(winners))
+            for k, i in enumerate(winners):
+                self.players[i].chips += share + (1 if k < odd else 0)
+            pots.append({"amount": amount, "winners": [self.players[i].name for i in winners]})
+            if main_winner is None:
+                main_winner = winners[0]
+
+        self.winner = self.players[main_winner]
+        self.game_over = True
+        self._emit({"type": "hand_over", "winner": self.winner.name, "pot": self.pot, "pots": pots})
 
     def play_hand(self):
         """Start a new hand - for API, call this to initialize"""
         # Reset lobby state and start the actual game
         self.stage = "preflop"
         self.lobby_timer = None
+        self.lobby_deadline = None
         self.game_starting = False
         
+        self.hand_number += 1
         self.deck = Deck()
         self.community_cards = []
         self.pot = 0
         self.current_bet = 0
         self.game_over = False
         self.winner = None
+        self.hand_actions = []
+        self.turn_deadline = None
         
         for p in self.players:
             p.reset_for_new_hand()
+            if not p.name or p.chips <= 0:
+                p.folded = True  # empty seats and busted players sit the hand out
+        self.num_in_hand = sum(1 for p in self.players if not p.folded)
+        self.num_all_in = 0
         
         self.post_blinds()
         self.deal_hole_cards()
+        self._emit({
+            "type": "new_hand",
+            "players": [p.name for p in self.players if p.name],
+        })
         self.setup_betting_round()
+        self._invalidate_actions()
 
     def award_pot_to_remaining_player(self):
+        self.return_uncalled_bet()
         for p in self.players:
             if not p.folded:
                 p.chips += self.pot
                 self.winner = p
                 self.game_over = True
+                self._emit({"type": "hand_over", "winner": p.name, "pot": self.pot})
                 break
 
     def get_active_player_count(self):
@@ -372,57 +494,69 @@ class PokerGame:
         
         return True, f"{player_name} left seat {seat_index + 1}"
 
-    # In your PokerGame class in poker_engine_api.py
+    def bump_version(self):
+        """Mark a change clients can see, e.g. for ETags and long-polling"""
+        self.state_version += 1
 
-    def get_legal_actions(self):
-        """API addition: Return legal actions for current player"""
-        # No legal actions during lobby phase
-        if self.stage == "lobby":
-            print("DEBUG: In lobby phase - no legal actions")
-            return []
+    def _invalidate_actions(self):
+        self._action_cache = None
+        self.bump_version()
 
-        if self.current_player_index is None:
-            print("DEBUG: No current player - no legal actions")
-            return []
-
-        if self.game_over:
-            print("DEBUG: Game over - no legal actions")
-            return []
-
-        p = self.players[self.current_player_index]
-        to_call = max(0, self.current_bet - p.current_bet)
+    def _action_info(self):
+        """Legal actions, to_call and raise bounds for the current player, cached until the next state change"""
+        if self._action_cache is not None:
+            return self._action_cache
 
-        print(f"DEBUG: Player {p.name}, to_call: {to_call}, chips: {p.chips}, current_bet: {p.current_bet}, game_bet: {self.current_bet}")
-
-        actions = []
-        if to_call == 0:
-            actions.append("check")
-        else:
-            actions.append("call")
+        info = {"actions": [], "to_call": 0, "min_raise": 0, "max_raise": 0}
+        if self.stage != "lobby" and self.current_player_index is not None and not self.game_over:
+            p = self.players[self.current_player_index]
+            to_call = max(0, self.current_bet - p.current_bet)
+            info["to_call"] = to_call
+            info["actions"] = ["check" if to_call == 0 else "call", "fold"]
+            if to_call < p.chips:
+                info["actions"].append("raise")
+                info["max_raise"] = p.chips - to_call
+                info["min_raise"] = min(max(self.big_blind, self.last_raise), info["max_raise"])
+        self._action_cache = info
+        return info
 
-        actions.append("fold")
+    def get_legal_actions(self):
+        """API addition: Return legal actions for current player"""
+        return list(self._action_info()["actions"])
 
-        if to_call < p.chips:
-            actions.append("raise")
+    def get_raise_bounds(self):
+        """(min, max) raise on top of the call; the minimum is a full raise, or all-in if smaller"""
+        info = self._action_info()
+        return info["min_raise"], info["max_raise"]
 
-        print(f"DEBUG: Legal actions for {p.name}: {actions}")
-        return actions
-    
-    def get_game_state(self, viewer_name=None):
+    def hole_cards(self, seat):
+        """The seat's private cards for the current hand"""
+        if self.stage == "lobby":
+            return []
+        return [str(c) for c in self.players[seat].hand]
+
+    def lobby_seconds_remaining(self):
+        if self.lobby_deadline is None:
+            return getattr(self, 'lobby_timer', None)
+        return max(0, math.ceil(self.lobby_deadline - time.time()))
+
+    def get_game_state(self, viewer_name=None, public=False):
+        """
+        State as seen by viewer_name, or with every hand shown if None.
+        public=True hides every hand: the view all clients share, with hole
+        cards delivered separately (see hole_cards).
+        """
         current_player = None
-        to_call = 0
-
         if self.current_player_index is not None:
             current_player = self.players[self.current_player_index].name
-            p = self.players[self.current_player_index]
-            to_call = max(0, self.current_bet - p.current_bet)
+        action_info = self._action_info()
 
         players_state = []
         for p in self.players:
             hand = []
             # Only show cards if game is active and not in lobby
             if self.stage != "lobby":
-                if viewer_name is None or p.name == viewer_name:
+                if not public and (viewer_name is None or p.name == viewer_name):
                     hand = [str(c) for c in p.hand]  # show full hand
                 elif not p.folded:
                     hand = ["??", "??"]  # hide opponents' cards
@@ -436,22 +570,30 @@ class PokerGame:
                 "chips": p.chips,
                 "hand": hand,
                 "current_bet": p.current_bet,
-                "folded": p.folded
+                "total_bet": p.total_bet,
+                "folded": p.folded,
+                "time_bank": int(p.time_bank)
             })
-        print(f"[GET_STATE] viewer_name={viewer_name}")
         return {
             "stage": self.stage,
+            "hand_number": self.hand_number,
             "pot": self.pot,
             "current_bet": self.current_bet,
             "community_cards": [str(c) for c in self.community_cards],
             "current_player": current_player,
             "current_player_index": self.current_player_index,
-            "to_call": to_call,
-            "legal_actions": self.get_legal_actions(),
+            "to_call": action_info["to_call"],
+            "legal_actions": list(action_info["actions"]),
+            "min_raise": action_info["min_raise"],
+            "max_raise": action_info["max_raise"],
+            "turn_deadline": self.turn_deadline,
             "game_over": self.game_over,
             "winner": self.winner.name if self.winner else None,
             "dealer": self.players[self.dealer_index].name,
             "players": players_state,
-            "lobby_timer": getattr(self, 'lobby_timer', None),
+            "action_history": list(self.hand_actions),
+            "lobby_timer": self.lobby_seconds_remaining(),
+            "lobby_deadline": self.lobby_deadline,
+            "server_time": time.time(),
             "game_starting": getattr(self, 'game_starting', False)
         }
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""
+Multi-table tournament bookkeeping on top of PokerGame tables.
+
+Tournament seats the entrants over as few tables as possible, raises the
+blinds level by level, eliminates busted players and keeps the tables
+balanced. Tables are only rearranged between their own hands: when a table
+finishes a hand it either breaks (if the remaining field fits on one table
+fewer) or sends players to the shortest tables until it is at most one
+player above them. The shortest table comes from a min-heap of seat counts
+with lazy deletion, so each move costs O(log tables) however large the
+field gets.
+
+Players moved onto a table in the middle of a hand sit out until its next
+hand. Running the hands is left to the caller (see main.py).
+"""
+import heapq
+import random
+
+from .player import Player
+from .poker_engine_api import PokerGame
+
+# (small blind, big blind) per level
+BLIND_SCHEDULE = [
+    (10, 20), (15, 30), (25, 50), (50, 100), (75, 150), (100, 200), (150, 300),
+    (200, 400), (300, 600), (400, 800), (600, 1200), (800, 1600), (1000, 2000),
+    (1500, 3000), (2000, 4000), (3000, 6000), (5000, 10000),
+]
+
+
+class Tournament:
+    def __init__(self, entrants, table_size=9, starting_stack=1500, blind_schedule=BLIND_SCHEDULE, level_duration=600, table_prefix="t"):
+        if len(entrants) < 2:
+            raise ValueError("A tournament needs at least two entrants")
+        if len(set(entrants)) != len(entrants) or not all(entrants):
+            raise ValueError("Entrant names must be unique and non-empty")
+        if table_size < 2:
+            raise ValueError("Tables need at least two seats")
+
+        self.table_size = table_size
+        self.blind_schedule = blind_schedule
+        self.level_duration = level_duration  # seconds per level, enforced by the caller
+        self.level = 0
+        self.started = False
+        self.tables = {}  # table_id -> PokerGame
+        self.counts = {}  # table_id -> seated players
+        self.in_hand = set()  # tables with a hand in progress
+        self.results = []  # (place, name), last place first
+        self.winner = None
+        self._heap = []  # (count, table_id), stale entries skipped lazily
+
+        players = list(entrants)
+        random.shuffle(players)
+        n_tables = -(-len(players) // table_size)
+        for t in range(n_tables):
+            table_id = f"{table_prefix}{t + 1}"
+            seated = players[t::n_tables]
+            game = PokerGame([""] * table_size)
+            game.stage = "tournament"
+            for seat, name in enumerate(seated):
+                game.players[seat] = Player(name, starting_stack)
+            for seat in range(len(seated), table_size):
+                game.players[seat] = Player("", 0)
+            game.dealer_index = random.randrange(len(seated))
+            self.tables[table_id] = game
+            self._set_count(table_id, len(seated))
+
+    @property
+    def blinds(self):
+        return self.blind_schedule[self.level]
+
+    @property
+    def remaining(self):
+        return sum(self.counts.values())
+
+    @property
+    def is_finished(self):
+        return self.winner is not None
+
+    def level_up(self):
+        """Move to the next blind level; False once the schedule is exhausted"""
+        if self.level + 1 >= len(self.blind_schedule):
+            return False
+        self.level += 1
+        return True
+
+    def start(self):
+        """Returns the tables that can deal their first hand"""
+        self.started = True
+        return [table_id for table_id in self.tables if self.can_start_hand(table_id)]
+
+    def can_start_hand(self, table_id):
+        return self.started and table_id in self.tables and table_id not in self.in_hand and self.counts[table_id] >= 2 and not self.is_finished
+
+    def start_hand(self, table_id):
+        game = self.tables[table_id]
+        game.small_blind, game.big_blind = self.blinds
+        game.rotate_dealer()
+        game.play_hand()
+        self.in_hand.add(table_id)
+        return game
+
+    def finish_hand(self, table_id):
+        """
+        Eliminate busted players and rebalance after a hand on table_id.
+        Returns the moves made as (name, from_table, to_table) tuples.
+        """
+        self.in_hand.discard(table_id)
+        game = self.tables[table_id]
+
+        busted = [(seat, p) for seat, p in enumerate(game.players) if p.name and p.chips <= 0]
+        for seat, p in busted:
+            self.results.append((self.remaining, p.name))
+            self._vacate(table_id, seat)
+        if self.remaining == 1:
+            name = next(p.name for g in self.tables.values() for p in g.players if p.name)
+            self.results.append((1, name))
+            self.winner = name
+            return []
+
+        if len(self.tables) > 1 and self.remaining <= (len(self.tables) - 1) * self.table_size:
+            return self._break_table(table_id)
+        return self._balance_from(table_id)
+
+    def seat_of(self, name):
+        for table_id, game in self.tables.items():
+            for seat, p in enumerate(game.players):
+                if p.name == name:
+                    return table_id, seat
+        return None
+
+    def summary(self):
+        return {
+            "started": self.started,
+            "level": self.level + 1,
+            "blinds": list(self.blinds),
+            "remaining": self.remaining,
+            "winner": self.winner,
+            "tables": {
+                table_id: [{"seat": seat, "name": p.name, "chips": p.chips} for seat, p in enumerate(game.players) if p.name]
+                for table_id, game in self.tables.items()
+            },
+            "results": [{"place": place, "name": name} for place, name in reversed(self.results)],
+        }
+
+    # --- Seating ---
+
+    def _set_count(self, table_id, count):
+        self.counts[table_id] = count
+        heapq.heappush(self._heap, (count, table_id))
+        if len(self._heap) > 64 and len(self._heap) > 4 * len(self.counts):
+            self._heap = [(c, t) for t, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _shortest_table(self, exclude):
+        """Table with the fewest players other than exclude"""
+        skipped = None
+        while self._heap:
+            count, table_id = self._heap[0]
+            if self.counts.get(table_id) != count:
+                heapq.heappop(self._heap)
+            elif table_id == exclude:
+                skipped = heapq.heappop(self._heap)
+            else:
+                break
+        shortest = self._heap[0][1] if self._heap else None
+        if skipped:
+            heapq.heappush(self._heap, skipped)
+        return shortest
+
+    def _vacate(self, table_id, seat):
+        game = self.tables[table_id]
+        player = game.players[seat]
+        empty = Player("", 0)
+        empty.folded = True
+        game.players[seat] = empty
+        self._set_count(table_id, self.counts[table_id] - 1)
+        return player
+
+    def _move(self, player, from_table, to_table):
+        game = self.tables[to_table]
+        seat = next(i for i, p in enumerate(game.players) if not p.name)
+        player.folded = True  # sits out the rest of a hand in progress
+        player.hand = []
+        player.current_bet = 0
+        game.players[seat] = player
+        self._set_count(to_table, self.counts[to_table] + 1)
+        return (player.name, from_table, to_table)
+
+    def _balance_from(self, table_id):
+        moves = []
+        while True:
+            target = self._shortest_table(exclude=table_id)
+            if target is None or self.counts[table_id] <= self.counts[target] + 1:
+                return moves
+            # Move whoever would post the next big blind, as in live play
+            game = self.tables[table_id]
+            seat = game._next_seated(game._next_seated(game.dealer_index))
+            moves.append(self._move(self._vacate(table_id, seat), table_id, target))
+
+    def _break_table(self, table_id):
+        game = self.tables[table_id]
+        moves = []
+        for seat, p in enumerate(game.players):
+            if p.name:
+                target = self._shortest_table(exclude=table_id)
+                moves.append(self._move(self._vacate(table_id, seat), table_id, target))
+        del self.tables[table_id]
+        del self.counts[table_id]
+        return moves
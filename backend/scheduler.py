@@ -0,0 +1,99 @@
+# scheduler.py
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class DeadlineScheduler:
+    """
+    One asyncio task that fires callbacks at wall-clock deadlines.
+
+    Deadlines live in a heap keyed by (deadline, seq). Each key (e.g.
+    ("lobby", game_id)) has at most one live entry: scheduling a key again
+    replaces it and cancelling just forgets it, leaving the stale heap entry
+    to be skipped when it reaches the top.
+    """
+
+    def __init__(self):
+        self._heap: list = []
+        self._entries: Dict[Hashable, tuple] = {}
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self, key: Hashable, deadline: float, callback: Callable[[], Any]):
+        """Run callback (sync or async) at the given time.time() deadline"""
+        seq = next(self._counter)
+        self._entries[key] = (deadline, seq, callback)
+        heapq.heappush(self._heap, (deadline, seq, key))
+
+        # Drop stale entries once they dominate the heap
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [(d, s, k) for k, (d, s, _) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+        self._ensure_running()
+        if self._heap[0][1] == seq:
+            self._wakeup.set()
+
+    def schedule_in(self, key: Hashable, delay: float, callback: Callable[[], Any]) -> float:
+        deadline = time.time() + delay
+        self.schedule(key, deadline, callback)
+        return deadline
+
+    def cancel(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            # Skip cancelled or replaced entries
+            while self._heap:
+                deadline, seq, key = self._heap[0]
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] == seq:
+                    break
+                heapq.heappop(self._heap)
+
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, seq, key = heapq.heappop(self._heap)
+            _, _, callback = self._entries.pop(key)
+            try:
+                result = callback()
+                if asyncio.iscoroutine(result):
+                    asyncio.create_task(self._guard(key, result))
+            except Exception as e:
+                print(f"[SCHEDULER] Callback for {key} failed: {e}")
+
+    async def _guard(self, key, coro):
+        try:
+            await coro
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"[SCHEDULER] Callback for {key} failed: {e}")
@@ -0,0 +1,65 @@
+# table_actor.py
+import asyncio
+from typing import Any, Callable, Optional
+
+from poker_engine.poker_engine_api import PokerGame
+
+
+class TableActor:
+    """
+    Owns one table's PokerGame and runs commands against it one at a time,
+    in the order they were submitted.
+
+    A command is fn(game, *args), sync or async; call() enqueues it and
+    returns its result (or raises its exception, e.g. an HTTPException) to
+    the caller. Commands are the only writers of the game. Plain reads such
+    as get_game_state() never await, so they may run outside the actor.
+    """
+
+    def __init__(self, game_id: str, game: PokerGame):
+        self.game_id = game_id
+        self.game = game
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._busy = False
+
+    def is_idle(self) -> bool:
+        return not self._busy and self._queue.empty()
+
+    async def call(self, name: str, fn: Callable[..., Any], *args) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((name, fn, args, future))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return await future
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        while not self._queue.empty():
+            _, _, _, future = self._queue.get_nowait()
+            future.cancel()
+
+    async def _run(self):
+        while True:
+            name, fn, args, future = await self._queue.get()
+            if future.done():
+                continue  # the caller gave up waiting
+            self._busy = True
+            try:
+                result = fn(self.game, *args)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                else:
+                    print(f"[ACTOR] {self.game_id} command {name} failed: {e}")
+            finally:
+                self._busy = False
@@ -0,0 +1,204 @@
+# wire_protocol.py
+"""
+Compact binary encoding of WebSocket messages, negotiated per connection
+with /ws/{game_id}?protocol=binary. JSON stays the default.
+
+Every binary frame starts with a flags byte; FLAG_COMPRESSED means the rest
+of the frame is zlib-compressed. The (decompressed) body starts with a kind
+byte. State messages (state_update, upgrade_success) use the struct layout
+below; any other message is sent as KIND_JSON followed by its UTF-8 JSON.
+
+State layout, little-endian:
+    header        STATE_HEADER (see the field order in encode_state)
+    community     u8 count, one byte per card
+    players       u8 count, then per seat: u16 name length + UTF-8 name,
+                  PLAYER struct, u8 card count + one byte per card
+    history       u16 count, then ACTION struct per action
+
+Cards are one byte: rank_index * 4 + suit_index (see evaluator), HIDDEN_CARD
+for a face-down card. Optional numbers use -1 (ints) or NaN (floats) for None.
+"""
+import json
+import math
+import struct
+import zlib
+
+from poker_engine.evaluator import card_index, index_to_card
+
+FLAG_COMPRESSED = 1
+COMPRESS_THRESHOLD = 512  # bytes; smaller bodies are not worth a zlib pass
+
+KIND_JSON = 0
+STATE_KINDS = {"state_update": 1, "upgrade_success": 2}
+STATE_TYPES = {kind: name for name, kind in STATE_KINDS.items()}
+
+STAGES = ["lobby", "preflop", "flop", "turn", "river", "tournament"]  # append only: indexes are on the wire
+ACTIONS = ["check", "call", "fold", "raise"]  # in the order legal_actions lists them
+HIDDEN_CARD = 0xFE
+
+# stage, flags, hand number, current player, dealer, winner, legal actions, pot,
+# current bet, to call, min raise, max raise, lobby timer, turn deadline,
+# lobby deadline, server time
+STATE_HEADER = struct.Struct("<BBIbbbBIIIiihddd")
+# chips, current bet, time bank, folded
+PLAYER = struct.Struct("<IIHB")
+# stage, seat, action, amount, to call, pot
+ACTION = struct.Struct("<BBBIII")
+
+_GAME_OVER = 1
+_GAME_STARTING = 2
+
+
+def encode_card(card: str) -> int:
+    return HIDDEN_CARD if card == "??" else card_index(card)
+
+
+def decode_card(code: int) -> str:
+    return "??" if code == HIDDEN_CARD else str(index_to_card(code))
+
+
+def _optional(value, missing):
+    return missing if value is None else value
+
+
+def _seat_of(players, name):
+    if name is None:
+        return -1
+    for i, p in enumerate(players):
+        if p["name"] == name:
+            return i
+    return -1
+
+
+def encode_state(state: dict) -> bytes:
+    """Pack a get_game_state() dict"""
+    players = state["players"]
+    legal = 0
+    for action in state["legal_actions"]:
+        legal |= 1 << ACTIONS.index(action)
+    flags = (_GAME_OVER if state["game_over"] else 0) | (_GAME_STARTING if state["game_starting"] else 0)
+
+    parts = [STATE_HEADER.pack(
+        STAGES.index(state["stage"]),
+        flags,
+        state["hand_number"],
+        _optional(state["current_player_index"], -1),
+        _seat_of(players, state["dealer"]),
+        _seat_of(players, state["winner"]),
+        legal,
+        state["pot"],
+        state["current_bet"],
+        state["to_call"],
+        _optional(state["min_raise"], -1),
+        _optional(state["max_raise"], -1),
+        _optional(state["lobby_timer"], -1),
+        _optional(state["turn_deadline"], math.nan),
+        _optional(state["lobby_deadline"], math.nan),
+        state["server_time"],
+    )]
+
+    community = state["community_cards"]
+    parts.append(bytes([len(community)] + [encode_card(c) for c in community]))
+
+    parts.append(bytes([len(players)]))
+    for p in players:
+        name = p["name"].encode()
+        parts.append(struct.pack("<H", len(name)) + name)
+        parts.append(PLAYER.pack(p["chips"], p["current_bet"], p["time_bank"], p["folded"]))
+        parts.append(bytes([len(p["hand"])] + [encode_card(c) for c in p["hand"]]))
+
+    history = state["action_history"]
+    parts.append(struct.pack("<H", len(history)))
+    for a in history:
+        parts.append(ACTION.pack(
+            STAGES.index(a["stage"]), a["player_index"], ACTIONS.index(a["action"]),
+            a["amount"], a["to_call"], a["pot"],
+        ))
+    return b"".join(parts)
+
+
+def decode_state(data: bytes, offset: int = 0) -> dict:
+    """Inverse of encode_state, for clients and tests"""
+    (stage, flags, hand_number, current, dealer, winner, legal, pot, current_bet, to_call,
+     min_raise, max_raise, lobby_timer, turn_deadline, lobby_deadline, server_time) = STATE_HEADER.unpack_from(data, offset)
+    offset += STATE_HEADER.size
+
+    count = data[offset]
+    community = [decode_card(c) for c in data[offset + 1:offset + 1 + count]]
+    offset += 1 + count
+
+    players = []
+    count = data[offset]
+    offset += 1
+    for _ in range(count):
+        (length,) = struct.unpack_from("<H", data, offset)
+        name = data[offset + 2:offset + 2 + length].decode()
+        offset += 2 + length
+        chips, bet, time_bank, folded = PLAYER.unpack_from(data, offset)
+        offset += PLAYER.size
+        count = data[offset]
+        hand = [decode_card(c) for c in data[offset + 1:offset + 1 + count]]
+        offset += 1 + count
+        players.append({
+            "name": name, "chips": chips, "hand": hand,
+            "current_bet": bet, "folded": bool(folded), "time_bank": time_bank,
+        })
+
+    (count,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    history = []
+    for _ in range(count):
+        a_stage, seat, action, amount, a_to_call, a_pot = ACTION.unpack_from(data, offset)
+        offset += ACTION.size
+        history.append({
+            "stage": STAGES[a_stage], "player_index": seat, "action": ACTIONS[action],
+            "amount": amount, "to_call": a_to_call, "pot": a_pot,
+        })
+
+    def name_at(seat):
+        return players[seat]["name"] if seat >= 0 else None
+
+    return {
+        "stage": STAGES[stage],
+        "hand_number": hand_number,
+        "pot": pot,
+        "current_bet": current_bet,
+        "community_cards": community,
+        "current_player": name_at(current),
+        "current_player_index": current if current >= 0 else None,
+        "to_call": to_call,
+        "legal_actions": [a for i, a in enumerate(ACTIONS) if legal >> i & 1],
+        "min_raise": min_raise if min_raise >= 0 else None,
+        "max_raise": max_raise if max_raise >= 0 else None,
+        "turn_deadline": None if math.isnan(turn_deadline) else turn_deadline,
+        "game_over": bool(flags & _GAME_OVER),
+        "winner": name_at(winner),
+        "dealer": name_at(dealer),
+        "players": players,
+        "action_history": history,
+        "lobby_timer": lobby_timer if lobby_timer >= 0 else None,
+        "lobby_deadline": None if math.isnan(lobby_deadline) else lobby_deadline,
+        "server_time": server_time,
+        "game_starting": bool(flags & _GAME_STARTING),
+    }
+
+
+def encode_message(message: dict) -> bytes:
+    """One binary frame for a message that would otherwise be sent as JSON"""
+    kind = STATE_KINDS.get(message.get("type"))
+    if kind is not None and "state" in message:
+        body = bytes([kind]) + encode_state(message["state"])
+    else:
+        body = bytes([KIND_JSON]) + json.dumps(message, separators=(",", ":")).encode()
+
+    if len(body) > COMPRESS_THRESHOLD:
+        return bytes([FLAG_COMPRESSED]) + zlib.compress(body, 1)
+    return b"\x00" + body
+
+
+def decode_message(frame: bytes) -> dict:
+    body = zlib.decompress(frame[1:]) if frame[0] & FLAG_COMPRESSED else frame[1:]
+    kind = body[0]
+    if kind == KIND_JSON:
+        return json.loads(body[1:])
+    return {"type": STATE_TYPES[kind], "state": decode_state(body, 1)}
@@ -2,12 +2,17 @@
 from fastapi import WebSocket
 from typing import Dict, Optional
 import json
+from wire_protocol import encode_message
+from broadcast_bus import LocalBus
+
+PROTOCOLS = ("json", "binary")
 
 class ConnectionState:
     """Represents the state of a single WebSocket connection"""
-    def __init__(self, websocket: WebSocket, connection_id: str):
+    def __init__(self, websocket: WebSocket, connection_id: str, protocol: str = "json"):
         self.ws = websocket
         self.connection_id = connection_id
+        self.protocol = protocol  # "json" or "binary" (see wire_protocol)
         self.role = "spectator"  # "spectator" or "player"
         self.player_name: Optional[str] = None
         self.game_id: Optional[str] = None
@@ -27,6 +32,13 @@ class ConnectionState:
         self.player_name = None
         self.seat_index = None
     
+    async def send(self, message: dict):
+        """Send a message in this connection's protocol"""
+        if self.protocol == "binary":
+            await self.ws.send_bytes(encode_message(message))
+        else:
+            await self.ws.send_json(message)
+
     def is_player(self) -> bool:
         return self.role == "player" and self.player_name is not None
     
@@ -36,20 +48,28 @@ class ConnectionState:
 
 
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, bus: Optional[LocalBus] = None):
         # Map of game_id -> list of ConnectionState objects
         self.game_connections: Dict[str, list[ConnectionState]] = {}
         # Map of websocket -> ConnectionState for quick lookups
         self.ws_to_state: Dict[WebSocket, ConnectionState] = {}
+        # Player connections by game_id -> seat index, and game_id -> player name
+        self.seat_connections: Dict[str, Dict[int, list[ConnectionState]]] = {}
+        self.name_connections: Dict[str, Dict[str, list[ConnectionState]]] = {}
+        # game_id -> hand_number whose hole cards have been delivered
+        self.hole_cards_sent: Dict[str, int] = {}
         self.connection_counter = 0
+        # Carries broadcasts to the connections of every worker (see broadcast_bus)
+        self.bus = bus or LocalBus()
+        self.bus.attach(self.deliver)
 
-    async def connect(self, game_id: str, websocket: WebSocket) -> ConnectionState:
+    async def connect(self, game_id: str, websocket: WebSocket, protocol: str = "json") -> ConnectionState:
         """Accept a new WebSocket connection"""
         await websocket.accept()
         
         # Create connection state
         self.connection_counter += 1
-        conn_state = ConnectionState(websocket, f"conn_{self.connection_counter}")
+        conn_state = ConnectionState(websocket, f"conn_{self.connection_counter}", protocol)
         conn_state.game_id = game_id
         
         # Store in our maps
@@ -58,7 +78,7 @@ class ConnectionManager:
         self.game_connections[game_id].append(conn_state)
         self.ws_to_state[websocket] = conn_state
         
-        print(f"[WS CONNECT] game={game_id} conn_id={conn_state.connection_id} total_connections={len(self.game_connections[game_id])}")
+        print(f"[WS CONNECT] game={game_id} conn_id={conn_state.connection_id} protocol={protocol} total_connections={len(self.game_connections[game_id])}")
         return conn_state
 
     def disconnect(self, game_id: str, websocket: WebSocket):
@@ -67,14 +87,42 @@ class ConnectionManager:
         if not conn_state:
             return
         
+        if conn_state.is_player():
+            self._unindex(conn_state)
         if game_id in self.game_connections:
             if conn_state in self.game_connections[game_id]:
                 self.game_connections[game_id].remove(conn_state)
                 print(f"[WS DISCONNECT] game={game_id} player={conn_state.player_name} conn_id={conn_state.connection_id}")
-        
+            if not self.game_connections[game_id]:
+                del self.game_connections[game_id]
+                self.hole_cards_sent.pop(game_id, None)
+
         if websocket in self.ws_to_state:
             del self.ws_to_state[websocket]
     
+    def _index(self, conn_state: ConnectionState):
+        game_id = conn_state.game_id
+        self.seat_connections.setdefault(game_id, {}).setdefault(conn_state.seat_index, []).append(conn_state)
+        self.name_connections.setdefault(game_id, {}).setdefault(conn_state.player_name, []).append(conn_state)
+
+    def _unindex(self, conn_state: ConnectionState):
+        game_id = conn_state.game_id
+        for index, key in ((self.seat_connections, conn_state.seat_index), (self.name_connections, conn_state.player_name)):
+            by_key = index.get(game_id, {})
+            conns = by_key.get(key, [])
+            if conn_state in conns:
+                conns.remove(conn_state)
+                if not conns:
+                    del by_key[key]
+            if not by_key:
+                index.pop(game_id, None)
+
+    def player_connections(self, game_id: str, seat_index: Optional[int] = None, player_name: Optional[str] = None) -> list[ConnectionState]:
+        """Connections of the player in a seat, or of a player by name"""
+        if seat_index is not None:
+            return list(self.seat_connections.get(game_id, {}).get(seat_index, []))
+        return list(self.name_connections.get(game_id, {}).get(player_name, []))
+
     def get_connection_state(self, websocket: WebSocket) -> Optional[ConnectionState]:
         """Get the connection state for a websocket"""
         return self.ws_to_state.get(websocket)
@@ -85,7 +133,10 @@ class ConnectionManager:
         if not conn_state:
             return False
         
+        if conn_state.is_player():
+            self._unindex(conn_state)
         conn_state.upgrade_to_player(player_name, seat_index)
+        self._index(conn_state)
         return True
     
     def downgrade_connection_to_spectator(self, websocket: WebSocket) -> bool:
@@ -94,44 +145,102 @@ class ConnectionManager:
         if not conn_state:
             return False
         
+        if conn_state.is_player():
+            self._unindex(conn_state)
         conn_state.downgrade_to_spectator()
         return True
     
     async def send_personal_message(self, websocket: WebSocket, message: dict):
         """Send a message to a specific connection"""
         try:
-            await websocket.send_json(message)
+            conn_state = self.ws_to_state.get(websocket)
+            if conn_state:
+                await conn_state.send(message)
+            else:
+                await websocket.send_json(message)
         except Exception as e:
             print(f"[WS ERROR] Failed to send personal message: {e}")
     
+    def hole_cards_message(self, game, seat: int) -> dict:
+        return {
+            "type": "hole_cards",
+            "hand_number": game.hand_number,
+            "seat": seat,
+            "cards": game.hole_cards(seat),
+        }
+
+    async def send_hole_cards(self, game, conn_states: list[ConnectionState]):
+        """Privately send each player connection the cards of the seat it holds"""
+        for conn_state in conn_states:
+            seat = conn_state.seat_index
+            if seat is None or seat >= len(game.players) or game.players[seat].name != conn_state.player_name:
+                continue  # claims a seat someone else is sitting in
+            try:
+                await conn_state.send(self.hole_cards_message(game, seat))
+            except Exception as e:
+                print(f"[WS ERROR] Failed to send hole cards to {conn_state.connection_id}: {e}")
+
+    def forget_game(self, game_id: str):
+        self.hole_cards_sent.pop(game_id, None)
+
     async def broadcast(self, game_id: str, game_state_obj):
         """
-        Broadcast game state to all connections in a game.
-        Each connection receives personalized state based on their role.
+        Broadcast to all connections in a game, in this worker or any other
+        (through the bus). A game is sent as its public state, built once for
+        everyone; each seated human gets their hole cards privately, once per
+        hand, ahead of the first broadcast.
+        """
+        if hasattr(game_state_obj, "get_game_state"):
+            game = game_state_obj
+            if game.stage != "lobby" and self.hole_cards_sent.get(game_id) != game.hand_number:
+                self.hole_cards_sent[game_id] = game.hand_number
+                for seat, p in enumerate(game.players):
+                    if p.name and not getattr(p, "is_bot", False):
+                        await self.bus.publish(game_id, self.hole_cards_message(game, seat), seat, p.name)
+            message = {
+                "type": "state_update",
+                "state": game.get_game_state(public=True)
+            }
+        else:
+            message = game_state_obj
+        await self.bus.publish(game_id, message)
+
+    async def deliver(self, game_id: str, message: dict, seat: Optional[int] = None, player_name: Optional[str] = None):
+        """
+        Send a message from the bus to this worker's connections: all of the
+        game's, or only those of the player in a seat. Each is encoded once.
         """
+        if seat is not None:
+            conn_states = [c for c in self.player_connections(game_id, seat_index=seat) if c.player_name == player_name]
+            for conn_state in conn_states:
+                try:
+                    await conn_state.send(message)
+                except Exception as e:
+                    print(f"[WS ERROR] Failed to send to {conn_state.connection_id}: {e}")
+            return
+
         connections = self.game_connections.get(game_id, [])
         remove_list = []
         
-        is_game_object = hasattr(game_state_obj, "get_game_state")
-        
-        print(f"[BCAST] game_id={game_id} is_game_object={is_game_object} connections={len(connections)}")
-        
-        for conn_state in connections:
+        print(f"[BCAST] game_id={game_id} type={message.get('type')} connections={len(connections)}")
+        # Encode once per protocol before sending; a message that can't be
+        # encoded is a server bug, not a reason to drop the connections
+        encoded = {}
+        for protocol in {c.protocol for c in connections}:
+            try:
+                encoded[protocol] = encode_message(message) if protocol == "binary" else json.dumps(message)
+            except Exception as e:
+                print(f"[WS ERROR] Failed to encode {message.get('type')} as {protocol} for game {game_id}: {e}")
+
+        for conn_state in list(connections):
+            payload = encoded.get(conn_state.protocol)
+            if payload is None:
+                continue
             try:
-                # Get personalized game state based on connection's role
-                if is_game_object:
-                    # If player, show their cards. If spectator, hide all cards.
-                    viewer_name = conn_state.player_name if conn_state.is_player() else None
-                    personalized_state = game_state_obj.get_game_state(viewer_name=viewer_name)
-                    
-                    message = {
-                        "type": "state_update",
-                        "state": personalized_state
-                    }
+                if conn_state.protocol == "binary":
+                    await conn_state.ws.send_bytes(payload)
                 else:
-                    message = game_state_obj
-                
-                await conn_state.ws.send_json(message)
+                    await conn_state.ws.send_text(payload)
                 print(f"[BCAST SENT] to={conn_state.player_name or 'spectator'} conn_id={conn_state.connection_id} role={conn_state.role}")
             
             except Exception as e:
@@ -140,4 +249,4 @@ class ConnectionManager:
         
         # Clean up dead connections
         for conn_state in remove_list:
-            self.disconnect(game_id, conn_state.ws)
\ No newline at end of file
+            self.disconnect(game_id, conn_state.ws)
@@ -15,6 +15,7 @@ type Player = {
 
 type GameState = {
   stage: string;
+  hand_number?: number;
   pot: number;
   current_bet: number;
   community_cards: string[];
@@ -22,14 +23,25 @@ type GameState = {
   current_player_index: number | null;
   to_call: number;
   legal_actions: string[];
+  min_raise?: number;
+  max_raise?: number;
   game_over: boolean;
   winner: string | null;
   dealer: string;
   players: Player[];
   lobby_timer?: number;
+  lobby_deadline?: number | null;
+  server_time?: number;
   game_starting?: boolean;
 };
 
+// Our seat's cards, sent privately once per hand
+type HoleCards = {
+  hand_number: number;
+  seat: number;
+  cards: string[];
+};
+
 // Seat positions for 6 players
 const SEAT_POSITIONS = [
   { top: "70%", left: "50%", transform: "translate(-50%, -50%)" },
@@ -221,6 +233,7 @@ export default function PokerTable() {
   const [raiseAmount, setRaiseAmount] = useState(20);
   const [loading, setLoading] = useState(false);
   const [actionLog, setActionLog] = useState<string[]>([]);
+  const [holeCards, setHoleCards] = useState<HoleCards | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [currentPlayerName, setCurrentPlayerName] = useState<string>("");
   const [lobbyTimer, setLobbyTimer] = useState<number>(LOBBY_TIMER_DURATION);
@@ -241,6 +254,21 @@ export default function PokerTable() {
     }
   }, [gameState?.lobby_timer, isInLobby]);
 
+  // The server sends the lobby deadline once; count down to it locally
+  useEffect(() => {
+    const deadline = gameState?.lobby_deadline;
+    if (!isInLobby || !deadline) return;
+
+    const clockOffset = (gameState?.server_time ?? Date.now() / 1000) - Date.now() / 1000;
+    const tick = () => {
+      const remaining = deadline - (Date.now() / 1000 + clockOffset);
+      setLobbyTimer(Math.max(0, Math.ceil(remaining)));
+    };
+    tick();
+    const interval = setInterval(tick, 250);
+    return () => clearInterval(interval);
+  }, [gameState?.lobby_deadline, gameState?.server_time, isInLobby]);
+
   // Single WebSocket connection - no player name in URL
   // Use useMemo to stabilize the URL
   const wsUrl = useMemo(() => {
@@ -265,6 +293,15 @@ export default function PokerTable() {
     } else if (msg.type === "upgrade_failed") {
       console.error("[CLIENT] Failed to upgrade:", msg.error);
       setError(msg.error || "Failed to upgrade to player");
+    } else if (msg.type === "hole_cards") {
+      if (msg.hand_number !== undefined && msg.seat !== undefined && msg.cards) {
+        setHoleCards({ hand_number: msg.hand_number, seat: msg.seat, cards: msg.cards });
+      }
+    } else if (msg.type === "action_log") {
+      const message = msg.message;
+      if (message) {
+        setActionLog((prev) => [...prev, message]);
+      }
     }
   });
 
@@ -473,7 +510,16 @@ export default function PokerTable() {
   }
 
   const seats = Array.from({ length: 6 }, (_, i) => {
-    const player = gameState?.players[i] || null;
+    const publicPlayer = gameState?.players[i] || null;
+    // The public state only has hole cards face down; show ours from the private message
+    const player =
+      publicPlayer &&
+      holeCards &&
+      holeCards.seat === i &&
+      holeCards.hand_number === gameState?.hand_number &&
+      publicPlayer.hand.length > 0
+        ? { ...publicPlayer, hand: holeCards.cards }
+        : publicPlayer;
     const isCurrentPlayer = i === gameState?.current_player_index;
     const isDealer = player?.name === gameState?.dealer;
 
@@ -693,8 +739,8 @@ export default function PokerTable() {
                         className="w-24 p-2 text-black rounded-lg"
                         value={raiseAmount}
                         onChange={(e) => setRaiseAmount(Number(e.target.value))}
-                        min={gameState.to_call + 1}
-                        max={gameState.players.find(p => p.name === currentPlayerName)?.chips || 1000}
+                        min={gameState.min_raise ?? 1}
+                        max={gameState.max_raise ?? gameState.players.find(p => p.name === currentPlayerName)?.chips ?? 1000}
                       />
                       <motion.button
                         whileHover={{ scale: 1.05 }}
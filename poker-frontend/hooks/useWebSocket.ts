@@ -1,9 +1,13 @@
 import { useEffect, useRef, useState, useCallback } from "react";
 
 export type WSMessage<T> = {
-  type: "state_update" | "upgrade_success" | "upgrade_failed" | "pong";
+  type: "state_update" | "upgrade_success" | "upgrade_failed" | "action_log" | "hole_cards" | "pong";
   state?: T;
   error?: string;
+  message?: string;
+  hand_number?: number;
+  seat?: number;
+  cards?: string[];
 };
 
 export function useReliableWebSocket<T>(
@@ -106,6 +110,8 @@ export function useReliableWebSocket<T>(
         if (parsed?.type === "state_update" || 
             parsed?.type === "upgrade_success" || 
             parsed?.type === "upgrade_failed" ||
+            parsed?.type === "action_log" ||
+            parsed?.type === "hole_cards" ||
             parsed?.type === "pong") {
           onMessage(parsed);
         }